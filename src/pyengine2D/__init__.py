@@ -7,12 +7,12 @@ from .core import Engine, InputSystem, Renderer, Keys, Signal, SignalMixin, Blen
 from .scene import (
     Node, Node2D, SceneManager, TweenManager, Tween, Easing, AnimatedSprite, 
     SpriteNode, Camera2D, ParticleEmitter2D, ParallaxBackground, ParallaxLayer,
-    RectangleNode, CircleNode, TilemapNode
+    RectangleNode, CircleNode, TilemapNode, SnapshotRecorder, Snapshot
 )
 
 # Collision & Physics API
-from .collision import Collider2D, CollisionWorld, Area2D, CircleCollider2D, CollisionResult, UniformGrid
-from .physics import PhysicsBody2D, RigidBody2D, DistanceConstraint, PhysicsWorld2D
+from .collision import Collider2D, CollisionWorld, Area2D, CircleCollider2D, CollisionResult, UniformGrid, SweepAndPrune, DynamicAABBTree, LayerRegistry, TileGridCollider
+from .physics import PhysicsBody2D, RigidBody2D, DistanceConstraint, Joint2D, DistanceJoint, SpringJoint, PinJoint, PhysicsWorld2D
 
 # FSM API
 from .fsm import StateMachine, State
@@ -53,15 +53,25 @@ __all__ = [
     'RectangleNode',
     'CircleNode',
     'TilemapNode',
+    'SnapshotRecorder',
+    'Snapshot',
     'Collider2D',
     'CollisionWorld',
     'Area2D',
     'CircleCollider2D',
     'CollisionResult',
     'UniformGrid',
+    'SweepAndPrune',
+    'DynamicAABBTree',
+    'LayerRegistry',
+    'TileGridCollider',
     'PhysicsBody2D',
     'RigidBody2D',
     'DistanceConstraint',
+    'Joint2D',
+    'DistanceJoint',
+    'SpringJoint',
+    'PinJoint',
     'PhysicsWorld2D',
     'StateMachine',
     'State',
@@ -3,7 +3,9 @@ from .collision_world import CollisionWorld
 from .collision_result import CollisionResult
 from .area2d import Area2D
 from .circle_collider2d import CircleCollider2D
-from .spatial_grid import UniformGrid
+from .spatial_grid import UniformGrid, SweepAndPrune, DynamicAABBTree
+from .layers import LayerRegistry
+from .tile_grid_collider import TileGridCollider
 
 __all__ = [
     'Collider2D',
@@ -12,4 +14,8 @@ __all__ = [
     'Area2D',
     'CircleCollider2D',
     'UniformGrid',
+    'SweepAndPrune',
+    'DynamicAABBTree',
+    'LayerRegistry',
+    'TileGridCollider',
 ]
@@ -12,6 +12,15 @@ class CircleCollider2D(Collider2D):
         super().__init__(name, x, y, radius * 2, radius * 2, is_static, is_trigger)
         self.radius = radius
 
+    @property
+    def radius(self):
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = value
+        self._shape_version += 1
+
     def get_rect(self):
         """Returns the broad-phase AABB encompassing the circle."""
         gx, gy = self.get_global_position()
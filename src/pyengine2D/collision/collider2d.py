@@ -1,14 +1,23 @@
 import pygame
 from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.collision import collider_registry  # noqa: F401  (installs tree hooks)
+from src.pyengine2D.collision.layers import CollisionLayerMixin
 
 
-class Collider2D(Node2D):
+class Collider2D(CollisionLayerMixin, Node2D):
     """
     Axis-Aligned Bounding Box (AABB) collider.
     
     Pure collision data — holds shape dimensions, layer/mask,
     and computes its world-space rect from the scene tree transform.
+    ``layer_bits`` / ``mask_bits`` mirror layer/mask as integer bitmasks.
+    Setting ``width`` / ``height`` bumps ``_shape_version`` so that
+    CollisionWorld re-measures the collider even if it did not move.
     """
+    _registry_role = "collider"
+    is_tile_grid = False  # True for TileGridCollider (queried per tile)
+    _collider_id = None   # stable int id, assigned by CollisionWorld on registration
+    _shape_version = 0    # bumped by shape setters (width, height, radius, ...)
 
     def __init__(self, name, x, y, width, height, is_static=False, is_trigger=False, visible=False):
         super().__init__(name, x, y)
@@ -20,6 +29,24 @@ class Collider2D(Node2D):
         self.layer = "default"
         self.mask = set()
 
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+        self._shape_version += 1
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = value
+        self._shape_version += 1
+
     def get_rect(self):
         """Return the world-space bounds tuple for this collider (float), accounting for scale."""
         gx, gy = self.get_global_position()
@@ -0,0 +1,108 @@
+"""
+Collider registry — incremental index of colliders per scene tree.
+
+Every tree root that contains colliders or collision worlds carries a
+ColliderRegistry.  Node.add_child / remove_child hooks merge and split
+these registries as subtrees move, and forward the changes to the
+CollisionWorlds of the tree.  Worlds therefore never walk the scene:
+the cost of keeping their collider list current is proportional to
+the nodes attached or detached, not to the size of the scene.
+
+Nodes take part by declaring a ``_registry_role`` class attribute:
+``"collider"`` (Collider2D) or ``"world"`` (CollisionWorld).
+"""
+from src.pyengine2D.scene.node import Node
+
+_ATTR = "_collider_registry"
+
+
+class ColliderRegistry:
+    """Colliders (insertion-ordered) and worlds living under one tree root."""
+
+    __slots__ = ("colliders", "worlds")
+
+    def __init__(self):
+        self.colliders = {}  # collider -> None, used as an ordered set
+        self.worlds = []
+
+
+def _seed(node):
+    """Registry describing a lone node (the node itself, if indexed)."""
+    reg = ColliderRegistry()
+    role = getattr(node, "_registry_role", None)
+    if role == "collider":
+        reg.colliders[node] = None
+    elif role == "world":
+        reg.worlds.append(node)
+    return reg
+
+
+def _root_of(node):
+    while node.parent:
+        node = node.parent
+    return node
+
+
+def _on_attach(parent, child):
+    sub = child.__dict__.pop(_ATTR, None)
+    if sub is None:
+        if getattr(child, "_registry_role", None) is None:
+            return  # plain subtree with nothing to index
+        sub = _seed(child)
+
+    root = _root_of(parent)
+    reg = root.__dict__.get(_ATTR)
+    if reg is None:
+        reg = _seed(root)
+        setattr(root, _ATTR, reg)
+
+    if sub.colliders:
+        added = list(sub.colliders)
+        for world in reg.worlds:
+            world._register_colliders(added)
+    if sub.worlds:
+        existing = list(reg.colliders)
+        for world in sub.worlds:
+            world._register_colliders(existing)
+
+    reg.colliders.update(sub.colliders)
+    reg.worlds.extend(sub.worlds)
+
+
+def _on_detach(parent, child):
+    reg = _root_of(parent).__dict__.get(_ATTR)
+    if reg is None:
+        return
+
+    sub = ColliderRegistry()
+    stack = [child]
+    while stack:
+        node = stack.pop()
+        role = getattr(node, "_registry_role", None)
+        if role == "collider":
+            sub.colliders[node] = None
+        elif role == "world":
+            sub.worlds.append(node)
+        stack.extend(reversed(node.children))
+
+    if not sub.colliders and not sub.worlds:
+        return
+
+    for col in sub.colliders:
+        reg.colliders.pop(col, None)
+    if sub.worlds:
+        leaving = set(sub.worlds)
+        reg.worlds = [w for w in reg.worlds if w not in leaving]
+
+    removed = list(sub.colliders)
+    if removed:
+        for world in reg.worlds:
+            world._unregister_colliders(removed)
+    for world in sub.worlds:
+        world._reset_colliders(removed)
+
+    setattr(child, _ATTR, sub)
+
+
+Node._attach_hooks.append(_on_attach)
+Node._detach_hooks.append(_on_detach)
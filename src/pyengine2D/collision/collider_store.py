@@ -0,0 +1,163 @@
+"""
+ColliderStore — struct-of-arrays mirror of CollisionWorld's collider bounds.
+
+Bounds, shape flags and layer/mask bitmasks live in contiguous NumPy
+arrays (one row per collider) so that broad-phase pair detection can be
+done in bulk: a sort along X followed by a vectorized Y-overlap test and
+a vectorized layer/mask AND, instead of one Python-level comparison per
+candidate pair.
+
+NumPy is optional.  ``ColliderStore.available`` is False when it is not
+installed and CollisionWorld falls back to its pure-Python path.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class ColliderStore:
+    """
+    Row-per-collider arrays:
+
+        bounds[i] = (left, top, right, bottom)
+        shape[i]  = SHAPE_AABB / SHAPE_CIRCLE / SHAPE_POLYGON / SHAPE_TILES
+        layer_bits[i], mask_bits[i] = collider.layer_bits, collider.mask_bits
+
+    Rows are kept dense: removing a collider moves the last row into
+    its slot, so ``bounds[:count]`` is always the live set.
+    """
+
+    available = np is not None
+
+    SHAPE_AABB = 0
+    SHAPE_CIRCLE = 1
+    SHAPE_POLYGON = 2
+    SHAPE_TILES = 3
+
+    def __init__(self, capacity=64):
+        self.colliders = []  # row -> collider
+        self.index = {}      # collider -> row
+        self.count = 0
+        self.bounds = np.zeros((capacity, 4), dtype=np.float64)
+        self.shape = np.zeros(capacity, dtype=np.int8)
+        self.layer_bits = np.zeros(capacity, dtype=np.uint64)
+        self.mask_bits = np.zeros(capacity, dtype=np.uint64)
+
+    @classmethod
+    def shape_of(cls, collider):
+        if getattr(collider, 'is_tile_grid', False):
+            return cls.SHAPE_TILES
+        if hasattr(collider, 'local_points'):
+            return cls.SHAPE_POLYGON
+        if hasattr(collider, 'radius'):
+            return cls.SHAPE_CIRCLE
+        return cls.SHAPE_AABB
+
+    def _grow(self):
+        capacity = max(64, len(self.bounds) * 2)
+        bounds = np.zeros((capacity, 4), dtype=np.float64)
+        bounds[:self.count] = self.bounds[:self.count]
+        shape = np.zeros(capacity, dtype=np.int8)
+        shape[:self.count] = self.shape[:self.count]
+        layer_bits = np.zeros(capacity, dtype=np.uint64)
+        layer_bits[:self.count] = self.layer_bits[:self.count]
+        mask_bits = np.zeros(capacity, dtype=np.uint64)
+        mask_bits[:self.count] = self.mask_bits[:self.count]
+        self.bounds = bounds
+        self.shape = shape
+        self.layer_bits = layer_bits
+        self.mask_bits = mask_bits
+
+    def set(self, collider, rect):
+        """Insert *collider* or overwrite its bounds and layer/mask bits."""
+        row = self.index.get(collider)
+        if row is None:
+            if self.count == len(self.bounds):
+                self._grow()
+            row = self.count
+            self.count += 1
+            self.index[collider] = row
+            self.colliders.append(collider)
+            self.shape[row] = self.shape_of(collider)
+        self.bounds[row] = rect
+        self.layer_bits[row] = collider.layer_bits
+        self.mask_bits[row] = collider.mask_bits
+
+    def remove(self, collider):
+        row = self.index.pop(collider, None)
+        if row is None:
+            return
+        last = self.count - 1
+        moved = self.colliders.pop()
+        if row != last:
+            self.colliders[row] = moved
+            self.index[moved] = row
+            self.bounds[row] = self.bounds[last]
+            self.shape[row] = self.shape[last]
+            self.layer_bits[row] = self.layer_bits[last]
+            self.mask_bits[row] = self.mask_bits[last]
+        self.count = last
+
+    def clear(self):
+        self.colliders = []
+        self.index = {}
+        self.count = 0
+
+    def overlapping_pairs(self, eps=0.0, moved=None):
+        """
+        Return two int arrays (rows_a, rows_b) holding every unordered
+        pair whose bounds, grown by *eps*, overlap.  With *moved* (a bool
+        array over the rows), only pairs with at least one moved row are
+        generated.
+        """
+        n = self.count
+        empty = np.empty(0, dtype=np.intp)
+        if n < 2:
+            return empty, empty
+
+        b = self.bounds[:n]
+        order = np.argsort(b[:, 0], kind='stable')
+        left = b[order, 0]
+        top = b[order, 1]
+        right = b[order, 2]
+        bottom = b[order, 3]
+
+        # Sweep along X: row j > i is a candidate while left[j] < right[i] + eps
+        if moved is None:
+            starts = np.arange(n)
+        else:
+            flags = moved[:n][order]
+            starts = np.flatnonzero(flags)
+        ends = np.searchsorted(left, right[starts] + eps, side='left')
+        ii, jj = _ranges(starts, starts + 1, ends)
+
+        if moved is not None and len(starts):
+            # ... and a moved row j also pairs with the unmoved rows i < j
+            # reaching it (moved ones already swept it above)
+            reach = float((right - left).max()) + eps
+            lo = np.searchsorted(left, left[starts] - reach, side='left')
+            jl, il = _ranges(starts, lo, starts)
+            keep = (right[il] + eps > left[jl]) & ~flags[il]
+            ii = np.concatenate((ii, il[keep]))
+            jj = np.concatenate((jj, jl[keep]))
+        if len(ii) == 0:
+            return empty, empty
+
+        hit = (top[ii] < bottom[jj] + eps) & (bottom[ii] > top[jj] - eps)
+        return order[ii[hit]], order[jj[hit]]
+
+
+def _ranges(owners, starts, ends):
+    """
+    Expand the half-open ranges [starts[k], ends[k]) into flat arrays
+    (owner, value): owners[k] repeated once per value of its range.
+    """
+    counts = np.maximum(ends - starts, 0)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    group_start = np.repeat(np.cumsum(counts) - counts, counts)
+    values = np.repeat(starts, counts) + (np.arange(total) - group_start)
+    return np.repeat(owners, counts), values
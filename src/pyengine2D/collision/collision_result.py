@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.pyengine2D.collision.collider2d import Collider2D
@@ -13,15 +13,22 @@ class CollisionResult:
     Attributes:
         collided:    True if an overlap was detected.
         collider:    The Collider2D that was hit (None if no collision).
-        normal_x:    X component of the collision normal (-1, 0, or 1).
-        normal_y:    Y component of the collision normal (-1, 0, or 1).
+        normal_x:    X component of the collision normal (-1, 0, or 1;
+                     any unit vector for round shape_cast contacts).
+        normal_y:    Y component of the collision normal.
         penetration: Overlap depth along the normal axis.
+        time:        For swept queries, the fraction of the motion travelled
+                     before contact (1.0 when the path is clear).
+        rect:        World bounds (l, t, r, b) of the surface that was hit;
+                     for a TileGridCollider, the individual tile.
     """
     collided: bool
     collider: Optional['Collider2D']
     normal_x: float
     normal_y: float
     penetration: float
+    time: float = 1.0
+    rect: Optional[Tuple[float, float, float, float]] = None
 
     @staticmethod
     def none() -> 'CollisionResult':
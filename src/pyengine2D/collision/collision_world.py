@@ -2,8 +2,65 @@ from src.pyengine2D.scene.node2d import Node2D
 from src.pyengine2D.collision.collider2d import Collider2D
 from src.pyengine2D.collision.polygon_collider2d import PolygonCollider2D
 from src.pyengine2D.collision.collision_result import CollisionResult
-from src.pyengine2D.collision.spatial_grid import UniformGrid
+from src.pyengine2D.collision.spatial_grid import UniformGrid, SweepAndPrune, DynamicAABBTree
+from src.pyengine2D.collision.collider_store import ColliderStore
+from src.pyengine2D.collision.layers import LayerRegistry
+import itertools
 import math
+import warnings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class _TileShape:
+    """Stand-in for one solid tile of a TileGridCollider in _narrow_hit (a plain AABB)."""
+    is_tile_grid = False
+
+
+_TILE = _TileShape()
+
+# Event phases (indices into a body class's dispatch tuple)
+_ENTER, _STAY, _EXIT = 0, 1, 2
+_PHASE_NAMES = ("enter", "stay", "exit")
+
+# Profiler counter suffixes, indexed by ColliderStore.SHAPE_* codes.  A
+# pair is counted under the costlier of its two shapes (the larger code).
+_SHAPE_NAMES = ("aabb", "circle", "polygon", "tiles")
+
+# body class -> (on_collision_enter, on_collision_stay, on_collision_exit) or None each
+_DISPATCH = {}
+
+# Stable integer ids handed to colliders on first registration
+_collider_ids = itertools.count(1)
+
+
+def collision_noop(fn):
+    """
+    Mark a default, do-nothing collision callback.  Bodies whose class
+    only inherits the marked version are skipped for that event, which
+    makes on_collision_stay free unless a subclass overrides it.
+    """
+    fn._collision_noop = True
+    return fn
+
+
+class Contact:
+    """Persistent record of a touching collider pair."""
+
+    NEW = 0        # began touching this frame
+    TOUCHING = 1   # touching for more than one frame
+    SEPARATED = 2  # stopped touching (set just before removal)
+
+    __slots__ = ("a", "b", "state", "frame")
+
+    def __init__(self, a, b, frame):
+        self.a = a
+        self.b = b
+        self.state = Contact.NEW
+        self.frame = frame  # last frame the pair was seen touching
 
 
 class CollisionWorld(Node2D):
@@ -11,7 +68,8 @@ class CollisionWorld(Node2D):
     Manages all colliders in the scene and provides collision queries.
     
     Responsibilities:
-        - Walk the scene tree to find Collider2D nodes
+        - Track the Collider2D nodes of its scene tree (kept current by
+          the collider registry's add_child/remove_child hooks)
         - check_collision(): test a collider at a candidate position,
           return a CollisionResult with penetration and normal
         - process_collisions(): broad-phase pair detection with
@@ -20,65 +78,296 @@ class CollisionWorld(Node2D):
     Performance:
         Uses a UniformGrid spatial partitioning structure so that
         broad-phase pair detection is O(n·k) instead of O(n²).
+
+        With ``persistent=True`` (the default) the grid is kept between
+        frames.  Each collider is re-bucketed only when its Node2D
+        transform version or its shape version (bumped by the width,
+        height, radius and points setters) changed since the last
+        sync, so static level geometry is inserted once and the
+        per-frame cost follows the number of moving colliders rather
+        than the level size.
+        ``persistent=False`` restores the clear-and-rebuild behaviour.
+
+        With ``vectorized=True`` (requires NumPy) the bounds are mirrored
+        into a ColliderStore and process_collisions() finds overlapping
+        pairs with a bulk sweep instead of per-collider grid queries.
+        Event semantics are identical to the default path.
+
+        ``broadphase`` selects the spatial structure used for queries and
+        pair search: ``"grid"`` (UniformGrid, default), ``"sap"``
+        (SweepAndPrune) or ``"bvh"`` (DynamicAABBTree).  All query APIs
+        work the same on each; stats() reports the structure's state.
+
+        Touching pairs live in a persistent contact table keyed by stable
+        integer collider ids, so no per-frame pair sets are rebuilt or
+        diffed.  Callbacks are looked up once per body class; a class that
+        does not implement on_collision_stay gets no stay calls at all.
+
+        Pairs are only re-tested when one side moved (or changed layer,
+        mask or is_trigger) since the previous frame; static-static and
+        resting pairs keep their contact state.
+        motion_state() classifies colliders as static, kinematic, dynamic
+        or sleeping on that basis.
+
+        When a profiler is set (or an Engine is running) update() times
+        its three stages as ``Collision.*`` subsystems and tracks collider,
+        candidate, narrow-phase test and event counts per shape each frame.
     """
+    _registry_role = "world"
 
-    def __init__(self, name, cell_size=128):
+    # Broad-phase margin: touching colliders still count as colliding
+    PAIR_EPS = 0.5
+    # Slack around a cached candidate rect so snap corrections still fit
+    CANDIDATE_PAD = 4.0
+
+    BROADPHASES = {
+        "grid": lambda cell_size: UniformGrid(cell_size=cell_size),
+        "sap": lambda cell_size: SweepAndPrune(),
+        "bvh": lambda cell_size: DynamicAABBTree(),
+    }
+
+    def __init__(self, name, cell_size=128, persistent=True, vectorized=False, broadphase="grid"):
         super().__init__(name)
-        self._last_collisions = set()
+        if broadphase not in self.BROADPHASES:
+            raise ValueError(
+                f"Unknown broadphase {broadphase!r}; expected one of {sorted(self.BROADPHASES)}"
+            )
+        self.persistent = persistent
+        if vectorized and not ColliderStore.available:
+            warnings.warn(
+                "CollisionWorld(vectorized=True) needs NumPy; falling back to the grid path.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            vectorized = False
+        self.vectorized = vectorized
+        self._store = ColliderStore() if vectorized else None
+        self._contacts = {}  # pair key -> Contact
+        self._frame = 0
+        self._moved = set()       # colliders re-synced since the last pair pass
+        self._last_moved = set()  # the set used by the last pair pass
+        self._disturbed = {}      # collider -> partners that moved against it / None if removed
+        self._colliders = {}  # collider -> None, ordered set fed by the registry
+        self._colliders_changed = False
         self._cached_colliders = []
         self._cached_rects = {}  # collider -> (l, t, r, b)
-        self._grid = UniformGrid(cell_size=cell_size)
+        self._synced_versions = {}  # collider -> transform + filter + shape version at last sync
+        self.broadphase = broadphase
+        self._grid = self.BROADPHASES[broadphase](cell_size)
+        # collider -> (padded rect, candidate set); valid until the grid changes
+        self._candidate_cache = {}
+        self.candidate_hits = 0
+        self.candidate_misses = 0
+        # Per-frame counters are published to this EngineProfiler (or to the
+        # running Engine's) each update(); None and no engine = no counting.
+        self.profiler = None
+        self._counters = None
 
     def update(self, delta):
         """Update cache before children update."""
-        self._refresh_collider_cache()
-        self._refresh_rect_cache()
-        self.process_collisions()
+        profiler = self._active_profiler()
+        if profiler is None:
+            self._counters = None
+            self._refresh_collider_cache()
+            self._refresh_rect_cache()
+            self.process_collisions()
+        else:
+            self._counters = {
+                'candidates': [0] * len(_SHAPE_NAMES),
+                'narrow': [0] * len(_SHAPE_NAMES),
+                'events': [0] * len(_PHASE_NAMES),
+            }
+            profiler.begin("Collision.ColliderCache")
+            self._refresh_collider_cache()
+            profiler.end("Collision.ColliderCache")
+            profiler.begin("Collision.RectCache")
+            self._refresh_rect_cache()
+            profiler.end("Collision.RectCache")
+            profiler.begin("Collision.Pairs")
+            self.process_collisions()
+            profiler.end("Collision.Pairs")
+            self._publish_counters(profiler)
         super().update(delta)
 
+    def _active_profiler(self):
+        """This world's profiler, else the running Engine's, else None."""
+        if self.profiler is not None:
+            return self.profiler
+        from src.pyengine2D.core.engine import Engine
+        return Engine.instance.profiler if Engine.instance else None
+
+    def _publish_counters(self, profiler):
+        """Track this frame's collision counters under ``collision.*`` names."""
+        counters = self._counters
+        shape_of = ColliderStore.shape_of
+        colliders = [0] * len(_SHAPE_NAMES)
+        for col in self._cached_colliders:
+            colliders[shape_of(col)] += 1
+        for i, shape in enumerate(_SHAPE_NAMES):
+            profiler.track(f"collision.colliders.{shape}", colliders[i])
+            profiler.track(f"collision.candidates.{shape}", counters['candidates'][i])
+            profiler.track(f"collision.narrow.{shape}", counters['narrow'][i])
+        for i, phase in enumerate(_PHASE_NAMES):
+            profiler.track(f"collision.events.{phase}", counters['events'][i])
+        grid_stats = self._grid.stats()
+        for key in ('cell_count', 'max_bucket'):
+            if key in grid_stats:
+                profiler.track(f"collision.grid.{key}", grid_stats[key])
+
     def _refresh_collider_cache(self):
-        """Flatten the collider list once per frame to avoid O(N^2) tree walking."""
-        root = self._get_root()
-        self._cached_colliders = [
-            node for node in self._walk(root)
-            if isinstance(node, Collider2D)
-        ]
+        """Rebuild the flat collider list, only if registrations changed."""
+        if self._colliders_changed:
+            self._cached_colliders = list(self._colliders)
+            self._colliders_changed = False
+
+    def _register_colliders(self, colliders):
+        """Registry callback: *colliders* entered this world's tree."""
+        known = self._colliders
+        for col in colliders:
+            known[col] = None
+            if col._collider_id is None:
+                col._collider_id = next(_collider_ids)
+        self._colliders_changed = True
+        self._candidate_cache.clear()
+
+    def _unregister_colliders(self, colliders):
+        """Registry callback: *colliders* left this world's tree."""
+        known = self._colliders
+        for col in colliders:
+            if col in known:
+                del known[col]
+                self._grid.remove(col)
+                self._synced_versions.pop(col, None)
+                self._cached_rects.pop(col, None)
+                if self._store is not None:
+                    self._store.remove(col)
+        self._colliders_changed = True
+        self._candidate_cache.clear()
+
+    def _reset_colliders(self, colliders):
+        """Registry callback: this world moved to a tree holding only *colliders*."""
+        self._colliders = dict.fromkeys(colliders)
+        for col in colliders:
+            if col._collider_id is None:
+                col._collider_id = next(_collider_ids)
+        self._colliders_changed = True
+        self._grid.clear()
+        self._synced_versions = {}
+        self._cached_rects = {}
+        self._candidate_cache.clear()
+        if self._store is not None:
+            self._store.clear()
 
     def _refresh_rect_cache(self):
         """Pre-calculate all world-space collider bounds and populate spatial grid."""
-        self._cached_rects = {}
-        self._grid.clear()
+        self._candidate_cache.clear()
+        store = self._store
+        if not self.persistent:
+            self._cached_rects = {}
+            self._synced_versions = {}
+            self._grid.clear()
+            if store is not None:
+                store.clear()
+            for col in self._cached_colliders:
+                rect = self._compute_rect(col)
+                self._cached_rects[col] = rect
+                self._grid.insert(col, rect[0], rect[1], rect[2], rect[3])
+                if store is not None:
+                    store.set(col, rect)
+            self._moved.update(self._cached_colliders)
+            return
+
+        rects = self._cached_rects
+        versions = self._synced_versions
+        grid = self._grid
+        moved = self._moved
+
+        # Re-bucket only colliders whose transform, filter or shape changed
         for col in self._cached_colliders:
-            if hasattr(col, 'get_rect'):
-                res = col.get_rect()
-                if isinstance(res, tuple):
-                    rect = res
-                else:
-                    rect = (res.left, res.top, res.right, res.bottom)
-            else:
-                gx, gy = col.get_global_position()
-                sw = col.width * col.scale_x
-                sh = col.height * col.scale_y
-                rect = (gx, gy, gx + sw, gy + sh)
-            self._cached_rects[col] = rect
-            self._grid.insert(col, rect[0], rect[1], rect[2], rect[3])
-
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
-
-    def _walk(self, node):
-        """Recursively yield all descendants of a node."""
-        for child in node.children:
-            yield child
-            yield from self._walk(child)
+            version = col._transform_version + col._filter_version + col._shape_version
+            if versions.get(col) == version:
+                continue
+            rect = self._compute_rect(col)
+            rects[col] = rect
+            grid.update(col, rect[0], rect[1], rect[2], rect[3])
+            if store is not None:
+                store.set(col, rect)
+            versions[col] = version
+            moved.add(col)
+
+    def swept_candidates(self, collider, dx, dy):
+        """
+        Broadphase candidates for *collider* moving by (dx, dy) from its
+        current bounds.  The swept rect (padded by CANDIDATE_PAD) is
+        cached for the rest of the frame, so the per-axis checks of
+        move_and_collide and repeated push checks share one grid query.
+        """
+        l, t, r, b = self._compute_rect(collider)
+        return self._candidates(collider, min(l, l + dx), min(t, t + dy),
+                                max(r, r + dx), max(b, b + dy))
 
-    def _get_root(self):
-        """Walk up to the scene root."""
-        root = self
-        while root.parent:
-            root = root.parent
-        return root
+    def _candidates(self, collider, left, top, right, bottom):
+        """
+        Broadphase candidates overlapping the rect, excluding *collider*.
+        Served from this frame's cache when the rect lies inside the
+        collider's cached padded rect; the set may hold extra colliders,
+        which callers reject with their exact bounds test.
+        """
+        cached = self._candidate_cache.get(collider)
+        if cached is not None:
+            pl, pt, pr, pb = cached[0]
+            if left >= pl and top >= pt and right <= pr and bottom <= pb:
+                self.candidate_hits += 1
+                return cached[1]
+        self.candidate_misses += 1
+        pad = self.CANDIDATE_PAD
+        padded = (left - pad, top - pad, right + pad, bottom + pad)
+        candidates = self._grid.query(*padded, exclude=collider)
+        self._candidate_cache[collider] = (padded, candidates)
+        return candidates
+
+    def candidate_rect(self, collider):
+        """
+        The rect covered by *collider*'s cached candidates this frame
+        (every collider overlapping it is among them), or None.
+        """
+        cached = self._candidate_cache.get(collider)
+        return cached[0] if cached is not None else None
+
+    def candidate_cache_stats(self):
+        """Hit/miss counts of the per-frame candidate cache since the last reset."""
+        total = self.candidate_hits + self.candidate_misses
+        return {
+            'candidate_hits': self.candidate_hits,
+            'candidate_misses': self.candidate_misses,
+            'candidate_hit_rate': self.candidate_hits / total if total else 0.0,
+        }
+
+    def reset_candidate_cache_stats(self):
+        self.candidate_hits = 0
+        self.candidate_misses = 0
+
+    def invalidate(self, collider):
+        """
+        Force *collider* to be re-measured on the next frame.
+        Width, height, radius and points changes are picked up on their
+        own; this is only needed when a custom get_rect() reads other
+        data that changed.
+        """
+        self._synced_versions.pop(collider, None)
+
+    @staticmethod
+    def _compute_rect(col):
+        """Return the world-space (l, t, r, b) bounds of a collider."""
+        if hasattr(col, 'get_rect'):
+            res = col.get_rect()
+            if isinstance(res, tuple):
+                return res
+            return (res.left, res.top, res.right, res.bottom)
+        gx, gy = col.get_global_position()
+        sw = col.width * col.scale_x
+        sh = col.height * col.scale_y
+        return (gx, gy, gx + sw, gy + sh)
 
     # ------------------------------------------------------------------
     # Collision query
@@ -125,23 +414,15 @@ class CollisionWorld(Node2D):
         best_result = CollisionResult.none()
         smallest_penetration = float('inf')
 
-        # Use spatial grid to get candidates instead of scanning all colliders
-        candidates = self._grid.query(test_left, test_top, test_right, test_bottom, exclude=collider)
-
-        for other in candidates:
-            # Layer/mask filtering
-            if other.layer not in collider.mask:
-                continue
+        # Use spatial grid to get candidates (shared per frame with other
+        # queries for this collider) instead of scanning all colliders
+        candidates = self._candidates(collider, test_left, test_top, test_right, test_bottom)
 
-            # Triggers don't block movement
-            if other.is_trigger:
-                continue
-
-            # Other collider bounds (float from cache)
-            other_rect = self._cached_rects.get(other)
-            if not other_rect:
-                continue
-            
+        # Layer/mask filtering; triggers don't block movement
+        shapes = self._blocking_shapes(
+            candidates, collider.mask_bits, test_left, test_top, test_right, test_bottom
+        )
+        for other, other_rect in shapes:
             other_left, other_top, other_right, other_bottom = other_rect
 
             # Float-precision overlap check (strict inequality = no touching)
@@ -185,10 +466,35 @@ class CollisionWorld(Node2D):
                     normal_x=nx,
                     normal_y=ny,
                     penetration=pen,
+                    rect=other_rect,
                 )
 
         return best_result
 
+    def _blocking_shapes(self, candidates, mask_bits, left, top, right, bottom, ignore=None):
+        """
+        Yield (collider, bounds) for each non-trigger candidate whose layer
+        is in *mask_bits* (None = any layer) and that is not in *ignore*.
+        A TileGridCollider yields one entry per solid tile overlapping the
+        given rect instead of its whole-map bounds.
+        """
+        rects = self._cached_rects
+        for other in candidates:
+            if ignore and other in ignore:
+                continue
+            if mask_bits is not None and not other.layer_bits & mask_bits:
+                continue
+            if other.is_trigger:
+                continue
+            other_rect = rects.get(other)
+            if not other_rect:
+                continue
+            if other.is_tile_grid:
+                for tile_rect in other.solid_rects(left, top, right, bottom):
+                    yield other, tile_rect
+            else:
+                yield other, other_rect
+
     def query_overlap(self, collider, test_x, test_y):
         """
         Public query: test if a collider at (test_x, test_y) overlaps
@@ -201,11 +507,12 @@ class CollisionWorld(Node2D):
         """
         return self.check_collision(collider, test_x, test_y)
         
-    def query_overlap_all(self, collider, test_x, test_y):
+    def query_overlap_all(self, collider, test_x, test_y, ignore=None):
         """
         Public query: test if a collider at (test_x, test_y) overlaps
         any non-trigger collider visible via layer/mask.
         Returns ALL overlaps, instead of just the nearest.
+        Colliders in *ignore* (any container) are skipped.
 
         Returns: list of CollisionResult
         """
@@ -234,16 +541,12 @@ class CollisionWorld(Node2D):
         results = []
 
         # Use spatial grid for candidates
-        candidates = self._grid.query(test_left, test_top, test_right, test_bottom, exclude=collider)
-
-        for other in candidates:
-            if other.layer not in collider.mask or other.is_trigger:
-                continue
+        candidates = self._candidates(collider, test_left, test_top, test_right, test_bottom)
 
-            other_rect = self._cached_rects.get(other)
-            if not other_rect:
-                continue
-            
+        shapes = self._blocking_shapes(
+            candidates, collider.mask_bits, test_left, test_top, test_right, test_bottom, ignore
+        )
+        for other, other_rect in shapes:
             other_left, other_top, other_right, other_bottom = other_rect
 
             if (test_left >= other_right or test_right <= other_left or
@@ -302,7 +605,8 @@ class CollisionWorld(Node2D):
                     pen, nx, ny = pen_y, 0.0, normal_y
 
             results.append(CollisionResult(
-                collided=True, collider=other, normal_x=nx, normal_y=ny, penetration=pen
+                collided=True, collider=other, normal_x=nx, normal_y=ny, penetration=pen,
+                rect=other_rect,
             ))
 
         return results
@@ -310,6 +614,7 @@ class CollisionWorld(Node2D):
     def query_rect(self, test_left, test_top, test_right, test_bottom, masks=None, exclude=None):
         """Public API: test if any cached collider overlaps the given float rect."""
         results = []
+        mask_bits = LayerRegistry.bits(masks) if masks else 0
 
         # Use spatial grid for candidates
         candidates = self._grid.query(test_left, test_top, test_right, test_bottom)
@@ -319,60 +624,416 @@ class CollisionWorld(Node2D):
                 continue
             if col.is_trigger:
                 continue
-            if masks and col.layer not in masks:
+            if mask_bits and not col.layer_bits & mask_bits:
                 continue
             rect = self._cached_rects.get(col)
             if not rect:
                 continue
+            if col.is_tile_grid:
+                if next(col.solid_rects(test_left, test_top, test_right, test_bottom), None):
+                    results.append(col)
+                continue
             
             ol, ot, oright, ob = rect
             if not (test_left >= oright or test_right <= ol or test_top >= ob or test_bottom <= ot):
                 results.append(col)
         return results
 
+    def sweep(self, collider, dx, dy):
+        """
+        Continuous (swept-AABB) query: move *collider*'s current bounds by
+        (dx, dy) and find the earliest non-trigger collider it would hit.
+
+        One broadphase query covers the whole swept box, so fast movers do
+        not tunnel through thin geometry.  Colliders already overlapping
+        at the start are ignored, so a body can always move out of an
+        overlap.  Touching at the very end of the motion is not a hit.
+
+        Returns a CollisionResult whose ``time`` is the fraction of the
+        motion travelled before contact and whose normal points away from
+        the surface that was hit.
+        """
+        if dx == 0 and dy == 0:
+            return CollisionResult.none()
+
+        l, t, r, b = self._compute_rect(collider)
+        swept = (min(l, l + dx), min(t, t + dy), max(r, r + dx), max(b, b + dy))
+        candidates = self._candidates(collider, *swept)
+
+        best = None
+        best_rect = None
+        best_time = 1.0
+        best_normal = (0.0, 0.0)
+
+        for other, rect in self._blocking_shapes(candidates, collider.mask_bits, *swept):
+            hit = self._box_cast((l, t, r, b), dx, dy, rect)
+            if hit is None or hit[0] >= best_time:
+                continue
+            best = other
+            best_rect = rect
+            best_time, best_normal = hit[0], hit[1:]
+
+        if best is None:
+            return CollisionResult.none()
+        return CollisionResult(
+            collided=True,
+            collider=best,
+            normal_x=best_normal[0],
+            normal_y=best_normal[1],
+            penetration=0.0,
+            time=best_time,
+            rect=best_rect,
+        )
+
+    @staticmethod
+    def _box_cast(box, dx, dy, rect):
+        """
+        Slab test of *box* moving by (dx, dy) against the static *rect*.
+        Returns (t, nx, ny) for a first contact at 0 <= t < 1, or None.
+        Boxes that already overlap never hit.
+        """
+        l, t, r, b = box
+        ol, ot, o_r, ob = rect
+
+        # Slab entry/exit times per axis
+        if dx > 0:
+            x_enter, x_exit = (ol - r) / dx, (o_r - l) / dx
+        elif dx < 0:
+            x_enter, x_exit = (o_r - l) / dx, (ol - r) / dx
+        elif l < o_r and r > ol:
+            x_enter, x_exit = float('-inf'), float('inf')
+        else:
+            return None
+
+        if dy > 0:
+            y_enter, y_exit = (ot - b) / dy, (ob - t) / dy
+        elif dy < 0:
+            y_enter, y_exit = (ob - t) / dy, (ot - b) / dy
+        elif t < ob and b > ot:
+            y_enter, y_exit = float('-inf'), float('inf')
+        else:
+            return None
+
+        enter = x_enter if x_enter > y_enter else y_enter
+        leave = x_exit if x_exit < y_exit else y_exit
+        if enter < 0.0 or enter >= leave or enter >= 1.0:
+            return None
+        if x_enter > y_enter:
+            return enter, (-1.0 if dx > 0 else 1.0), 0.0
+        return enter, 0.0, (-1.0 if dy > 0 else 1.0)
+
+    @staticmethod
+    def _circle_cast(cx, cy, radius, dx, dy, rect=None, center=None):
+        """
+        Cast a circle by (dx, dy) against a static box *rect* or a static
+        circle at *center* = (x, y, r).  Returns (t, nx, ny) for a first
+        contact at 0 <= t < 1 with the normal pointing back at the moving
+        circle, or None.  Shapes that already overlap never hit.
+        """
+        if center is not None:
+            kx, ky, other_r = center
+            reach = radius + other_r
+        else:
+            l, t, r, b = rect
+            # Already overlapping?
+            qx = l if cx < l else (r if cx > r else cx)
+            qy = t if cy < t else (b if cy > b else cy)
+            if (cx - qx) ** 2 + (cy - qy) ** 2 < radius * radius:
+                return None
+            # Ray against the box grown by the radius; a hit on a face band
+            # is final, a hit in a corner square is refined against the
+            # rounded corner (the grown box is a rounded rectangle).
+            hit = CollisionWorld._box_cast((cx, cy, cx, cy), dx, dy,
+                                           (l - radius, t - radius, r + radius, b + radius))
+            if hit is None:
+                start_inside = (l - radius < cx < r + radius and t - radius < cy < b + radius)
+                if not start_inside:
+                    return None
+                px, py = cx, cy
+            else:
+                px, py = cx + hit[0] * dx, cy + hit[0] * dy
+                if l <= px <= r or t <= py <= b:
+                    return hit
+            kx = l if px < l else r
+            ky = t if py < t else b
+            reach = radius
+
+        # Ray from the circle centre against a circle of radius *reach* at k
+        fx = cx - kx
+        fy = cy - ky
+        a = dx * dx + dy * dy
+        half_b = fx * dx + fy * dy
+        c = fx * fx + fy * fy - reach * reach
+        if a == 0.0 or c < 0.0 or half_b >= 0.0:
+            return None
+        disc = half_b * half_b - a * c
+        if disc < 0.0:
+            return None
+        t_hit = (-half_b - math.sqrt(disc)) / a
+        if t_hit < 0.0 or t_hit >= 1.0:
+            return None
+        return t_hit, (fx + t_hit * dx) / reach, (fy + t_hit * dy) / reach
+
+    # ------------------------------------------------------------------
+    # Shape queries
+    # ------------------------------------------------------------------
+
+    def point_query(self, x, y, mask=None, exclude=None):
+        """
+        Return the non-trigger colliders containing the point (x, y).
+        *mask* is a set of layer names to match (None = any layer).
+        """
+        return self.circle_query(x, y, 0.0, mask=mask, exclude=exclude)
+
+    def circle_query(self, cx, cy, radius, mask=None, exclude=None):
+        """
+        Return the non-trigger colliders overlapping the circle at
+        (cx, cy).  Circles, boxes, polygons and individual tiles of a
+        TileGridCollider are tested exactly, not by their bounds.
+        *mask* is a set of layer names to match (None = any layer).
+        """
+        mask_bits = None if mask is None else LayerRegistry.bits(mask)
+        left, top, right, bottom = cx - radius, cy - radius, cx + radius, cy + radius
+        candidates = self._grid.query(left, top, right, bottom, exclude=exclude)
+        results = []
+        seen = set()
+        for col, rect in self._blocking_shapes(candidates, mask_bits, left, top, right, bottom):
+            if col in seen:
+                continue  # another tile of a grid that already matched
+            if self._circle_overlaps(col, rect, cx, cy, radius):
+                seen.add(col)
+                results.append(col)
+        return results
+
+    def _circle_overlaps(self, col, rect, cx, cy, radius):
+        """Exact circle-vs-shape test; *rect* is the collider (or tile) bounds."""
+        if not col.is_tile_grid:
+            if hasattr(col, 'radius'):
+                ox, oy = col.get_global_position()
+                reach = radius + col.radius * col.scale_x
+                return (cx - ox) ** 2 + (cy - oy) ** 2 <= reach * reach
+            if isinstance(col, PolygonCollider2D):
+                hit, _, _ = self._sat_poly_circle(col.get_global_points(), cx, cy, radius,
+                                                  col.get_global_axes())
+                return hit
+        l, t, r, b = rect
+        qx = l if cx < l else (r if cx > r else cx)
+        qy = t if cy < t else (b if cy > b else cy)
+        return (cx - qx) ** 2 + (cy - qy) ** 2 <= radius * radius
+
+    def nearest(self, x, y, k=1, mask=None, exclude=None):
+        """
+        Return up to *k* (distance, collider) pairs closest to (x, y),
+        nearest first.  Distance is measured to a circle's edge or to a
+        box's bounds, and is 0 when the point is inside.
+
+        On the grid broadphase the search walks rings of cells outward
+        and stops as soon as no unvisited cell can hold anything closer;
+        other broadphases grow a square query until that holds.  Tile
+        grids are level geometry and are skipped (use raycast instead).
+        """
+        if k <= 0:
+            return []
+        mask_bits = None if mask is None else LayerRegistry.bits(mask)
+        rects = self._cached_rects
+        seen = set()
+        found = []
+
+        def visit(cols):
+            for col in cols:
+                if col in seen:
+                    continue
+                seen.add(col)
+                if col is exclude or col.is_trigger or col.is_tile_grid:
+                    continue
+                if mask_bits is not None and not col.layer_bits & mask_bits:
+                    continue
+                rect = rects.get(col)
+                if not rect:
+                    continue
+                found.append((self._point_distance(col, rect, x, y), col._collider_id or 0, col))
+
+        traverse_rings = getattr(self._grid, 'traverse_rings', None)
+        if traverse_rings is not None:
+            for reach, buckets in traverse_rings(x, y):
+                for bucket in buckets:
+                    visit(bucket)
+                if len(found) >= k and sorted(found)[k - 1][0] <= reach:
+                    break
+        else:
+            reach = 64.0
+            total = len(rects)
+            while True:
+                visit(self._grid.query(x - reach, y - reach, x + reach, y + reach))
+                if len(seen) >= total or (len(found) >= k and sorted(found)[k - 1][0] <= reach):
+                    break
+                reach *= 2.0
+
+        found.sort()
+        return [(dist, col) for dist, _, col in found[:k]]
+
+    @staticmethod
+    def _point_distance(col, rect, x, y):
+        """Distance from (x, y) to a collider's circle edge or bounds (0 inside)."""
+        if hasattr(col, 'radius'):
+            ox, oy = col.get_global_position()
+            dist = math.hypot(x - ox, y - oy) - col.radius * col.scale_x
+            return dist if dist > 0.0 else 0.0
+        l, t, r, b = rect
+        ddx = l - x if x < l else (x - r if x > r else 0.0)
+        ddy = t - y if y < t else (y - b if y > b else 0.0)
+        return math.hypot(ddx, ddy)
+
+    def shape_cast(self, collider, dx, dy):
+        """
+        Like sweep(), but circles are cast as circles: a circle collider
+        slides around box corners and other circles instead of stopping
+        at their bounds, and a box is stopped by a circle's round edge.
+        Polygons are cast by their bounds.
+
+        Returns a CollisionResult whose ``time`` is the fraction of the
+        motion travelled before contact and whose unit normal points away
+        from the surface that was hit (diagonal for round contacts).
+        """
+        if dx == 0 and dy == 0:
+            return CollisionResult.none()
+
+        box = self._compute_rect(collider)
+        l, t, r, b = box
+        swept = (min(l, l + dx), min(t, t + dy), max(r, r + dx), max(b, b + dy))
+        candidates = self._candidates(collider, *swept)
+
+        mover_circle = None
+        if hasattr(collider, 'radius'):
+            mover_circle = ((l + r) * 0.5, (t + b) * 0.5, (r - l) * 0.5)
+
+        best = None
+        best_rect = None
+        best_time = 1.0
+        best_normal = (0.0, 0.0)
+
+        for other, rect in self._blocking_shapes(candidates, collider.mask_bits, *swept):
+            other_circle = None
+            if not other.is_tile_grid and hasattr(other, 'radius'):
+                ol, ot, o_r, ob = rect
+                other_circle = ((ol + o_r) * 0.5, (ot + ob) * 0.5, (o_r - ol) * 0.5)
+
+            if mover_circle is not None:
+                mx, my, mr = mover_circle
+                hit = self._circle_cast(mx, my, mr, dx, dy, rect=rect, center=other_circle)
+            elif other_circle is not None:
+                # Box vs circle: cast the circle the opposite way and flip the normal
+                ox, oy, o_rad = other_circle
+                hit = self._circle_cast(ox, oy, o_rad, -dx, -dy, rect=box)
+                if hit is not None:
+                    hit = (hit[0], -hit[1], -hit[2])
+            else:
+                hit = self._box_cast(box, dx, dy, rect)
+
+            if hit is None or hit[0] >= best_time:
+                continue
+            best = other
+            best_rect = rect
+            best_time, best_normal = hit[0], hit[1:]
+
+        if best is None:
+            return CollisionResult.none()
+        return CollisionResult(
+            collided=True,
+            collider=best,
+            normal_x=best_normal[0],
+            normal_y=best_normal[1],
+            penetration=0.0,
+            time=best_time,
+            rect=best_rect,
+        )
+
+    STATIC = "static"        # is_static, did not move last frame
+    KINEMATIC = "kinematic"  # is_static, but moved (platforms, doors)
+    DYNAMIC = "dynamic"      # moved last frame
+    SLEEPING = "sleeping"    # not static, did not move last frame
+
+    def motion_state(self, collider):
+        """Classify *collider* by whether it moved before the last pair pass."""
+        moved = collider in self._last_moved
+        if collider.is_static:
+            return self.KINEMATIC if moved else self.STATIC
+        return self.DYNAMIC if moved else self.SLEEPING
+
+    def disturbed_by(self, collider):
+        """
+        Colliders that moved against *collider* in the last pair pass:
+        they began, kept or stopped touching it because they moved.
+        ``None`` stands for a touching collider that was removed.  Only
+        tracked with ``persistent=True``, where motion is known.
+        PhysicsWorld2D wakes sleeping bodies from this.
+        """
+        return self._disturbed.get(collider, ())
+
     def get_collider_count(self):
         """Returns the number of active colliders in the cache."""
         return len(self._cached_colliders)
 
+    def stats(self):
+        """Broadphase statistics (cell usage, tree height/balance, ...)."""
+        info = {
+            'broadphase': self.broadphase,
+            'colliders': len(self._cached_colliders),
+            'contacts': len(self._contacts),
+        }
+        info.update(self.candidate_cache_stats())
+        for state in (self.STATIC, self.KINEMATIC, self.DYNAMIC, self.SLEEPING):
+            info[state] = 0
+        for col in self._cached_colliders:
+            info[self.motion_state(col)] += 1
+        info.update(self._grid.stats())
+        return info
+
     # ------------------------------------------------------------------
     # SAT Geometry Helpers
     # ------------------------------------------------------------------
 
-    def _sat_poly_poly(self, pts_a, pts_b):
-        """Check SAT narrowphase between two convex polygons. Returns (collided, normal, depth)."""
+    # SAT axes of an axis-aligned box
+    AABB_AXES = ((1.0, 0.0), (0.0, 1.0))
+
+    @staticmethod
+    def _edge_axes(pts):
+        """Unit edge normals of a convex polygon given as world-space points."""
+        axes = []
+        n = len(pts)
+        for i in range(n):
+            p1 = pts[i]
+            p2 = pts[(i + 1) % n]
+            ax, ay = -(p2[1] - p1[1]), p2[0] - p1[0]  # Perpendicular normal
+            l = math.sqrt(ax * ax + ay * ay)
+            if l == 0: continue
+            axes.append((ax / l, ay / l))
+        return axes
+
+    def _sat_poly_poly(self, pts_a, pts_b, axes_a=None, axes_b=None):
+        """
+        Check SAT narrowphase between two convex polygons. Returns (collided, normal, depth).
+        *axes_a* / *axes_b* are optional precomputed unit axes (see
+        PolygonCollider2D.get_global_axes); edge normals are derived otherwise.
+        """
         overlap = float('inf')
         smallest_axis = (0, 0)
 
-        edges = []
-        for i in range(len(pts_a)):
-            p1 = pts_a[i]
-            p2 = pts_a[(i + 1) % len(pts_a)]
-            edges.append((p2[0] - p1[0], p2[1] - p1[1]))
-            
-        for i in range(len(pts_b)):
-            p1 = pts_b[i]
-            p2 = pts_b[(i + 1) % len(pts_b)]
-            edges.append((p2[0] - p1[0], p2[1] - p1[1]))
-
-        for edge in edges:
-            axis = (-edge[1], edge[0])  # Perpendicular normal
-            l = math.sqrt(axis[0]**2 + axis[1]**2)
-            if l == 0: continue
-            axis = (axis[0]/l, axis[1]/l)
+        if axes_a is None:
+            axes_a = self._edge_axes(pts_a)
+        if axes_b is None:
+            axes_b = self._edge_axes(pts_b)
+
+        for axis in (*axes_a, *axes_b):
+            ax, ay = axis
 
             # Project poly A
-            min_a, max_a = float('inf'), float('-inf')
-            for p in pts_a:
-                proj = p[0]*axis[0] + p[1]*axis[1]
-                min_a = min(min_a, proj)
-                max_a = max(max_a, proj)
-                
+            proj_a = [p[0] * ax + p[1] * ay for p in pts_a]
+            min_a, max_a = min(proj_a), max(proj_a)
+
             # Project poly B
-            min_b, max_b = float('inf'), float('-inf')
-            for p in pts_b:
-                proj = p[0]*axis[0] + p[1]*axis[1]
-                min_b = min(min_b, proj)
-                max_b = max(max_b, proj)
+            proj_b = [p[0] * ax + p[1] * ay for p in pts_b]
+            min_b, max_b = min(proj_b), max(proj_b)
 
             # Check gap
             if max_a < min_b or max_b < min_a:
@@ -386,56 +1047,49 @@ class CollisionWorld(Node2D):
 
         return True, smallest_axis, overlap
 
-    def _sat_poly_circle(self, pts_poly, cx, cy, radius):
-        """Check SAT narrowphase between convex polygon and circle."""
+    def _sat_poly_circle(self, pts_poly, cx, cy, radius, axes=None):
+        """
+        Check SAT narrowphase between convex polygon and circle.
+        *axes* are the polygon's optional precomputed unit edge normals.
+        """
         overlap = float('inf')
         smallest_axis = (0, 0)
-        
-        edges = []
+
+        axes = list(axes) if axes is not None else self._edge_axes(pts_poly)
+
         closest_vertex = None
         min_dist_sq = float('inf')
-        
-        for i in range(len(pts_poly)):
-            p1 = pts_poly[i]
-            p2 = pts_poly[(i + 1) % len(pts_poly)]
-            edges.append((p2[0] - p1[0], p2[1] - p1[1]))
-            
-            ds = (p1[0] - cx)**2 + (p1[1] - cy)**2
+        for p in pts_poly:
+            ds = (p[0] - cx)**2 + (p[1] - cy)**2
             if ds < min_dist_sq:
                 min_dist_sq = ds
-                closest_vertex = p1
-                
+                closest_vertex = p
+
         # The axis connecting circle center to closest vertex is a potential separating axis
-        if closest_vertex:
-            v_axis = (closest_vertex[0] - cx, closest_vertex[1] - cy)
-            edges.append((-v_axis[1], v_axis[0])) # Convert back to edge format to be pushed to normal
-        
-        for edge in edges:
-            axis = (-edge[1], edge[0])
-            l = math.sqrt(axis[0]**2 + axis[1]**2)
-            if l == 0: continue
-            axis = (axis[0]/l, axis[1]/l)
-            
+        if closest_vertex and min_dist_sq > 0:
+            l = math.sqrt(min_dist_sq)
+            axes.append(((closest_vertex[0] - cx) / l, (closest_vertex[1] - cy) / l))
+
+        for axis in axes:
+            ax, ay = axis
+
             # Project Poly
-            min_a, max_a = float('inf'), float('-inf')
-            for p in pts_poly:
-                proj = p[0]*axis[0] + p[1]*axis[1]
-                min_a = min(min_a, proj)
-                max_a = max(max_a, proj)
-                
+            proj = [p[0] * ax + p[1] * ay for p in pts_poly]
+            min_a, max_a = min(proj), max(proj)
+
             # Project Circle
-            proj_c = cx*axis[0] + cy*axis[1]
+            proj_c = cx * ax + cy * ay
             min_b = proj_c - radius
             max_b = proj_c + radius
-            
+
             if max_a < min_b or max_b < min_a:
                 return False, (0, 0), 0
-                
+
             axis_depth = min(max_a - min_b, max_b - min_a)
             if axis_depth < overlap:
                 overlap = axis_depth
                 smallest_axis = axis
-                
+
         return True, smallest_axis, overlap
 
     # ------------------------------------------------------------------
@@ -443,31 +1097,134 @@ class CollisionWorld(Node2D):
     # ------------------------------------------------------------------
 
     def process_collisions(self):
-        """Call once per frame to emit collision enter/stay/exit events."""
-        current = set()
+        """
+        Call once per frame to emit collision enter/stay/exit events.
+
+        Only pairs with at least one collider that moved (was re-synced)
+        since the last call are tested.  Contacts between two unmoved
+        colliders cannot have changed, so they carry forward as "stay".
+        """
+        self._frame += 1
+        moved = self._moved
+        self._last_moved = moved
+        self._moved = set()
+        self._disturbed = {}
+
+        if self._store is not None:
+            self._collect_pairs_vectorized(moved)
+        else:
+            self._collect_pairs(moved)
+
+        # Contacts not refreshed this frame: carried forward if neither
+        # side moved (and both are still registered), otherwise separated
+        frame = self._frame
+        contacts = self._contacts
+        known = self._colliders
+        stale = [(key, contact) for key, contact in contacts.items() if contact.frame != frame]
+        for key, contact in stale:
+            a, b = contact.a, contact.b
+            if a not in moved and b not in moved and a in known and b in known:
+                contact.frame = frame
+                contact.state = Contact.TOUCHING
+                self._emit(a, b, _STAY)
+            else:
+                del contacts[key]
+                contact.state = Contact.SEPARATED
+                self._emit(a, b, _EXIT)
+                if self.persistent:
+                    self._disturb(a, b, b not in known)
+                    self._disturb(b, a, a not in known)
+
+    def _disturb(self, col, other, removed=False):
+        """Record that *other* moved against *col* (or was removed) this pass."""
+        if removed:
+            self._disturbed.setdefault(col, []).append(None)
+        elif other in self._last_moved:
+            self._disturbed.setdefault(col, []).append(other)
+
+    @staticmethod
+    def _pair_key(a, b):
+        """Order-independent integer key for a collider pair."""
+        ia = a._collider_id
+        ib = b._collider_id
+        return (ia << 32) | ib if ia < ib else (ib << 32) | ia
+
+    def _touch(self, a, b):
+        """Record that *a* and *b* touch this frame; emit enter or (opt-in) stay."""
+        key = self._pair_key(a, b)
+        contact = self._contacts.get(key)
+        frame = self._frame
+        if contact is None:
+            self._contacts[key] = Contact(a, b, frame)
+            self._emit(a, b, _ENTER)
+        elif contact.frame != frame:
+            contact.frame = frame
+            contact.state = Contact.TOUCHING
+            self._emit(a, b, _STAY)
+        if self.persistent:
+            self._disturb(a, b)
+            self._disturb(b, a)
+
+    def _collect_pairs(self, moved):
+        """
+        Grid-driven pair search over pairs with at least one collider in
+        *moved*; records touching pairs in the contact table.
+        """
+        if not moved:
+            return
         checked_pairs = set()
+        EPS = self.PAIR_EPS
+        touch = self._touch
+        counters = self._counters
+        if counters is not None:
+            shape_of = ColliderStore.shape_of
+            n_candidates = counters['candidates']
+            n_narrow = counters['narrow']
+
+        candidate_pairs = getattr(self._grid, 'candidate_pairs', None)
+        if candidate_pairs is not None:
+            # Broadphase enumerates each overlapping pair exactly once.
+            # While few colliders moved it only looks around those; a
+            # full sweep is cheaper once most of them did.
+            rects = self._cached_rects
+            only = moved if 2 * len(moved) < len(rects) else None
+            for a, b in candidate_pairs(EPS, only):
+                if only is None and a not in moved and b not in moved:
+                    continue
+                if counters is not None:
+                    kind = max(shape_of(a), shape_of(b))
+                    n_candidates[kind] += 1
+                if not (b.layer_bits & a.mask_bits or a.layer_bits & b.mask_bits):
+                    continue
+                if counters is not None:
+                    n_narrow[kind] += 1
+                if self._narrow_hit(a, b, rects[a], rects[b]):
+                    touch(a, b)
+            return
 
+        pair_key = self._pair_key
         for a in self._cached_colliders:
+            if a not in moved:
+                continue  # unmoved-vs-unmoved pairs carry forward
             rect_a = self._cached_rects.get(a)
             if not rect_a:
                 continue
 
             # Query spatial grid for potential partners near a
             la, ta, ra, ba = rect_a
-            EPS = 0.5
             nearby = self._grid.query(la - EPS, ta - EPS, ra + EPS, ba + EPS, exclude=a)
 
             for b in nearby:
                 # Ensure each pair is checked only once
-                pair = tuple(sorted((a, b), key=id))
-                if pair in checked_pairs:
+                key = pair_key(a, b)
+                if key in checked_pairs:
                     continue
-                checked_pairs.add(pair)
+                checked_pairs.add(key)
+                if counters is not None:
+                    kind = max(shape_of(a), shape_of(b))
+                    n_candidates[kind] += 1
 
-                a_sees_b = b.layer in a.mask
-                b_sees_a = a.layer in b.mask
-
-                if not a_sees_b and not b_sees_a:
+                if not (b.layer_bits & a.mask_bits or a.layer_bits & b.mask_bits):
                     continue
 
                 rect_b = self._cached_rects.get(b)
@@ -477,83 +1234,141 @@ class CollisionWorld(Node2D):
                 lb, tb, rb, bb = rect_b
 
                 # Standard AABB broad-phase overlap check
-                broadphase_hit = (la < rb + EPS and ra > lb - EPS and ta < bb + EPS and ba > tb - EPS)
-                
-                if broadphase_hit:
-                    # Narrow-phase circle collision
-                    is_a_circle = hasattr(a, 'radius')
-                    is_b_circle = hasattr(b, 'radius')
-                    is_a_poly = isinstance(a, PolygonCollider2D)
-                    is_b_poly = isinstance(b, PolygonCollider2D)
-                    
-                    narrow_hit = True
-                    
-                    if is_a_poly or is_b_poly:
-                        # Convert AABBs to polygons if needed for SAT verification
-                        def _get_pts(col, rect):
-                            if isinstance(col, PolygonCollider2D):
-                                return col.get_global_points()
-                            # AABB to pts
-                            l, t, r, b = rect
-                            return [(l, t), (r, t), (r, b), (l, b)]
-                            
-                        # Handle Poly vs Circle
-                        if is_a_circle or is_b_circle:
-                            circle = a if is_a_circle else b
-                            poly = b if is_a_circle else a
-                            cx, cy = circle.get_global_position()
-                            r = circle.radius * circle.scale_x
-                            pts = poly.get_global_points() if isinstance(poly, PolygonCollider2D) else _get_pts(poly, rect_a if poly is a else rect_b)
-                            narrow_hit, _, _ = self._sat_poly_circle(pts, cx, cy, r)
-                        else:
-                            # Poly vs Poly/AABB
-                            pts_a = _get_pts(a, rect_a)
-                            pts_b = _get_pts(b, rect_b)
-                            narrow_hit, _, _ = self._sat_poly_poly(pts_a, pts_b)
-
-                    elif is_a_circle and is_b_circle:
-                        # Circle-Circle
-                        dx = a.get_global_position()[0] - b.get_global_position()[0]
-                        dy = a.get_global_position()[1] - b.get_global_position()[1]
-                        r = (a.radius * a.scale_x) + (b.radius * b.scale_x)
-                        narrow_hit = (dx*dx + dy*dy) <= (r*r)
-                    elif is_a_circle or is_b_circle:
-                        # Circle-AABB
-                        circle, rect_col = (a, b) if is_a_circle else (b, a)
-                        cx_pos, cy_pos = circle.get_global_position()
-                        r = circle.radius * circle.scale_x
-                        rl, rt, rr, rb_edge = (la, ta, ra, ba) if circle is b else (lb, tb, rb, bb)
-                        
-                        closest_x = max(rl, min(cx_pos, rr))
-                        closest_y = max(rt, min(cy_pos, rb_edge))
-                        dx = cx_pos - closest_x
-                        dy = cy_pos - closest_y
-                        narrow_hit = (dx*dx + dy*dy) <= (r*r)
-
-                    if narrow_hit:
-                        current.add(pair)
-
-                        if pair not in self._last_collisions:
-                            self._emit(a, b, "enter")
-                        else:
-                            self._emit(a, b, "stay")
-
-        # Exited pairs
-        for pair in self._last_collisions - current:
-            a, b = pair
-            self._emit(a, b, "exit")
-
-        self._last_collisions = current
+                if not (la < rb + EPS and ra > lb - EPS and ta < bb + EPS and ba > tb - EPS):
+                    continue
+                if counters is not None:
+                    n_narrow[kind] += 1
+                if self._narrow_hit(a, b, rect_a, rect_b):
+                    touch(a, b)
+
+    def _collect_pairs_vectorized(self, moved):
+        """
+        Bulk pair search over the ColliderStore.  Only pairs with a moved
+        side are generated, and bounds overlap and layer/mask filtering
+        are done for all of them at once; only visible overlapping pairs
+        reach Python for (non-AABB) narrow-phase.
+        """
+        if not moved:
+            return
+        store = self._store
+        moved_flags = np.zeros(store.count, dtype=bool)
+        index = store.index
+        moved_flags[[index[col] for col in moved if col in index]] = True
+        rows_a, rows_b = store.overlapping_pairs(self.PAIR_EPS, moved_flags)
+        layer, mask = store.layer_bits, store.mask_bits
+        visible = ((layer[rows_b] & mask[rows_a]) | (layer[rows_a] & mask[rows_b])) != 0
+        counters = self._counters
+        if counters is not None:
+            n_kinds = len(_SHAPE_NAMES)
+            kinds = np.maximum(store.shape[rows_a], store.shape[rows_b])
+            for name, rows in (('candidates', slice(None)), ('narrow', visible)):
+                counts = np.bincount(kinds[rows], minlength=n_kinds).tolist()
+                for i in range(n_kinds):
+                    counters[name][i] += counts[i]
+        rows_a = rows_a[visible]
+        rows_b = rows_b[visible]
+        aabb_only = (store.shape[rows_a] == ColliderStore.SHAPE_AABB) & \
+                    (store.shape[rows_b] == ColliderStore.SHAPE_AABB)
+
+        cols = store.colliders
+        rects = self._cached_rects
+        touch = self._touch
+
+        for i, j, simple in zip(rows_a.tolist(), rows_b.tolist(), aabb_only.tolist()):
+            a = cols[i]
+            b = cols[j]
+            if not simple and not self._narrow_hit(a, b, rects[a], rects[b]):
+                continue
+            touch(a, b)
+
+    def _narrow_hit(self, a, b, rect_a, rect_b):
+        """Exact shape test for a pair whose bounds already overlap."""
+        if a.is_tile_grid or b.is_tile_grid:
+            if a.is_tile_grid and b.is_tile_grid:
+                return False  # static level geometry never pairs with itself
+            grid, other, rect_o = (a, b, rect_b) if a.is_tile_grid else (b, a, rect_a)
+            eps = self.PAIR_EPS
+            l, t, r, bottom = rect_o
+            for tile_rect in grid.solid_rects(l - eps, t - eps, r + eps, bottom + eps):
+                if self._narrow_hit(other, _TILE, rect_o, tile_rect):
+                    return True
+            return False
+
+        is_a_circle = hasattr(a, 'radius')
+        is_b_circle = hasattr(b, 'radius')
+        is_a_poly = isinstance(a, PolygonCollider2D)
+        is_b_poly = isinstance(b, PolygonCollider2D)
+
+        if is_a_poly or is_b_poly:
+            # AABBs take part in SAT as 4-point polygons with the two box axes
+            def _get_shape(col, rect):
+                if isinstance(col, PolygonCollider2D):
+                    return col.get_global_points(), col.get_global_axes()
+                l, t, r, b = rect
+                return [(l, t), (r, t), (r, b), (l, b)], self.AABB_AXES
+
+            # Handle Poly vs Circle
+            if is_a_circle or is_b_circle:
+                circle = a if is_a_circle else b
+                poly = b if is_a_circle else a
+                cx, cy = circle.get_global_position()
+                r = circle.radius * circle.scale_x
+                pts, axes = _get_shape(poly, rect_a if poly is a else rect_b)
+                narrow_hit, _, _ = self._sat_poly_circle(pts, cx, cy, r, axes)
+            else:
+                # Poly vs Poly/AABB
+                pts_a, axes_a = _get_shape(a, rect_a)
+                pts_b, axes_b = _get_shape(b, rect_b)
+                narrow_hit, _, _ = self._sat_poly_poly(pts_a, pts_b, axes_a, axes_b)
+            return narrow_hit
+
+        if is_a_circle and is_b_circle:
+            # Circle-Circle
+            dx = a.get_global_position()[0] - b.get_global_position()[0]
+            dy = a.get_global_position()[1] - b.get_global_position()[1]
+            r = (a.radius * a.scale_x) + (b.radius * b.scale_x)
+            return (dx*dx + dy*dy) <= (r*r)
+
+        if is_a_circle or is_b_circle:
+            # Circle-AABB
+            circle = a if is_a_circle else b
+            cx_pos, cy_pos = circle.get_global_position()
+            r = circle.radius * circle.scale_x
+            rl, rt, rr, rb_edge = rect_a if circle is b else rect_b
+
+            closest_x = max(rl, min(cx_pos, rr))
+            closest_y = max(rt, min(cy_pos, rb_edge))
+            dx = cx_pos - closest_x
+            dy = cy_pos - closest_y
+            return (dx*dx + dy*dy) <= (r*r)
+
+        return True
+
+    @staticmethod
+    def _handlers(cls):
+        """(enter, stay, exit) callbacks of a body class, resolved once per class."""
+        handlers = _DISPATCH.get(cls)
+        if handlers is None:
+            resolved = []
+            for name in ("on_collision_enter", "on_collision_stay", "on_collision_exit"):
+                fn = getattr(cls, name, None)
+                if fn is None or getattr(fn, "_collision_noop", False):
+                    fn = None
+                resolved.append(fn)
+            handlers = _DISPATCH[cls] = tuple(resolved)
+        return handlers
 
     def _emit(self, a, b, phase):
-        """Notify parent bodies of collision events."""
+        """Notify parent bodies of collision events (phase: _ENTER / _STAY / _EXIT)."""
+        if self._counters is not None:
+            self._counters['events'][phase] += 1
         for col, other in ((a, b), (b, a)):
             body = col.parent
             if not body:
                 continue
-            method = f"on_collision_{phase}"
-            if hasattr(body, method):
-                getattr(body, method)(other)
+            fn = self._handlers(type(body))[phase]
+            if fn is not None:
+                fn(body, other)
 
     # ------------------------------------------------------------------
     # Raycasting
@@ -565,55 +1380,177 @@ class CollisionWorld(Node2D):
         Returns (hit: bool, hit_x: float, hit_y: float, collider)
         Finds the closest intersection with AABBs.
         mask is a set of layer strings to hit. If None, hits everything except triggers.
+
+        On the grid broadphase the cells are walked in ray order (DDA) and
+        the walk stops at the first cell that lies beyond the closest hit.
+        A ray starting inside a collider hits the edge where it leaves it.
         """
+        dx = x2 - x1
+        dy = y2 - y1
+        mask_bits = None if mask is None else LayerRegistry.bits(mask)
         closest_hit = None
-        closest_dist = float('inf')
-        hit_x = x2
-        hit_y = y2
+        closest_t = float('inf')
+
+        traverse_ray = getattr(self._grid, 'traverse_ray', None)
+        if traverse_ray is not None:
+            tested = set()
+            for t_leave, bucket in traverse_ray(x1, y1, x2, y2):
+                for col in bucket:
+                    if col in tested:
+                        continue
+                    tested.add(col)
+                    t = self._ray_hit_time(col, x1, y1, dx, dy, mask_bits)
+                    if t is not None and t < closest_t:
+                        closest_t = t
+                        closest_hit = col
+                if closest_t <= t_leave:
+                    break
+        else:
+            for col in self._ray_candidates(x1, y1, x2, y2):
+                t = self._ray_hit_time(col, x1, y1, dx, dy, mask_bits)
+                if t is not None and t < closest_t:
+                    closest_t = t
+                    closest_hit = col
 
-        # Build the ray AABB for spatial grid query
-        ray_l = min(x1, x2)
-        ray_t = min(y1, y2)
-        ray_r = max(x1, x2)
-        ray_b = max(y1, y2)
-        candidates = self._grid.query(ray_l, ray_t, ray_r, ray_b)
+        if closest_hit is None:
+            return (False, x2, y2, None)
+        return (True, x1 + closest_t * dx, y1 + closest_t * dy, closest_hit)
 
-        for col in candidates:
-            if mask is not None and col.layer not in mask:
-                continue
-            if col.is_trigger:
-                continue
+    def raycast_many(self, rays, mask=None):
+        """
+        Cast many rays at once.  *rays* is a sequence of (x1, y1, x2, y2);
+        returns a list of raycast() results in the same order.
 
-            rect = self._cached_rects.get(col)
-            if not rect:
-                continue
-                
-            l, t, r, b = rect
-            
-            # 4 edges of the AABB
-            edges = [
-                ((l, t), (r, t)), # top
-                ((r, t), (r, b)), # right
-                ((r, b), (l, b)), # bottom
-                ((l, b), (l, t))  # left
-            ]
-            
-            for (p3x, p3y), (p4x, p4y) in edges:
-                den = (x1 - x2) * (p3y - p4y) - (y1 - y2) * (p3x - p4x)
-                if den == 0: 
+        Candidates are gathered per ray from the broadphase, then the slab
+        tests for every (ray, candidate) pair run as one NumPy batch.
+        Without NumPy this is equivalent to calling raycast() per ray.
+        """
+        if np is None:
+            return [self.raycast(x1, y1, x2, y2, mask=mask) for x1, y1, x2, y2 in rays]
+
+        rays = [tuple(ray) for ray in rays]
+        results = [(False, x2, y2, None) for x1, y1, x2, y2 in rays]
+        mask_bits = None if mask is None else LayerRegistry.bits(mask)
+        rects = self._cached_rects
+
+        ray_ids = []
+        hit_cols = []
+        boxes = []
+        tile_hits = {}  # ray index -> (t, collider); tile grids are walked per ray
+        for i, (x1, y1, x2, y2) in enumerate(rays):
+            for col in self._ray_candidates(x1, y1, x2, y2):
+                if mask_bits is not None and not col.layer_bits & mask_bits:
                     continue
-                    
-                t_val = ((x1 - p3x) * (p3y - p4y) - (y1 - p3y) * (p3x - p4x)) / den
-                u_val = -((x1 - x2) * (y1 - p3y) - (y1 - y2) * (x1 - p3x)) / den
-                
-                if 0 <= t_val <= 1 and 0 <= u_val <= 1:
-                    hx = x1 + t_val * (x2 - x1)
-                    hy = y1 + t_val * (y2 - y1)
-                    dist = (hx - x1)**2 + (hy - y1)**2
-                    if dist < closest_dist:
-                        closest_dist = dist
-                        closest_hit = col
-                        hit_x = hx
-                        hit_y = hy
-                        
-        return (closest_hit is not None, hit_x, hit_y, closest_hit)
+                if col.is_trigger:
+                    continue
+                rect = rects.get(col)
+                if not rect:
+                    continue
+                if col.is_tile_grid:
+                    t = col.ray_hit_time(x1, y1, x2, y2)
+                    if t is not None and (i not in tile_hits or t < tile_hits[i][0]):
+                        tile_hits[i] = (t, col)
+                    continue
+                ray_ids.append(i)
+                hit_cols.append(col)
+                boxes.append(rect)
+        if not boxes:
+            return self._merge_tile_hits(rays, results, tile_hits)
+
+        ids = np.array(ray_ids, dtype=np.intp)
+        box = np.array(boxes, dtype=np.float64)
+        seg = np.array(rays, dtype=np.float64)[ids]
+        ox, oy = seg[:, 0], seg[:, 1]
+        dx, dy = seg[:, 2] - ox, seg[:, 3] - oy
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx1 = (box[:, 0] - ox) / dx
+            tx2 = (box[:, 2] - ox) / dx
+            ty1 = (box[:, 1] - oy) / dy
+            ty2 = (box[:, 3] - oy) / dy
+        # Rays parallel to an axis: inside the slab forever, or never
+        inside_x = (ox >= box[:, 0]) & (ox <= box[:, 2])
+        inside_y = (oy >= box[:, 1]) & (oy <= box[:, 3])
+        tx_lo = np.where(dx == 0, np.where(inside_x, -np.inf, np.inf), np.minimum(tx1, tx2))
+        tx_hi = np.where(dx == 0, np.inf, np.maximum(tx1, tx2))
+        ty_lo = np.where(dy == 0, np.where(inside_y, -np.inf, np.inf), np.minimum(ty1, ty2))
+        ty_hi = np.where(dy == 0, np.inf, np.maximum(ty1, ty2))
+
+        enter = np.maximum(tx_lo, ty_lo)
+        leave = np.minimum(tx_hi, ty_hi)
+        t = np.where(enter >= 0.0, enter, leave)
+        ok = (enter <= leave) & (t >= 0.0) & (t <= 1.0)
+
+        hit_idx = np.nonzero(ok)[0]
+        if hit_idx.size == 0:
+            return self._merge_tile_hits(rays, results, tile_hits)
+        # Closest hit per ray: sort by (ray, t) and take each ray's first row
+        hit_idx = hit_idx[np.lexsort((t[hit_idx], ids[hit_idx]))]
+        _, first = np.unique(ids[hit_idx], return_index=True)
+        for k in hit_idx[first].tolist():
+            i = ray_ids[k]
+            x1, y1, x2, y2 = rays[i]
+            tk = float(t[k])
+            results[i] = (True, x1 + tk * (x2 - x1), y1 + tk * (y2 - y1), hit_cols[k])
+        return self._merge_tile_hits(rays, results, tile_hits)
+
+    @staticmethod
+    def _merge_tile_hits(rays, results, tile_hits):
+        """Replace a ray's result with its tile-grid hit where that is closer."""
+        for i, (t, col) in tile_hits.items():
+            x1, y1, x2, y2 = rays[i]
+            hx = x1 + t * (x2 - x1)
+            hy = y1 + t * (y2 - y1)
+            hit = results[i]
+            if not hit[0] or (hx - x1) ** 2 + (hy - y1) ** 2 < (hit[1] - x1) ** 2 + (hit[2] - y1) ** 2:
+                results[i] = (True, hx, hy, col)
+        return results
+
+    def _ray_candidates(self, x1, y1, x2, y2):
+        """Colliders the broadphase reports near the segment (unordered)."""
+        query_ray = getattr(self._grid, 'query_ray', None)
+        if query_ray is not None:
+            return query_ray(x1, y1, x2, y2)
+        return self._grid.query(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def _ray_hit_time(self, col, x1, y1, dx, dy, mask_bits):
+        """Slab test: segment parameter (0..1) of the first edge crossing of *col*, or None."""
+        if mask_bits is not None and not col.layer_bits & mask_bits:
+            return None
+        if col.is_trigger:
+            return None
+        rect = self._cached_rects.get(col)
+        if not rect:
+            return None
+        if col.is_tile_grid:
+            return col.ray_hit_time(x1, y1, x1 + dx, y1 + dy)
+        l, t, r, b = rect
+
+        enter = float('-inf')
+        leave = float('inf')
+        if dx == 0:
+            if x1 < l or x1 > r:
+                return None
+        else:
+            t1 = (l - x1) / dx
+            t2 = (r - x1) / dx
+            enter, leave = (t1, t2) if t1 < t2 else (t2, t1)
+        if dy == 0:
+            if y1 < t or y1 > b:
+                return None
+        else:
+            t1 = (t - y1) / dy
+            t2 = (b - y1) / dy
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > enter:
+                enter = t1
+            if t2 < leave:
+                leave = t2
+
+        if enter > leave:
+            return None
+        hit = enter if enter >= 0.0 else leave
+        if 0.0 <= hit <= 1.0:
+            return hit
+        return None
@@ -0,0 +1,160 @@
+"""
+Collision layers — compile layer names and mask sets into integer bitmasks.
+
+Game code keeps using strings (``col.layer = "wall"``,
+``col.mask = {"player"}``, ``col.mask.add("enemy")``).  Every change is
+mirrored into ``col.layer_bits`` / ``col.mask_bits`` so that collision
+filtering is a single AND instead of a set lookup, and so vectorized
+broadphase code can filter whole arrays at once.
+"""
+
+MAX_LAYERS = 64  # bits must fit the uint64 arrays used by ColliderStore
+
+
+class LayerRegistry:
+    """Global name -> bit table.  Bits are assigned on first use."""
+
+    _bits = {}
+
+    @classmethod
+    def bit(cls, name):
+        """Return the single-bit mask for layer *name*, allocating it if needed."""
+        bit = cls._bits.get(name)
+        if bit is None:
+            if len(cls._bits) >= MAX_LAYERS:
+                raise ValueError(f"Too many collision layers (max {MAX_LAYERS}); cannot add {name!r}")
+            bit = 1 << len(cls._bits)
+            cls._bits[name] = bit
+        return bit
+
+    @classmethod
+    def bits(cls, names):
+        """OR together the bits of every layer in *names*."""
+        result = 0
+        for name in names:
+            result |= cls.bit(name)
+        return result
+
+    @classmethod
+    def names(cls):
+        """Registered layer names, in bit order."""
+        return list(cls._bits)
+
+
+class LayerMask(set):
+    """
+    A set of layer names that keeps its owner's ``mask_bits`` current
+    when mutated in place.
+    """
+
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner, names=()):
+        super().__init__(names)
+        self._owner = owner
+
+    def _sync(self):
+        self._owner._set_mask_bits(LayerRegistry.bits(self))
+
+    def add(self, name):
+        super().add(name)
+        self._sync()
+
+    def discard(self, name):
+        super().discard(name)
+        self._sync()
+
+    def remove(self, name):
+        super().remove(name)
+        self._sync()
+
+    def pop(self):
+        name = super().pop()
+        self._sync()
+        return name
+
+    def clear(self):
+        super().clear()
+        self._sync()
+
+    def update(self, *others):
+        super().update(*others)
+        self._sync()
+
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self._sync()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self._sync()
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(other)
+        self._sync()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+    def __reduce__(self):
+        return (set, (list(self),))
+
+
+class CollisionLayerMixin:
+    """
+    String ``layer`` / ``mask`` properties backed by ``layer_bits`` /
+    ``mask_bits``, and the ``is_trigger`` flag.  A change to any of them
+    bumps ``_filter_version`` so that CollisionWorld re-syncs the
+    collider (and its ColliderStore row) and re-tests its pairs, even
+    if it did not move.
+    """
+
+    layer_bits = 0
+    mask_bits = 0
+    _filter_version = 0
+    _is_trigger = False
+
+    @property
+    def layer(self):
+        return self._layer
+
+    @layer.setter
+    def layer(self, name):
+        self._layer = name
+        self.layer_bits = LayerRegistry.bit(name)
+        self._filter_version += 1
+
+    @property
+    def is_trigger(self):
+        return self._is_trigger
+
+    @is_trigger.setter
+    def is_trigger(self, value):
+        self._is_trigger = value
+        self._filter_version += 1
+
+    @property
+    def mask(self):
+        return self._mask
+
+    @mask.setter
+    def mask(self, names):
+        self._mask = LayerMask(self, names if names is not None else ())
+        self._set_mask_bits(LayerRegistry.bits(self._mask))
+
+    def _set_mask_bits(self, bits):
+        self.mask_bits = bits
+        self._filter_version += 1
@@ -1,13 +1,17 @@
+import math
 import pygame
 from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.collision.layers import CollisionLayerMixin
 from typing import List, Tuple
 
-class PolygonCollider2D(Node2D):
+class PolygonCollider2D(CollisionLayerMixin, Node2D):
     """
     A convex polygon collider defined by a list of local vertices.
     Used for SAT (Separating Axis Theorem) collisions.
     Vertices must be ordered (clockwise or counter-clockwise) and form a convex shape.
     """
+    is_tile_grid = False
+    _shape_version = 0  # bumped when local_points is replaced
 
     def __init__(self, name: str, x: float, y: float, points: List[Tuple[float, float]], is_static=False, is_trigger=False, visible=False):
         super().__init__(name, x, y)
@@ -21,49 +25,111 @@ class PolygonCollider2D(Node2D):
         self.visible = visible
         self.layer = "default"
         self.mask = set()
-        
+
+    @property
+    def local_points(self) -> List[Tuple[float, float]]:
+        return self._local_points
+
+    @local_points.setter
+    def local_points(self, points: List[Tuple[float, float]]):
+        self._local_points = points
+
         # Calculate bounding box width/height conceptually
         min_x = min(p[0] for p in points)
         max_x = max(p[0] for p in points)
         min_y = min(p[1] for p in points)
         max_y = max(p[1] for p in points)
-        
+
         # Abstract bounds mapping
         self.width = max_x - min_x
         self.height = max_y - min_y
 
-    def get_global_points(self) -> List[Tuple[float, float]]:
-        """Returns the polygon vertices transformed into global space (factoring rotation/scale)."""
+        self._local_axes = self._compute_local_axes(points)
+        self._world_version = None  # forces a world-space rebuild
+        self._shape_version += 1
+
+    @staticmethod
+    def _compute_local_axes(points) -> List[Tuple[float, float]]:
+        """
+        Unit edge normals in local space.  Opposite parallel edges give
+        the same SAT axis, so only one of each +/- pair is kept.
+        """
+        axes = []
+        n = len(points)
+        for i in range(n):
+            x1, y1 = points[i]
+            x2, y2 = points[(i + 1) % n]
+            ax, ay = -(y2 - y1), x2 - x1
+            length = math.hypot(ax, ay)
+            if length == 0:
+                continue
+            ax, ay = ax / length, ay / length
+            if any(abs(ax * bx + ay * by) > 1.0 - 1e-9 for bx, by in axes):
+                continue
+            axes.append((ax, ay))
+        return axes
+
+    def _refresh_world_cache(self):
+        """
+        Rebuild world-space vertices, AABB and SAT axes if the transform
+        changed.  Node2D bumps _transform_version whenever the node (or an
+        ancestor) is marked dirty, so static polygons are transformed once.
+        """
         gx, gy = self.get_global_position()
-        
-        import math
+        if self._world_version == self._transform_version:
+            return
+
         cos_a = math.cos(self.rotation)
         sin_a = math.sin(self.rotation)
-        
+        sx = self.scale_x
+        sy = self.scale_y
+
         global_pts = []
-        for (px, py) in self.local_points:
+        for (px, py) in self._local_points:
             # Scale
-            sx = px * self.scale_x
-            sy = py * self.scale_y
-            # Rotate
-            rx = sx * cos_a - sy * sin_a
-            ry = sx * sin_a + sy * cos_a
-            # Translate
-            global_pts.append((gx + rx, gy + ry))
-            
-        return global_pts
+            lx = px * sx
+            ly = py * sy
+            # Rotate, then translate
+            global_pts.append((gx + lx * cos_a - ly * sin_a, gy + lx * sin_a + ly * cos_a))
+
+        # Normals transform by the inverse scale, then the rotation
+        axes = []
+        for (nx, ny) in self._local_axes:
+            if sx != sy:
+                nx, ny = nx * sy, ny * sx
+                length = math.hypot(nx, ny)
+                if length == 0:
+                    continue
+                nx, ny = nx / length, ny / length
+            axes.append((nx * cos_a - ny * sin_a, nx * sin_a + ny * cos_a))
+
+        xs = [p[0] for p in global_pts]
+        ys = [p[1] for p in global_pts]
+        self._world_points = global_pts
+        self._world_axes = axes
+        self._world_rect = (min(xs), min(ys), max(xs), max(ys))
+        self._world_version = self._transform_version
+
+    def get_global_points(self) -> List[Tuple[float, float]]:
+        """
+        Returns the polygon vertices transformed into global space (factoring rotation/scale).
+        The list is cached until the transform changes; treat it as read-only.
+        """
+        self._refresh_world_cache()
+        return self._world_points
+
+    def get_global_axes(self) -> List[Tuple[float, float]]:
+        """Unit SAT axes (edge normals) in global space, cached like get_global_points()."""
+        self._refresh_world_cache()
+        return self._world_axes
 
     def get_rect(self) -> Tuple[float, float, float, float]:
         """
         Return the world-space bounding box (AABB) for broadphase grid queries.
         (left, top, right, bottom)
         """
-        pts = self.get_global_points()
-        min_x = min(p[0] for p in pts)
-        max_x = max(p[0] for p in pts)
-        min_y = min(p[1] for p in pts)
-        max_y = max(p[1] for p in pts)
-        return (min_x, min_y, max_x, max_y)
+        self._refresh_world_cache()
+        return self._world_rect
 
     def render(self, surface) -> None:
         """Debug draw the polygon."""
@@ -1,9 +1,15 @@
 """
 UniformGrid — spatial partitioning for O(n·k) broad-phase collision.
 
-Each frame the grid is cleared and all colliders are re-inserted.
+The grid can either be cleared and refilled every frame, or kept
+persistent: each collider remembers the cell range it occupies so
+update() only touches buckets when that range actually changes.
 Queries return only colliders whose cells overlap the query AABB,
 dramatically reducing pair-checks compared to the previous O(n²) approach.
+
+SweepAndPrune and DynamicAABBTree offer the same interface without a
+cell size, for worlds where a single cell size fits badly (long merged
+colliders, dense swarms, or a mix of 2000px ground and 4px bullets).
 """
 
 
@@ -14,7 +20,9 @@ class UniformGrid:
     Usage:
         grid = UniformGrid(cell_size=128)
         grid.insert(collider, left, top, right, bottom)
+        grid.update(collider, left, top, right, bottom)   # after a move
         candidates = grid.query(test_l, test_t, test_r, test_b)
+        grid.remove(collider)
         grid.clear()
 
     Cell coordinates are computed as ``int(coord // cell_size)`` so
@@ -24,25 +32,74 @@ class UniformGrid:
     def __init__(self, cell_size=128):
         self.cell_size = cell_size
         self._cells = {}  # (cx, cy) -> set of colliders
+        self._ranges = {}  # collider -> (min_cx, min_cy, max_cx, max_cy)
 
-    # ---------------------------------------------------------------- insert
-    def insert(self, collider, left, top, right, bottom):
-        """Insert *collider* into every cell its AABB overlaps."""
+    def _cell_range(self, left, top, right, bottom):
         cs = self.cell_size
-        min_cx = int(left // cs) if left >= 0 else int(left // cs)
-        max_cx = int(right // cs) if right >= 0 else int(right // cs)
-        min_cy = int(top // cs) if top >= 0 else int(top // cs)
-        max_cy = int(bottom // cs) if bottom >= 0 else int(bottom // cs)
+        return (int(left // cs), int(top // cs), int(right // cs), int(bottom // cs))
 
+    def _add_to_cells(self, collider, cell_range):
+        min_cx, min_cy, max_cx, max_cy = cell_range
+        cells = self._cells
         for cx in range(min_cx, max_cx + 1):
             for cy in range(min_cy, max_cy + 1):
                 key = (cx, cy)
-                bucket = self._cells.get(key)
+                bucket = cells.get(key)
                 if bucket is None:
                     bucket = set()
-                    self._cells[key] = bucket
+                    cells[key] = bucket
                 bucket.add(collider)
 
+    def _remove_from_cells(self, collider, cell_range):
+        min_cx, min_cy, max_cx, max_cy = cell_range
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                key = (cx, cy)
+                bucket = cells.get(key)
+                if bucket is None:
+                    continue
+                bucket.discard(collider)
+                if not bucket:
+                    del cells[key]
+
+    # ---------------------------------------------------------------- insert
+    def insert(self, collider, left, top, right, bottom):
+        """Insert *collider* into every cell its AABB overlaps."""
+        cell_range = self._cell_range(left, top, right, bottom)
+        old_range = self._ranges.get(collider)
+        if old_range is not None:
+            self._remove_from_cells(collider, old_range)
+        self._ranges[collider] = cell_range
+        self._add_to_cells(collider, cell_range)
+
+    # ---------------------------------------------------------------- update
+    def update(self, collider, left, top, right, bottom):
+        """
+        Move *collider* to a new AABB, re-bucketing only if the set of
+        covered cells changed.  Inserts the collider if it is unknown.
+        Returns True if any bucket was touched.
+        """
+        cell_range = self._cell_range(left, top, right, bottom)
+        old_range = self._ranges.get(collider)
+        if old_range == cell_range:
+            return False
+        if old_range is not None:
+            self._remove_from_cells(collider, old_range)
+        self._ranges[collider] = cell_range
+        self._add_to_cells(collider, cell_range)
+        return True
+
+    # ---------------------------------------------------------------- remove
+    def remove(self, collider):
+        """Remove *collider* from the grid (no-op if it is not present)."""
+        old_range = self._ranges.pop(collider, None)
+        if old_range is not None:
+            self._remove_from_cells(collider, old_range)
+
+    def __contains__(self, collider):
+        return collider in self._ranges
+
     # ----------------------------------------------------------------- query
     def query(self, left, top, right, bottom, exclude=None):
         """
@@ -66,16 +123,702 @@ class UniformGrid:
             result.discard(exclude)
         return result
 
+    # ------------------------------------------------------------------- ray
+    def traverse_ray(self, x1, y1, x2, y2):
+        """
+        Walk the cells crossed by the segment in ray order (Amanatides-Woo
+        DDA), yielding ``(t_leave, bucket)`` for every non-empty cell.
+        ``t_leave`` is the segment parameter (0..1) at which the ray exits
+        that cell, so callers can stop once a hit is closer than that.
+        """
+        cs = self.cell_size
+        cells = self._cells
+        dx = x2 - x1
+        dy = y2 - y1
+        cx = int(x1 // cs)
+        cy = int(y1 // cs)
+        steps = abs(int(x2 // cs) - cx) + abs(int(y2 // cs) - cy)
+
+        inf = float('inf')
+        if dx > 0:
+            step_x, t_max_x, t_delta_x = 1, ((cx + 1) * cs - x1) / dx, cs / dx
+        elif dx < 0:
+            step_x, t_max_x, t_delta_x = -1, (cx * cs - x1) / dx, -cs / dx
+        else:
+            step_x, t_max_x, t_delta_x = 0, inf, inf
+        if dy > 0:
+            step_y, t_max_y, t_delta_y = 1, ((cy + 1) * cs - y1) / dy, cs / dy
+        elif dy < 0:
+            step_y, t_max_y, t_delta_y = -1, (cy * cs - y1) / dy, -cs / dy
+        else:
+            step_y, t_max_y, t_delta_y = 0, inf, inf
+
+        for _ in range(steps + 1):
+            bucket = cells.get((cx, cy))
+            if bucket:
+                t_leave = t_max_x if t_max_x < t_max_y else t_max_y
+                yield (t_leave if t_leave < 1.0 else 1.0), bucket
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+
+    def query_ray(self, x1, y1, x2, y2):
+        """Return the set of colliders in the cells the segment crosses."""
+        result = set()
+        for _, bucket in self.traverse_ray(x1, y1, x2, y2):
+            result.update(bucket)
+        return result
+
+    # ----------------------------------------------------------------- rings
+    def traverse_rings(self, x, y):
+        """
+        Walk square rings of cells outward from the cell containing (x, y),
+        yielding ``(reach, buckets)`` per ring.  ``buckets`` lists the
+        non-empty cells of that ring; ``reach`` is a lower bound on the
+        distance from (x, y) to anything in a ring not yet yielded, so
+        callers can stop once their answer is closer than that.
+
+        Once a ring would hold more cells than remain occupied, the rest
+        of the grid is yielded in one step (``reach`` = inf).
+        """
+        cs = self.cell_size
+        cells = self._cells
+        cx = int(x // cs)
+        cy = int(y // cs)
+        # Distance from the point to the nearest edge of its own cell
+        fx = x - cx * cs
+        fy = y - cy * cs
+        edge = min(fx, cs - fx, fy, cs - fy)
+
+        remaining = len(cells)
+        n = 0
+        while remaining:
+            if 8 * n > remaining:
+                yield float('inf'), [bucket for (kx, ky), bucket in cells.items()
+                                     if max(abs(kx - cx), abs(ky - cy)) >= n]
+                return
+            if n == 0:
+                keys = [(cx, cy)]
+            else:
+                keys = [(cx + i, cy - n) for i in range(-n, n + 1)]
+                keys += [(cx + i, cy + n) for i in range(-n, n + 1)]
+                keys += [(cx - n, cy + j) for j in range(-n + 1, n)]
+                keys += [(cx + n, cy + j) for j in range(-n + 1, n)]
+            buckets = []
+            for key in keys:
+                bucket = cells.get(key)
+                if bucket:
+                    buckets.append(bucket)
+            remaining -= len(buckets)
+            yield n * cs + edge, buckets
+            n += 1
+
     # ----------------------------------------------------------------- clear
     def clear(self):
         """Remove all entries (call once per frame before re-inserting)."""
         self._cells.clear()
+        self._ranges.clear()
 
     # ----------------------------------------------------------------- stats
     def stats(self):
-        total_entries = sum(len(b) for b in self._cells.values())
+        sizes = [len(b) for b in self._cells.values()]
         return {
             'cell_count': len(self._cells),
-            'total_entries': total_entries,
+            'total_entries': sum(sizes),
+            'max_bucket': max(sizes, default=0),
+            'object_count': len(self._ranges),
             'cell_size': self.cell_size,
         }
+
+
+class SweepAndPrune:
+    """
+    Sort-and-sweep broad-phase along the X axis.
+
+    Entries are kept sorted by their left edge.  When a collider moves,
+    its entry is shifted left/right by neighbour swaps (an incremental
+    insertion sort), so frame-to-frame coherence keeps updates close to
+    O(1).  Unlike UniformGrid there is no cell size to tune: long thin
+    colliders occupy one entry, and dense clusters of tiny colliders do
+    not pile into a single bucket.
+
+    Same interface as UniformGrid (insert / update / remove / query /
+    clear / stats), plus candidate_pairs() for a single sweep over all
+    overlapping pairs.
+    """
+
+    def __init__(self):
+        self._entries = []   # [left, top, right, bottom, collider] sorted by left
+        self._records = {}   # collider -> entry
+        self._index = {}     # collider -> position in _entries (lazily rebuilt)
+        self._index_valid = True
+        self._widths = {}    # entry width -> number of live entries that wide
+        self._max_width = 0.0
+        self._dead = 0       # removed entries awaiting compaction
+        self.swaps = 0       # neighbour swaps performed by update()
+
+    # ------------------------------------------------------------- internals
+    def _bisect_left(self, x):
+        """First entry position whose left edge is >= x."""
+        entries = self._entries
+        lo, hi = 0, len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entries[mid][0] < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _bisect_right(self, x):
+        """First entry position whose left edge is > x."""
+        entries = self._entries
+        lo, hi = 0, len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entries[mid][0] <= x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _add_width(self, width):
+        widths = self._widths
+        widths[width] = widths.get(width, 0) + 1
+        if width > self._max_width:
+            self._max_width = width
+
+    def _drop_width(self, width):
+        """Forget one entry of *width*; re-derive the query reach if it was the widest."""
+        widths = self._widths
+        count = widths[width] - 1
+        if count:
+            widths[width] = count
+            return
+        del widths[width]
+        if width == self._max_width:
+            self._max_width = max(widths, default=0.0)
+
+    def _rebuild_index(self):
+        self._index = {e[4]: i for i, e in enumerate(self._entries) if e[4] is not None}
+        self._index_valid = True
+
+    def _compact(self):
+        self._entries = [e for e in self._entries if e[4] is not None]
+        self._dead = 0
+        self._rebuild_index()
+
+    # ---------------------------------------------------------------- insert
+    def insert(self, collider, left, top, right, bottom):
+        """Insert *collider* (or move it, if already present)."""
+        if collider in self._records:
+            self.update(collider, left, top, right, bottom)
+            return
+        entry = [left, top, right, bottom, collider]
+        self._entries.insert(self._bisect_right(left), entry)
+        self._records[collider] = entry
+        self._index_valid = False
+        self._add_width(right - left)
+
+    # ---------------------------------------------------------------- update
+    def update(self, collider, left, top, right, bottom):
+        """
+        Move *collider* to a new AABB and restore sort order by swapping
+        it past its neighbours.  Returns True (the entry always changes).
+        """
+        entry = self._records.get(collider)
+        if entry is None:
+            self.insert(collider, left, top, right, bottom)
+            return True
+        old_width = entry[2] - entry[0]
+        entry[0], entry[1], entry[2], entry[3] = left, top, right, bottom
+        width = right - left
+        if width != old_width:
+            self._add_width(width)
+            self._drop_width(old_width)
+
+        if not self._index_valid:
+            self._rebuild_index()
+        entries = self._entries
+        index = self._index
+        i = index[collider]
+        swaps = 0
+        while i > 0 and entries[i - 1][0] > left:
+            prev = entries[i - 1]
+            entries[i] = prev
+            if prev[4] is not None:
+                index[prev[4]] = i
+            i -= 1
+            swaps += 1
+        last = len(entries) - 1
+        while i < last and entries[i + 1][0] < left:
+            nxt = entries[i + 1]
+            entries[i] = nxt
+            if nxt[4] is not None:
+                index[nxt[4]] = i
+            i += 1
+            swaps += 1
+        entries[i] = entry
+        index[collider] = i
+        self.swaps += swaps
+        return True
+
+    # ---------------------------------------------------------------- remove
+    def remove(self, collider):
+        """Remove *collider* (no-op if it is not present)."""
+        entry = self._records.pop(collider, None)
+        if entry is None:
+            return
+        self._drop_width(entry[2] - entry[0])
+        entry[4] = None
+        self._index.pop(collider, None)
+        self._dead += 1
+        if self._dead * 2 > len(self._entries):
+            self._compact()
+
+    def __contains__(self, collider):
+        return collider in self._records
+
+    # ----------------------------------------------------------------- query
+    def query(self, left, top, right, bottom, exclude=None):
+        """Return the set of colliders whose AABB touches the given AABB."""
+        entries = self._entries
+        lo = self._bisect_left(left - self._max_width)
+        hi = self._bisect_right(right)
+        result = set()
+        for i in range(lo, hi):
+            e = entries[i]
+            col = e[4]
+            if col is None or e[2] < left or e[1] > bottom or e[3] < top:
+                continue
+            result.add(col)
+        if exclude is not None:
+            result.discard(exclude)
+        return result
+
+    def candidate_pairs(self, eps=0.0, only=None):
+        """
+        Yield every (a, b) pair whose AABBs, grown by *eps*, overlap.
+        With *only* (a set of colliders), just the pairs with a side in
+        it, found by querying around those instead of a full sweep.
+        """
+        if only is not None:
+            records = self._records
+            done = set()
+            for a in only:
+                ea = records.get(a)
+                if ea is None:
+                    continue
+                done.add(a)
+                la, ta, ra, ba = ea[0], ea[1], ea[2], ea[3]
+                for b in self.query(la - eps, ta - eps, ra + eps, ba + eps, exclude=a):
+                    if b in done:
+                        continue
+                    eb = records[b]
+                    if la < eb[2] + eps and ra > eb[0] - eps and ta < eb[3] + eps and ba > eb[1] - eps:
+                        yield a, b
+            return
+        entries = self._entries
+        n = len(entries)
+        for i in range(n):
+            ea = entries[i]
+            a = ea[4]
+            if a is None:
+                continue
+            reach = ea[2] + eps
+            top = ea[1] - eps
+            bottom = ea[3] + eps
+            for j in range(i + 1, n):
+                eb = entries[j]
+                if eb[0] >= reach:
+                    break
+                b = eb[4]
+                if b is None or eb[1] >= bottom or eb[3] <= top:
+                    continue
+                yield a, b
+
+    # ----------------------------------------------------------------- clear
+    def clear(self):
+        self._entries = []
+        self._records = {}
+        self._index = {}
+        self._index_valid = True
+        self._widths = {}
+        self._max_width = 0.0
+        self._dead = 0
+
+    # ----------------------------------------------------------------- stats
+    def stats(self):
+        return {
+            'object_count': len(self._records),
+            'dead_entries': self._dead,
+            'max_width': self._max_width,
+            'swaps': self.swaps,
+        }
+
+
+class _TreeNode:
+    __slots__ = ('left', 'top', 'right', 'bottom', 'parent', 'child1', 'child2', 'height', 'obj')
+
+    def __init__(self):
+        self.left = self.top = self.right = self.bottom = 0.0
+        self.parent = None
+        self.child1 = None
+        self.child2 = None
+        self.height = 0
+        self.obj = None
+
+    @property
+    def is_leaf(self):
+        return self.child1 is None
+
+    def set_union(self, a, b):
+        self.left = a.left if a.left < b.left else b.left
+        self.top = a.top if a.top < b.top else b.top
+        self.right = a.right if a.right > b.right else b.right
+        self.bottom = a.bottom if a.bottom > b.bottom else b.bottom
+
+
+def _perimeter(l, t, r, b):
+    return 2.0 * ((r - l) + (b - t))
+
+
+class DynamicAABBTree:
+    """
+    Dynamic bounding-volume hierarchy over fattened AABBs.
+
+    Each leaf stores the collider's AABB grown by *margin* on every side.
+    update() is a no-op while the tight AABB stays inside that fat box,
+    so slowly moving colliders are almost never reinserted.  Insertion
+    picks the sibling by a surface-area (perimeter) heuristic and the
+    tree is kept height-balanced with AVL-style rotations, giving
+    O(log n) queries and ray traversal without any cell size to tune.
+
+    Same interface as UniformGrid (insert / update / remove / query /
+    clear / stats), plus query_ray() and candidate_pairs().
+    """
+
+    def __init__(self, margin=8.0):
+        self.margin = margin
+        self._root = None
+        self._leaves = {}   # collider -> leaf node
+        self._tight = {}    # collider -> (l, t, r, b) as last reported
+        self.reinserts = 0  # updates that left their fat box
+
+    # ------------------------------------------------------------ insertion
+    def _insert_leaf(self, leaf):
+        if self._root is None:
+            self._root = leaf
+            leaf.parent = None
+            return
+
+        # Find the best sibling (perimeter cost heuristic)
+        l, t, r, b = leaf.left, leaf.top, leaf.right, leaf.bottom
+        node = self._root
+        while not node.is_leaf:
+            area = _perimeter(node.left, node.top, node.right, node.bottom)
+            combined = _perimeter(min(l, node.left), min(t, node.top),
+                                  max(r, node.right), max(b, node.bottom))
+            cost = 2.0 * combined
+            inheritance = 2.0 * (combined - area)
+
+            costs = []
+            for child in (node.child1, node.child2):
+                c = _perimeter(min(l, child.left), min(t, child.top),
+                               max(r, child.right), max(b, child.bottom))
+                if not child.is_leaf:
+                    c -= _perimeter(child.left, child.top, child.right, child.bottom)
+                costs.append(c + inheritance)
+
+            if cost < costs[0] and cost < costs[1]:
+                break
+            node = node.child1 if costs[0] < costs[1] else node.child2
+
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = _TreeNode()
+        new_parent.parent = old_parent
+        new_parent.set_union(leaf, sibling)
+        new_parent.height = sibling.height + 1
+        new_parent.child1 = sibling
+        new_parent.child2 = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+        if old_parent is None:
+            self._root = new_parent
+        elif old_parent.child1 is sibling:
+            old_parent.child1 = new_parent
+        else:
+            old_parent.child2 = new_parent
+
+        self._refit_from(leaf.parent)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self._root:
+            self._root = None
+            return
+        parent = leaf.parent
+        grand = parent.parent
+        sibling = parent.child2 if parent.child1 is leaf else parent.child1
+        if grand is None:
+            self._root = sibling
+            sibling.parent = None
+        else:
+            if grand.child1 is parent:
+                grand.child1 = sibling
+            else:
+                grand.child2 = sibling
+            sibling.parent = grand
+            self._refit_from(grand)
+        leaf.parent = None
+
+    def _refit_from(self, node):
+        """Walk up from *node*, rebalancing and refitting boxes and heights."""
+        while node is not None:
+            node = self._balance(node)
+            c1, c2 = node.child1, node.child2
+            node.height = 1 + (c1.height if c1.height > c2.height else c2.height)
+            node.set_union(c1, c2)
+            node = node.parent
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self._root = new
+        elif parent.child1 is old:
+            parent.child1 = new
+        else:
+            parent.child2 = new
+
+    def _balance(self, a):
+        """Rotate *a* if its children's heights differ by more than one; return the subtree root."""
+        if a.is_leaf or a.height < 2:
+            return a
+        b, c = a.child1, a.child2
+        balance = c.height - b.height
+
+        if balance > 1:
+            # Rotate C up
+            f, g = c.child1, c.child2
+            c.child1 = a
+            c.parent = a.parent
+            a.parent = c
+            self._replace_child(c.parent, a, c)
+            if f.height > g.height:
+                c.child2 = f
+                a.child2 = g
+                g.parent = a
+                a.set_union(b, g)
+                c.set_union(a, f)
+                a.height = 1 + max(b.height, g.height)
+                c.height = 1 + max(a.height, f.height)
+            else:
+                c.child2 = g
+                a.child2 = f
+                f.parent = a
+                a.set_union(b, f)
+                c.set_union(a, g)
+                a.height = 1 + max(b.height, f.height)
+                c.height = 1 + max(a.height, g.height)
+            return c
+
+        if balance < -1:
+            # Rotate B up
+            d, e = b.child1, b.child2
+            b.child1 = a
+            b.parent = a.parent
+            a.parent = b
+            self._replace_child(b.parent, a, b)
+            if d.height > e.height:
+                b.child2 = d
+                a.child1 = e
+                e.parent = a
+                a.set_union(c, e)
+                b.set_union(a, d)
+                a.height = 1 + max(c.height, e.height)
+                b.height = 1 + max(a.height, d.height)
+            else:
+                b.child2 = e
+                a.child1 = d
+                d.parent = a
+                a.set_union(c, d)
+                b.set_union(a, e)
+                a.height = 1 + max(c.height, d.height)
+                b.height = 1 + max(a.height, e.height)
+            return b
+
+        return a
+
+    def _fatten(self, leaf, left, top, right, bottom):
+        m = self.margin
+        leaf.left, leaf.top = left - m, top - m
+        leaf.right, leaf.bottom = right + m, bottom + m
+
+    # ------------------------------------------------------------ public API
+    def insert(self, collider, left, top, right, bottom):
+        """Insert *collider* (or move it, if already present)."""
+        if collider in self._leaves:
+            self.update(collider, left, top, right, bottom)
+            return
+        leaf = _TreeNode()
+        leaf.obj = collider
+        self._fatten(leaf, left, top, right, bottom)
+        self._leaves[collider] = leaf
+        self._tight[collider] = (left, top, right, bottom)
+        self._insert_leaf(leaf)
+
+    def update(self, collider, left, top, right, bottom):
+        """
+        Record *collider*'s new AABB.  The leaf is only reinserted when the
+        AABB leaves its fat box; returns True in that case.
+        """
+        leaf = self._leaves.get(collider)
+        if leaf is None:
+            self.insert(collider, left, top, right, bottom)
+            return True
+        self._tight[collider] = (left, top, right, bottom)
+        if (left >= leaf.left and top >= leaf.top and
+                right <= leaf.right and bottom <= leaf.bottom):
+            return False
+        self._remove_leaf(leaf)
+        self._fatten(leaf, left, top, right, bottom)
+        self._insert_leaf(leaf)
+        self.reinserts += 1
+        return True
+
+    def remove(self, collider):
+        """Remove *collider* (no-op if it is not present)."""
+        leaf = self._leaves.pop(collider, None)
+        if leaf is None:
+            return
+        del self._tight[collider]
+        self._remove_leaf(leaf)
+
+    def __contains__(self, collider):
+        return collider in self._leaves
+
+    def query(self, left, top, right, bottom, exclude=None):
+        """Return the set of colliders whose fat box overlaps the given AABB."""
+        result = set()
+        if self._root is None:
+            return result
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if (node.right < left or node.left > right or
+                    node.bottom < top or node.top > bottom):
+                continue
+            if node.child1 is None:
+                result.add(node.obj)
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+        if exclude is not None:
+            result.discard(exclude)
+        return result
+
+    def query_ray(self, x1, y1, x2, y2):
+        """Return the set of colliders whose fat box the segment crosses."""
+        result = set()
+        if self._root is None:
+            return result
+        dx = x2 - x1
+        dy = y2 - y1
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not _segment_hits_box(x1, y1, dx, dy, node.left, node.top, node.right, node.bottom):
+                continue
+            if node.child1 is None:
+                result.add(node.obj)
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+        return result
+
+    def candidate_pairs(self, eps=0.0, only=None):
+        """
+        Yield every (a, b) pair whose tight AABBs, grown by *eps*, overlap.
+        With *only* (a set of colliders), just the pairs with a side in it.
+        """
+        tight = self._tight
+        if only is None:
+            boxes = tight.items()
+        else:
+            boxes = [(a, tight[a]) for a in only if a in tight]
+        seen = set()
+        for a, (la, ta, ra, ba) in boxes:
+            seen.add(a)
+            for b in self.query(la - eps, ta - eps, ra + eps, ba + eps):
+                if b in seen:
+                    continue
+                lb, tb, rb, bb = tight[b]
+                if la < rb + eps and ra > lb - eps and ta < bb + eps and ba > tb - eps:
+                    yield a, b
+
+    def clear(self):
+        self._root = None
+        self._leaves = {}
+        self._tight = {}
+
+    def stats(self):
+        """Tree size, height and worst child-height imbalance."""
+        node_count = 0
+        max_balance = 0
+        if self._root is not None:
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                node_count += 1
+                if node.child1 is not None:
+                    diff = abs(node.child1.height - node.child2.height)
+                    if diff > max_balance:
+                        max_balance = diff
+                    stack.append(node.child1)
+                    stack.append(node.child2)
+        return {
+            'object_count': len(self._leaves),
+            'node_count': node_count,
+            'height': self._root.height if self._root is not None else 0,
+            'max_balance': max_balance,
+            'reinserts': self.reinserts,
+            'margin': self.margin,
+        }
+
+
+def _segment_hits_box(x1, y1, dx, dy, left, top, right, bottom):
+    """Slab test: does the segment (x1, y1) + t*(dx, dy), t in [0, 1], touch the box?"""
+    t_min, t_max = 0.0, 1.0
+    if dx == 0.0:
+        if x1 < left or x1 > right:
+            return False
+    else:
+        inv = 1.0 / dx
+        t1 = (left - x1) * inv
+        t2 = (right - x1) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_min:
+            t_min = t1
+        if t2 < t_max:
+            t_max = t2
+        if t_min > t_max:
+            return False
+    if dy == 0.0:
+        if y1 < top or y1 > bottom:
+            return False
+    else:
+        inv = 1.0 / dy
+        t1 = (top - y1) * inv
+        t2 = (bottom - y1) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_min:
+            t_min = t1
+        if t2 < t_max:
+            t_max = t2
+        if t_min > t_max:
+            return False
+    return True
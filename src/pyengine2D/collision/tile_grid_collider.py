@@ -0,0 +1,189 @@
+import math
+from src.pyengine2D.collision.collider2d import Collider2D
+
+
+class TileGridCollider(Collider2D):
+    """
+    Static collision shape for a whole grid of solid tiles.
+
+    One node replaces the per-run Collider2D children a tilemap would
+    otherwise generate.  It sits in the broadphase as a single AABB
+    covering the map; CollisionWorld then indexes the solid-cell array
+    directly, so a query touches only the tiles its rect overlaps.
+
+    Cells are stored row-major in ``solid`` (1 = solid).  The grid's
+    top-left corner is the node's global position; scale is ignored.
+    """
+    is_tile_grid = True
+
+    def __init__(self, name, x, y, cols, rows, tile_width, tile_height, solid=None):
+        super().__init__(name, x, y, cols * tile_width, rows * tile_height, is_static=True)
+        self.cols = cols
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.solid = bytearray(cols * rows) if solid is None else bytearray(solid)
+        if len(self.solid) != cols * rows:
+            raise ValueError("TileGridCollider: solid array must hold cols * rows cells.")
+
+    @classmethod
+    def from_tiles(cls, name, tile_layers, tile_width, tile_height, x=0, y=0):
+        """Build a grid from one or more 2D tile-id arrays; any id > 0 is solid."""
+        rows = max((len(tiles) for tiles in tile_layers), default=0)
+        cols = max((len(row) for tiles in tile_layers for row in tiles), default=0)
+        grid = cls(name, x, y, cols, rows, tile_width, tile_height)
+        solid = grid.solid
+        for tiles in tile_layers:
+            for r, row_data in enumerate(tiles):
+                base = r * cols
+                for c, tile_id in enumerate(row_data):
+                    if tile_id > 0:
+                        solid[base + c] = 1
+        return grid
+
+    # ------------------------------------------------------------------
+    # Cell access
+    # ------------------------------------------------------------------
+
+    def is_solid(self, col, row):
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.solid[row * self.cols + col] != 0
+        return False
+
+    def set_solid(self, col, row, value=True):
+        """Mark one cell solid or empty (no node or broadphase rebuild needed)."""
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            raise IndexError(f"Tile ({col}, {row}) outside {self.cols}x{self.rows} grid")
+        self.solid[row * self.cols + col] = 1 if value else 0
+        self._shape_version += 1  # world re-tests this collider's pairs
+
+    def get_rect(self):
+        gx, gy = self.get_global_position()
+        return (gx, gy, gx + self.cols * self.tile_width, gy + self.rows * self.tile_height)
+
+    # ------------------------------------------------------------------
+    # Queries (world space)
+    # ------------------------------------------------------------------
+
+    def solid_rects(self, left, top, right, bottom):
+        """
+        Yield the world bounds (l, t, r, b) of every solid tile that
+        strictly overlaps the given rect.  Cost is the number of tiles
+        the rect covers, independent of the map size.
+        """
+        gx, gy = self.get_global_position()
+        tw = self.tile_width
+        th = self.tile_height
+        c0 = max(0, int(math.floor((left - gx) / tw)))
+        c1 = min(self.cols - 1, int(math.ceil((right - gx) / tw)) - 1)
+        r0 = max(0, int(math.floor((top - gy) / th)))
+        r1 = min(self.rows - 1, int(math.ceil((bottom - gy) / th)) - 1)
+        if c0 > c1 or r0 > r1:
+            return
+
+        solid = self.solid
+        cols = self.cols
+        for r in range(r0, r1 + 1):
+            base = r * cols
+            ty = gy + r * th
+            for c in range(c0, c1 + 1):
+                if solid[base + c]:
+                    tx = gx + c * tw
+                    if tx < right and tx + tw > left and ty < bottom and ty + th > top:
+                        yield (tx, ty, tx + tw, ty + th)
+
+    def ray_hit_time(self, x1, y1, x2, y2):
+        """
+        Walk the tiles crossed by the segment (DDA) and return the
+        parameter t in [0, 1] at which it first enters a solid tile, or
+        None.  Like the box raycast, a segment starting inside a solid
+        tile hits where it leaves that tile.
+        """
+        gx, gy = self.get_global_position()
+        tw = self.tile_width
+        th = self.tile_height
+        dx = x2 - x1
+        dy = y2 - y1
+
+        # Clip the segment to the grid bounds
+        t_enter, t_exit = 0.0, 1.0
+        for origin, delta, lo, hi in ((x1, dx, gx, gx + self.cols * tw),
+                                      (y1, dy, gy, gy + self.rows * th)):
+            if delta == 0:
+                if origin < lo or origin > hi:
+                    return None
+                continue
+            t1 = (lo - origin) / delta
+            t2 = (hi - origin) / delta
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > t_enter:
+                t_enter = t1
+            if t2 < t_exit:
+                t_exit = t2
+            if t_enter > t_exit:
+                return None
+
+        px = x1 + dx * t_enter - gx
+        py = y1 + dy * t_enter - gy
+        c = min(self.cols - 1, max(0, int(px // tw)))
+        r = min(self.rows - 1, max(0, int(py // th)))
+
+        inf = float('inf')
+        if dx > 0:
+            step_c, t_max_x, t_delta_x = 1, ((c + 1) * tw + gx - x1) / dx, tw / dx
+        elif dx < 0:
+            step_c, t_max_x, t_delta_x = -1, (c * tw + gx - x1) / dx, -tw / dx
+        else:
+            step_c, t_max_x, t_delta_x = 0, inf, inf
+        if dy > 0:
+            step_r, t_max_y, t_delta_y = 1, ((r + 1) * th + gy - y1) / dy, th / dy
+        elif dy < 0:
+            step_r, t_max_y, t_delta_y = -1, (r * th + gy - y1) / dy, -th / dy
+        else:
+            step_r, t_max_y, t_delta_y = 0, inf, inf
+
+        solid = self.solid
+        cols = self.cols
+        if t_enter == 0.0 and solid[r * cols + c]:
+            # Slab test against the starting tile, as for a box collider
+            enter = max(t_max_x - t_delta_x if step_c else -inf,
+                        t_max_y - t_delta_y if step_r else -inf)
+            if enter >= 0.0:
+                return enter
+            leave = min(t_max_x, t_max_y)
+            return leave if leave <= t_exit else None
+
+        t = t_enter
+        while t <= t_exit:
+            if solid[r * cols + c]:
+                return t
+            if t_max_x < t_max_y:
+                t = t_max_x
+                c += step_c
+                t_max_x += t_delta_x
+                if not 0 <= c < cols:
+                    return None
+            else:
+                t = t_max_y
+                r += step_r
+                t_max_y += t_delta_y
+                if not 0 <= r < self.rows:
+                    return None
+        return None
+
+    def render(self, surface) -> None:
+        """Debug draw — outline each solid tile near the screen."""
+        from src.pyengine2D.core.engine import Engine
+        r = Engine.instance.renderer if Engine.instance else None
+        if r and self.visible:
+            sx, sy = self.get_screen_position()
+            gx, gy = self.get_global_position()
+            sw, sh = surface.get_size()
+            left = gx - sx
+            top = gy - sy
+            for l, t, rr, b in self.solid_rects(left, top, left + sw, top + sh):
+                r.draw_rect(surface, (0, 0, 255), l - left, t - top,
+                            self.tile_width, self.tile_height, 1)
+        from src.pyengine2D.scene.node2d import Node2D
+        Node2D.render(self, surface)
@@ -44,6 +44,10 @@ class Engine:
         self.dt = 0.0
         self.fps = 0.0
         self.debug_mode = False
+        # Draw moving nodes between their last two fixed steps, so logic
+        # can tick slower than the display without visible stutter
+        self.interpolate_rendering = False
+        self._previous_globals = {}  # node -> global position before the last step
         self.input = InputSystem(self)
         self.renderer = Renderer()
         
@@ -91,6 +95,12 @@ class Engine:
 
         Existing begin_frame()/end_frame() remain available for games
         that need fully manual loop control.
+
+        With ``interpolate_rendering`` set, each fixed step records where
+        the nodes it moved were before it, and the frame is drawn
+        ``accumulator / fixed_dt`` of the way from there to their current
+        position (one step behind the simulation, like any interpolating
+        loop).  Logic can then run at e.g. 30 Hz behind a 60-144 Hz display.
         """
         accumulator = 0.0
         while self.running:
@@ -107,23 +117,34 @@ class Engine:
             accumulator = min(accumulator, self.fixed_dt * 8)
 
             self.profiler.begin("Logic")
+            from src.pyengine2D.scene.node2d import Node2D
             while accumulator >= self.fixed_dt:
+                if active_root:
+                    active_root.update_transforms()
+                if self.interpolate_rendering:
+                    Node2D._move_log = {}
                 if not self.paused:
                     self.master_clock.update(self.fixed_dt)
                     if active_root:
-                        active_root.update_transforms()
                         active_root.update(self.fixed_dt)
                 if on_fixed_update:
                     on_fixed_update(self, active_root, self.fixed_dt)
+                if self.interpolate_rendering:
+                    self._previous_globals = Node2D._move_log
+                    Node2D._move_log = None
                 accumulator -= self.fixed_dt
             self.profiler.end("Logic")
 
             self.profiler.begin("Render")
             self.renderer.fill(self.game_surface, (0, 0, 0))
             if active_root:
-                from src.pyengine2D.scene.node2d import Node2D
                 self.scene_renderer.camera = Node2D.camera
                 self.scene_renderer.debug_mode = self.debug_mode
+                if self.interpolate_rendering:
+                    self.scene_renderer.previous_globals = self._previous_globals
+                    self.scene_renderer.alpha = accumulator / self.fixed_dt
+                else:
+                    self.scene_renderer.previous_globals = None
                 self.scene_renderer.draw(active_root, self.game_surface, self)
             if on_render and active_root:
                 on_render(self, active_root, self.game_surface)
@@ -1,11 +1,16 @@
 from .physics_body_2d import PhysicsBody2D
 from .rigid_body_2d import RigidBody2D
 from .distance_constraint import DistanceConstraint
+from .joint_2d import Joint2D, DistanceJoint, SpringJoint, PinJoint
 from .physics_world_2d import PhysicsWorld2D
 
 __all__ = [
     'PhysicsBody2D',
     'RigidBody2D',
     'DistanceConstraint',
+    'Joint2D',
+    'DistanceJoint',
+    'SpringJoint',
+    'PinJoint',
     'PhysicsWorld2D'
 ]
@@ -0,0 +1,372 @@
+"""
+BodyStore — struct-of-arrays mirror of PhysicsWorld2D's rigid bodies.
+
+Position, velocity, force, inverse mass and gravity scale live in
+contiguous NumPy arrays (one row per body) so that a sub-step integrates
+every body with a handful of array operations instead of one Python
+attribute write (and set_dirty) per body per axis.  DistanceConstraints
+and body-vs-body contacts can be solved on the same arrays, so a world
+of bodies that only touch each other writes its nodes once per frame.
+
+NumPy is optional.  ``BodyStore.available`` is False when it is not
+installed and PhysicsWorld2D falls back to its per-body loop.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from src.pyengine2D.collision.collider_store import _ranges
+
+
+class BodyStore:
+    """
+    Row-per-body arrays:
+
+        pos[i]     = (local_x, local_y)
+        vel[i]     = (vx, vy)
+        force[i]   = (force_x, force_y), consumed by the first integrate()
+        inv_mass[i], gravity[i] = inv_mass, gravity_scale (0 if no gravity)
+
+    Only awake, non-kinematic rows (``dynamic``) are integrated.
+
+    Bodies with a collider also get a shape row (``shape_body[s]`` is
+    its body row): the collider's bounds as an offset from pos, its
+    circle radius, layer/mask bits and trigger flag, all taken at
+    load().  Shapes follow their body through solve_pairs(), which
+    mirrors RigidBody2D.solve_pair; a collider that changes size or
+    offset mid-frame is picked up at the next load().
+    """
+
+    available = np is not None
+
+    def __init__(self):
+        self.bodies = []
+        self.pos = np.zeros((0, 2), dtype=np.float64)
+        self.vel = np.zeros((0, 2), dtype=np.float64)
+        self.force = np.zeros((0, 2), dtype=np.float64)
+        self.inv_mass = np.zeros(0, dtype=np.float64)
+        self.gravity = np.zeros(0, dtype=np.float64)
+        self.dynamic = np.zeros(0, dtype=np.intp)  # row indices to integrate
+        self.awake = np.zeros(0, dtype=bool)
+        self.islands = {}
+        self.kinematic = np.zeros(0, dtype=bool)
+        self.restitution = np.zeros(0, dtype=np.float64)
+        self.shape_body = np.zeros(0, dtype=np.intp)
+        self.shape_offset = np.zeros((0, 4), dtype=np.float64)
+        self.radius = np.zeros(0, dtype=np.float64)
+        self.circle = np.zeros(0, dtype=bool)
+        self.solid = np.zeros(0, dtype=bool)
+        self.layer_bits = np.zeros(0, dtype=np.uint64)
+        self.mask_bits = np.zeros(0, dtype=np.uint64)
+        self.zones = None
+        self._constraints = []
+
+    def load(self, bodies):
+        """Copy the full state of *bodies* in, taking over their pending forces."""
+        self.bodies = list(bodies)
+        bodies = self.bodies
+        self.pos = np.array([(b._local_x, b._local_y) for b in bodies], dtype=np.float64).reshape(-1, 2)
+        self.vel = np.array([(b.vx, b.vy) for b in bodies], dtype=np.float64).reshape(-1, 2)
+        self.force = np.array([(b.force_x, b.force_y) for b in bodies], dtype=np.float64).reshape(-1, 2)
+        self.inv_mass = np.array([b.inv_mass for b in bodies], dtype=np.float64)
+        self.gravity = np.array([b.gravity_scale if b.use_gravity else 0.0 for b in bodies],
+                                dtype=np.float64)
+        self.kinematic = np.array([b.is_kinematic for b in bodies], dtype=bool)
+        self.restitution = np.array([b.restitution for b in bodies], dtype=np.float64)
+        self.refresh_awake()
+        for i in self.dynamic.tolist():
+            bodies[i].clear_forces()
+        self._load_shapes()
+        self.zones = None
+
+    def refresh_awake(self):
+        """Re-read which rows sleep (after bodies were woken mid-frame)."""
+        bodies = self.bodies
+        self.awake = np.array([not b.sleeping for b in bodies], dtype=bool)
+        self.dynamic = np.flatnonzero(self.awake & ~self.kinematic)
+        # Sleeping row -> rows of the island that wakes with it
+        self.islands = {}
+        if not self.awake.all():
+            rows = {b: i for i, b in enumerate(bodies)}
+            for i in np.flatnonzero(~self.awake).tolist():
+                island = bodies[i]._island or (bodies[i],)
+                self.islands[i] = [rows[b] for b in island if b in rows]
+
+    def _load_shapes(self):
+        rows = []
+        offsets = []
+        radius = []
+        flags = []
+        for i, b in enumerate(self.bodies):
+            col = b.collider
+            if col is None:
+                continue
+            rect = col.get_rect()
+            if not isinstance(rect, tuple):
+                rect = (rect.left, rect.top, rect.right, rect.bottom)
+            x, y = self.pos[i]
+            rows.append(i)
+            offsets.append((rect[0] - x, rect[1] - y, rect[2] - x, rect[3] - y))
+            circle = hasattr(col, 'radius')
+            radius.append(col.radius * col.scale_x if circle else 0.0)
+            flags.append((circle, not col.is_trigger, col.layer_bits, col.mask_bits))
+        self.shape_body = np.array(rows, dtype=np.intp)
+        self.shape_offset = np.array(offsets, dtype=np.float64).reshape(-1, 4)
+        self.radius = np.array(radius, dtype=np.float64)
+        self.circle = np.array([f[0] for f in flags], dtype=bool)
+        self.solid = np.array([f[1] for f in flags], dtype=bool)
+        self.layer_bits = np.array([f[2] for f in flags], dtype=np.uint64)
+        self.mask_bits = np.array([f[3] for f in flags], dtype=np.uint64)
+
+    def load_constraints(self, constraints):
+        """
+        Index DistanceConstraints for solve_constraints().  Returns False
+        (and keeps none) if one holds a body outside the store.
+        Constraints are split into batches in which no body repeats; a
+        constraint's batch is the number of earlier ones on its body, so
+        the batches replay the constraints' sequential order.
+        """
+        rows = {b: i for i, b in enumerate(self.bodies)}
+        batches = []
+        seen = {}
+        for c in constraints:
+            row = rows.get(c.body_a)
+            if row is None:
+                self._constraints = []
+                return False
+            k = seen.get(row, 0)
+            seen[row] = k + 1
+            if k == len(batches):
+                batches.append([])
+            batches[k].append((row, c._local_x, c._local_y, c.length))
+        self._constraints = [
+            (np.array([e[0] for e in batch], dtype=np.intp),
+             np.array([(e[1], e[2]) for e in batch], dtype=np.float64),
+             np.array([e[3] for e in batch], dtype=np.float64))
+            for batch in batches
+        ]
+        return True
+
+    def solve_constraints(self):
+        """DistanceConstraint.solve() for every awake row, batch by batch."""
+        pos, vel, awake = self.pos, self.vel, self.awake
+        for rows, anchor, length in self._constraints:
+            d = pos[rows] - anchor
+            dist = np.hypot(d[:, 0], d[:, 1])
+            live = awake[rows] & (dist > 0.0001)
+            if not live.all():
+                rows, d, dist, length = rows[live], d[live], dist[live], length[live]
+            nx = d[:, 0] / dist
+            ny = d[:, 1] / dist
+            diff = dist - length
+            pos[rows, 0] -= nx * diff
+            pos[rows, 1] -= ny * diff
+            # Keep only the velocity along the tangent (-ny, nx)
+            v = vel[rows]
+            v_tangent = v[:, 0] * -ny + v[:, 1] * nx
+            vel[rows, 0] = -ny * v_tangent
+            vel[rows, 1] = nx * v_tangent
+
+    def shape_bounds(self):
+        """Current (l, t, r, b) of every shape row."""
+        p = self.pos[self.shape_body]
+        return self.shape_offset + np.concatenate((p, p), axis=1)
+
+    def set_zones(self, zones):
+        """
+        Per body row, a (l, t, r, b) rect its collider may move in
+        (in_zones() reports when one leaves it).
+        """
+        self.zones = np.array(zones, dtype=np.float64).reshape(-1, 4)[self.shape_body]
+
+    def in_zones(self):
+        """True while every shape lies inside its body's zone."""
+        if self.zones is None or not len(self.shape_body):
+            return True
+        b = self.shape_bounds()
+        z = self.zones
+        return bool(((b[:, :2] >= z[:, :2]).all() and (b[:, 2:] <= z[:, 2:]).all()))
+
+    def solve_pairs(self, reach):
+        """
+        Body-vs-body contacts on the arrays: the narrow-phase and
+        response of RigidBody2D.solve_pair for each pair of solid shapes
+        that see each other, at least one of them awake.  Candidates are
+        the pairs within *reach* of each other when the stage starts;
+        like the node loop they are visited row by row, by an awake row
+        whose partner is asleep or further down, and solved one after
+        another against the current positions, so a push travels down a
+        row of touching bodies in one pass.  Touching a sleeping row
+        wakes its island on the spot, as RigidBody2D.wake() does.
+
+        Returns the touching (row, row) pairs and the rows woken, which
+        the caller wakes.
+        """
+        if len(self.shape_body) < 2:
+            return [], []
+        bounds = self.shape_bounds()
+        sa, sb = _sweep(bounds, reach)
+        keep = (self.solid[sa] & self.solid[sb]
+                & (((self.layer_bits[sa] & self.mask_bits[sb])
+                    | (self.layer_bits[sb] & self.mask_bits[sa])) != 0))
+        sa, sb = sa[keep], sb[keep]
+        ra, rb = self.shape_body[sa], self.shape_body[sb]
+        # Two rows awake now stay awake: only the lower one visits.  With
+        # a sleeper either row may visit, depending on who is awake when
+        # the loop reaches it, so both directions are kept.
+        both = self.awake[ra] & self.awake[rb]
+        fwd, bwd = ~both | (ra < rb), ~both | (rb < ra)
+        sa, sb = np.concatenate((sa[fwd], sb[bwd])), np.concatenate((sb[fwd], sa[bwd]))
+        ra, rb = self.shape_body[sa], self.shape_body[sb]
+        if not len(sa):
+            return [], []
+        order = np.lexsort((rb, ra))
+
+        pos = self.pos.tolist()
+        vel = self.vel.tolist()
+        offset = self.shape_offset.tolist()
+        radius = self.radius.tolist()
+        circle = self.circle.tolist()
+        inv_mass = self.inv_mass.tolist()
+        kinematic = self.kinematic.tolist()
+        restitution = self.restitution.tolist()
+        awake = self.awake.tolist()
+        islands = self.islands
+        touching = []
+        woken = []
+        for a, b, s, t in zip(ra[order].tolist(), rb[order].tolist(),
+                              sa[order].tolist(), sb[order].tolist()):
+            if not awake[a] or (awake[b] and b < a):
+                continue
+            pa, pb = pos[a], pos[b]
+            oa, ob = offset[s], offset[t]
+            al, at, ar, ab = pa[0] + oa[0], pa[1] + oa[1], pa[0] + oa[2], pa[1] + oa[3]
+            bl, bt, br, bb = pb[0] + ob[0], pb[1] + ob[1], pb[0] + ob[2], pb[1] + ob[3]
+            if al >= br or ar <= bl or at >= bb or ab <= bt:
+                continue
+
+            # Narrow-phase, as rigid_body_2d._contact
+            if circle[s] and circle[t]:
+                dx = (al + ar) * 0.5 - (bl + br) * 0.5
+                dy = (at + ab) * 0.5 - (bt + bb) * 0.5
+                dist = math.hypot(dx, dy)
+                r = radius[s] + radius[t]
+                if dist >= r or dist == 0.0:
+                    continue
+                nx, ny, pen = dx / dist, dy / dist, r - dist
+            else:
+                overlap_left = ar - bl
+                overlap_right = br - al
+                overlap_top = ab - bt
+                overlap_bottom = bb - at
+                if overlap_left < overlap_right:
+                    pen_x, normal_x = overlap_left, -1.0
+                else:
+                    pen_x, normal_x = overlap_right, 1.0
+                if overlap_top < overlap_bottom:
+                    pen_y, normal_y = overlap_top, -1.0
+                else:
+                    pen_y, normal_y = overlap_bottom, 1.0
+                if pen_x < pen_y:
+                    nx, ny, pen = normal_x, 0.0, pen_x
+                else:
+                    nx, ny, pen = 0.0, normal_y, pen_y
+
+            touching.append((a, b))
+            if not awake[b]:
+                for row in islands[b]:
+                    if not awake[row]:
+                        awake[row] = True
+                        woken.append(row)
+
+            # Response, as rigid_body_2d._respond between two rigid bodies
+            w1, w2 = inv_mass[a], inv_mass[b]
+            sum_w = w1 + w2
+            if sum_w == 0.0:
+                continue
+            va, vb = vel[a], vel[b]
+            rel_v = (va[0] * nx + va[1] * ny) - (vb[0] * nx + vb[1] * ny)
+            if not kinematic[a]:
+                k = pen * (w1 / sum_w)
+                pa[0] += nx * k
+                pa[1] += ny * k
+            if not kinematic[b]:
+                k = pen * (w2 / sum_w)
+                pb[0] -= nx * k
+                pb[1] -= ny * k
+            if rel_v < 0:
+                j = -(1.0 + restitution[a] * restitution[b]) * rel_v / sum_w
+                if not kinematic[a]:
+                    va[0] += j * w1 * nx
+                    va[1] += j * w1 * ny
+                if not kinematic[b]:
+                    vb[0] -= j * w2 * nx
+                    vb[1] -= j * w2 * ny
+
+        if touching:
+            self.pos[:] = pos
+            self.vel[:] = vel
+        return touching, woken
+
+    def integrate(self, sdt, gravity_y, positions=True):
+        """
+        One semi-implicit Euler step for every dynamic row.  With
+        ``positions=False`` only velocities advance (a contact solver
+        moves the positions afterwards).
+        """
+        d = self.dynamic
+        if d.size == 0:
+            return
+        vel = self.vel[d]
+        vel[:, 1] += gravity_y * self.gravity[d] * sdt
+        vel += self.force[d] * self.inv_mass[d, None] * sdt
+        self.vel[d] = vel
+        if positions:
+            self.pos[d] += vel * sdt
+        self.force[d] = 0.0
+
+    def max_speed(self, gravity_dv):
+        """
+        Largest speed of a dynamic row once *gravity_dv* (gravity_y *
+        frame time) is added on top of its current velocity.
+        """
+        d = self.dynamic
+        if d.size == 0:
+            return 0.0
+        vel = self.vel[d]
+        speed = np.hypot(vel[:, 0], vel[:, 1]) + abs(gravity_dv) * np.abs(self.gravity[d])
+        return float(speed.max())
+
+    def pull(self):
+        """
+        Re-read positions, velocities and which rows sleep after
+        node-level solvers ran (they may have woken bodies).
+        """
+        bodies = self.bodies
+        self.pos = np.array([(b._local_x, b._local_y) for b in bodies], dtype=np.float64).reshape(-1, 2)
+        self.vel = np.array([(b.vx, b.vy) for b in bodies], dtype=np.float64).reshape(-1, 2)
+        self.refresh_awake()
+
+    def push(self):
+        """Write positions and velocities back to the nodes."""
+        for b, (x, y), (vx, vy) in zip(self.bodies, self.pos.tolist(), self.vel.tolist()):
+            b.set_position(x, y)
+            b.vx = vx
+            b.vy = vy
+
+
+def _sweep(bounds, reach):
+    """Every unordered pair of rows whose *bounds*, grown by *reach*, overlap."""
+    order = np.argsort(bounds[:, 0], kind='stable')
+    left = bounds[order, 0]
+    top = bounds[order, 1]
+    right = bounds[order, 2]
+    bottom = bounds[order, 3]
+    starts = np.arange(len(order))
+    ends = np.searchsorted(left, right + reach, side='left')
+    ii, jj = _ranges(starts, starts + 1, ends)
+    hit = (top[ii] < bottom[jj] + reach) & (bottom[ii] > top[jj] - reach)
+    return order[ii[hit]], order[jj[hit]]
@@ -0,0 +1,158 @@
+"""
+ContactSolver — sequential-impulse contact resolution for PhysicsWorld2D.
+
+Every sub-step the world reports each touching pair (body-vs-body and
+body-vs-static) through add().  Contacts live in a dict keyed by the
+pair, so a pair that stays in contact keeps its accumulated normal
+impulse and the next step starts from it (warm starting).  solve() then
+runs a fixed number of velocity iterations, each of which is a few
+multiplications per contact, and correct() removes what penetration is
+left by moving positions only, so no energy is injected.
+
+RigidBody2D does not rotate, so a manifold is a single contact point:
+the pair's normal, penetration and accumulated impulse.
+"""
+
+
+class Contact:
+    """One persistent contact.  *b* is None for static geometry."""
+
+    __slots__ = ("a", "b", "nx", "ny", "pen", "wa", "wb", "mass",
+                 "bias", "impulse", "vx", "vy", "stamp")
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+        self.impulse = 0.0   # accumulated normal impulse, >= 0
+        self.vx = 0.0        # velocity of a non-rigid *b* (PhysicsBody2D)
+        self.vy = 0.0
+        self.stamp = 0
+
+    def normal_velocity(self):
+        """Relative velocity of *a* w.r.t. *b* along the normal (< 0 = closing)."""
+        a, b = self.a, self.b
+        if b is not None:
+            bvx, bvy = b.vx, b.vy
+        else:
+            bvx, bvy = self.vx, self.vy
+        return (a.vx - bvx) * self.nx + (a.vy - bvy) * self.ny
+
+    def apply(self, j):
+        """Apply normal impulse *j* to both sides (scaled by inverse mass)."""
+        jx = j * self.nx
+        jy = j * self.ny
+        if self.wa:
+            self.a.vx += jx * self.wa
+            self.a.vy += jy * self.wa
+        if self.wb:
+            self.b.vx -= jx * self.wb
+            self.b.vy -= jy * self.wb
+
+
+class ContactSolver:
+    """
+    Persistent contacts plus a Gauss-Seidel velocity solver.
+
+        iterations        velocity passes over all contacts per solve()
+        baumgarte         fraction of the remaining penetration removed
+                          per correct()
+        slop              penetration (px) left alone so resting contacts
+                          persist between steps and keep their impulse
+        bounce_threshold  closing speed (px/s) below which contacts do not
+                          bounce, so resting stacks do not jitter
+    """
+
+    def __init__(self, iterations=8, baumgarte=0.8, slop=0.5, bounce_threshold=20.0):
+        self.iterations = iterations
+        self.baumgarte = baumgarte
+        self.slop = slop
+        self.bounce_threshold = bounce_threshold
+        self.manifolds = {}  # key -> Contact
+        self._active = []
+        self._stamp = 0
+
+    def begin(self):
+        """Start collecting the contacts of a new step."""
+        self._stamp += 1
+        self._active = []
+
+    def add(self, key, a, b, nx, ny, pen, restitution, vx=0.0, vy=0.0):
+        """
+        Report that *a* overlaps *b* (None = static, moving at (vx, vy))
+        by *pen* along the normal (nx, ny) that pushes *a* out.
+        """
+        contact = self.manifolds.get(key)
+        if contact is None:
+            contact = self.manifolds[key] = Contact(a, b)
+        elif contact.nx * nx + contact.ny * ny < 0.99:
+            contact.impulse = 0.0  # the normal turned: old impulse is meaningless
+        contact.nx = nx
+        contact.ny = ny
+        contact.pen = pen
+        contact.vx = vx
+        contact.vy = vy
+        contact.stamp = self._stamp
+
+        wa = 0.0 if a.is_kinematic else a.inv_mass
+        wb = 0.0 if b is None or b.is_kinematic else b.inv_mass
+        contact.wa = wa
+        contact.wb = wb
+        contact.mass = 1.0 / (wa + wb) if wa + wb > 0.0 else 0.0
+
+        vn = contact.normal_velocity()
+        contact.bias = -restitution * vn if vn < -self.bounce_threshold else 0.0
+        self._active.append(contact)
+
+    def rescale(self, ratio):
+        """
+        Scale the accumulated impulses when the step length changes by
+        *ratio*, so warm starting pushes as hard per second as before.
+        """
+        for c in self.manifolds.values():
+            c.impulse *= ratio
+
+    def solve(self):
+        """Drop stale manifolds, warm start, then run the velocity iterations."""
+        contacts = self._active
+        if len(self.manifolds) != len(contacts):
+            stamp = self._stamp
+            self.manifolds = {k: c for k, c in self.manifolds.items() if c.stamp == stamp}
+
+        for c in contacts:
+            if c.impulse and c.mass:
+                c.apply(c.impulse)
+
+        for _ in range(self.iterations):
+            for c in contacts:
+                if not c.mass:
+                    continue
+                j = c.mass * (c.bias - c.normal_velocity())
+                total = c.impulse + j
+                if total < 0.0:
+                    total = 0.0
+                j = total - c.impulse
+                if j:
+                    c.impulse = total
+                    c.apply(j)
+
+    def correct(self, sdt):
+        """
+        Push still-overlapping pairs apart after positions were integrated.
+        The penetration is estimated from the solved normal velocity
+        instead of running the narrow-phase again.
+        """
+        baumgarte = self.baumgarte
+        slop = self.slop
+        for c in self._active:
+            if not c.mass:
+                continue
+            error = c.pen - c.normal_velocity() * sdt - slop
+            if error <= 0.0:
+                continue
+            move = baumgarte * error * c.mass
+            if c.wa:
+                c.a.local_x += c.nx * move * c.wa
+                c.a.local_y += c.ny * move * c.wa
+            if c.wb:
+                c.b.local_x -= c.nx * move * c.wb
+                c.b.local_y -= c.ny * move * c.wb
@@ -0,0 +1,133 @@
+import math
+from src.pyengine2D.scene.node2d import Node2D
+
+
+class Joint2D(Node2D):
+    """
+    Links body_a to body_b (or, if body_b is None, to this node's own
+    position).  Solved in batches by PhysicsWorld2D through a JointStore;
+    project() and damp() are the per-joint fallback used when NumPy is
+    missing.
+
+    Both ends are compared in the coordinate space of the bodies' parent
+    (the PhysicsWorld2D), like DistanceConstraint.
+
+        length     rest distance; None = the distance when created
+        stiffness  fraction of the position error removed per pass (1 = rigid)
+        damping    fraction of the relative velocity along the joint
+                   removed per substep
+    """
+    PIN = False
+
+    def __init__(self, name, body_a, body_b=None, length=None, stiffness=1.0, damping=1.0,
+                 anchor_x=0.0, anchor_y=0.0):
+        super().__init__(name, anchor_x, anchor_y)
+        self.body_a = body_a
+        self.body_b = body_b
+        self.stiffness = stiffness
+        self.damping = damping
+        self.offset_x, self.offset_y = self._separation()
+        if length is None:
+            length = math.hypot(self.offset_x, self.offset_y)
+        self.length = length
+
+    def _separation(self):
+        """(a - b) in the world's coordinates, or (0, 0) if not linked yet."""
+        a = self.body_a
+        if a is None:
+            return 0.0, 0.0
+        b = self.body_b
+        bx, by = (b.local_x, b.local_y) if b is not None else (self.local_x, self.local_y)
+        return a.local_x - bx, a.local_y - by
+
+    def _weights(self):
+        a, b = self.body_a, self.body_b
+        wa = 0.0 if a.is_kinematic else a.inv_mass
+        wb = 0.0 if b is None or b.is_kinematic else b.inv_mass
+        return wa, wb
+
+    def project(self):
+        """One Gauss-Seidel position relaxation of this joint."""
+        wa, wb = self._weights()
+        w = wa + wb
+        if w == 0.0:
+            return
+        dx, dy = self._separation()
+        if self.PIN:
+            ex, ey = dx - self.offset_x, dy - self.offset_y
+        else:
+            dist = math.hypot(dx, dy)
+            if dist < 1e-9:
+                return
+            e = 1.0 - self.length / dist  # error along (dx, dy)
+            ex, ey = dx * e, dy * e
+        k = self.stiffness / w
+        a, b = self.body_a, self.body_b
+        a.local_x -= ex * k * wa
+        a.local_y -= ey * k * wa
+        if wb:
+            b.local_x += ex * k * wb
+            b.local_y += ey * k * wb
+
+    def damp(self):
+        """Remove `damping` of the relative velocity along the joint."""
+        wa, wb = self._weights()
+        w = wa + wb
+        if w == 0.0:
+            return
+        a, b = self.body_a, self.body_b
+        rx, ry = a.vx, a.vy
+        if b is not None:
+            rx -= b.vx
+            ry -= b.vy
+        if not self.PIN:
+            dx, dy = self._separation()
+            d2 = dx * dx + dy * dy
+            if d2 < 1e-18:
+                return
+            r = (rx * dx + ry * dy) / d2
+            rx, ry = dx * r, dy * r
+        k = self.damping / w
+        a.vx -= rx * k * wa
+        a.vy -= ry * k * wa
+        if wb:
+            b.vx += rx * k * wb
+            b.vy += ry * k * wb
+
+    def render(self, surface):
+        from src.pyengine2D.core.engine import Engine
+        if not Engine.instance or self.body_a is None: return
+        renderer = Engine.instance.renderer
+
+        ax, ay = self.body_a.get_global_position()
+        if self.body_b is not None:
+            bx, by = self.body_b.get_global_position()
+        else:
+            bx, by = self.get_global_position()
+
+        renderer.draw_line(surface, (150, 150, 150), int(ax), int(ay), int(bx), int(by), 2)
+
+        super().render(surface)
+
+
+class DistanceJoint(Joint2D):
+    """Rigid rod: keeps the two ends exactly `length` apart."""
+
+    def __init__(self, name, body_a, body_b=None, length=None, anchor_x=0.0, anchor_y=0.0):
+        super().__init__(name, body_a, body_b, length, 1.0, 1.0, anchor_x, anchor_y)
+
+
+class SpringJoint(Joint2D):
+    """Soft link that pulls the ends back towards `length` a little per pass."""
+
+    def __init__(self, name, body_a, body_b=None, length=None, stiffness=0.05, damping=0.02,
+                 anchor_x=0.0, anchor_y=0.0):
+        super().__init__(name, body_a, body_b, length, stiffness, damping, anchor_x, anchor_y)
+
+
+class PinJoint(Joint2D):
+    """Holds body_a at a fixed offset from body_b (or the anchor), on both axes."""
+    PIN = True
+
+    def __init__(self, name, body_a, body_b=None, anchor_x=0.0, anchor_y=0.0):
+        super().__init__(name, body_a, body_b, None, 1.0, 1.0, anchor_x, anchor_y)
@@ -0,0 +1,298 @@
+"""
+JointStore — struct-of-arrays batch of PhysicsWorld2D's Joint2Ds.
+
+Each joint is one row of index and parameter arrays (body rows, rest
+length, pin offset, stiffness, damping).  Joints are greedily coloured
+so that no two joints of a colour share a body; a colour is then
+relaxed with a handful of array operations, and the colours in turn
+give a Gauss-Seidel sweep.  A chain needs two colours however many
+links it has.
+
+The arrays are a copy: PhysicsWorld2D calls sync() every frame, which
+reloads them when a joint's parameters or end weights changed and
+re-reads the anchor positions.  Joints whose ends all sleep are left
+out of a relax, like the per-joint fallback does.
+
+NumPy is optional.  ``JointStore.available`` is False when it is not
+installed and PhysicsWorld2D falls back to Joint2D.project() and
+damp() per joint.
+"""
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# What load() copies out of the joints and their ends; sync() compares it
+_JOINT_STATE = attrgetter("body_a", "body_b", "length", "offset_x", "offset_y",
+                          "stiffness", "damping")
+_END_WEIGHT = attrgetter("is_kinematic", "inv_mass")
+_ANCHOR = attrgetter("_local_x", "_local_y")
+
+
+class JointStore:
+    """
+    Row-per-joint arrays over a position/velocity table with one row per
+    body, followed by one fixed (zero inverse mass) row per anchored
+    joint:
+
+        ia[j], ib[j]    rows of the two ends
+        length[j]       rest length (unused by pins)
+        offset[j]       pinned (a - b) separation
+        pin[j]          True for PinJoint rows
+        stiffness[j], damping[j]
+        colors          list of joint-index arrays, one per colour
+
+    The per-colour slices of those arrays (split into distance rows and
+    pin rows) are cut once in load().
+    """
+
+    available = np is not None
+
+    def __init__(self):
+        self.bodies = []
+        self.colors = []
+        self._batches = []
+        self.anchors = None
+        self._joint_state = None
+        self._ends = []
+        self._end_weights = []
+        self._anchor_joints = []
+        self._anchor_points = []
+
+    def load(self, joints, bodies=None):
+        """
+        Index *joints* (skipping unlinked or immovable ones) and colour
+        them.  With *bodies* the body rows follow that list, so relax()
+        can run straight on a BodyStore's arrays, and joints to bodies
+        outside it are skipped.  Otherwise the linked bodies get their
+        own rows, gathered by solve().
+        """
+        shared = bodies is not None
+        bodies = list(bodies) if shared else []
+        rows = {b: i for i, b in enumerate(bodies)}
+        joints = list(joints)
+        self._joint_state = list(map(_JOINT_STATE, joints))
+        self._ends = list(dict.fromkeys(b for j in joints for b in (j.body_a, j.body_b)
+                                        if b is not None))
+        self._end_weights = list(map(_END_WEIGHT, self._ends))
+        self._anchor_joints = []
+        anchors = []
+        ends = []
+        params = []
+        for joint in joints:
+            a, b = joint.body_a, joint.body_b
+            if a is None:
+                continue
+            if shared and (a not in rows or (b is not None and b not in rows)):
+                continue
+            wa = 0.0 if a.is_kinematic else a.inv_mass
+            wb = 0.0 if b is None or b.is_kinematic else b.inv_mass
+            if wa + wb == 0.0:
+                continue
+            pair = []
+            for body in (a, b):
+                if body is None:
+                    anchors.append((joint.local_x, joint.local_y))
+                    self._anchor_joints.append(joint)
+                    pair.append(-len(anchors))  # resolved once the body count is known
+                    continue
+                if body not in rows:
+                    rows[body] = len(bodies)
+                    bodies.append(body)
+                pair.append(rows[body])
+            ends.append(pair)
+            params.append((joint.length, joint.offset_x, joint.offset_y, joint.PIN,
+                           joint.stiffness, joint.damping, wa, wb))
+
+        n = len(bodies)
+        self.bodies = bodies
+        self._anchor_points = anchors
+        self.anchors = np.array(anchors, dtype=np.float64).reshape(-1, 2)
+        self.wa = np.array([p[6] for p in params], dtype=np.float64)
+        self.wb = np.array([p[7] for p in params], dtype=np.float64)
+        idx = np.array(ends, dtype=np.intp).reshape(-1, 2)
+        idx[idx < 0] = n - 1 - idx[idx < 0]  # -1 -> n, -2 -> n + 1, ...
+        self.ia = idx[:, 0]
+        self.ib = idx[:, 1]
+        self.length = np.array([p[0] for p in params], dtype=np.float64)
+        self.offset = np.array([(p[1], p[2]) for p in params], dtype=np.float64).reshape(-1, 2)
+        self.pin = np.array([p[3] for p in params], dtype=bool)
+        self.stiffness = np.array([p[4] for p in params], dtype=np.float64)
+        self.damping = np.array([p[5] for p in params], dtype=np.float64)
+        w = self.wa + self.wb
+        self.k_pos = self.stiffness / w
+        self.k_vel = self.damping / w
+
+        # Greedy colouring: first colour not already used at either end.
+        # Anchor rows are unique per joint, so they never conflict.
+        used = [set() for _ in range(n)]
+        colors = []
+        for j, (ra, rb) in enumerate(idx.tolist()):
+            taken = set()
+            if ra < n:
+                taken |= used[ra]
+            if rb < n:
+                taken |= used[rb]
+            c = 0
+            while c in taken:
+                c += 1
+            if c == len(colors):
+                colors.append([])
+            colors[c].append(j)
+            if ra < n:
+                used[ra].add(c)
+            if rb < n:
+                used[rb].add(c)
+        self.colors = [np.array(c, dtype=np.intp) for c in colors]
+        self._batches = self._build_batches()
+
+    def sync(self, joints, bodies=None):
+        """
+        Bring the arrays up to date with *joints* (same arguments as
+        load()): reload if a length, stiffness, damping, offset or end
+        weight changed, otherwise just re-read the anchor positions.
+        """
+        if (list(map(_JOINT_STATE, joints)) != self._joint_state
+                or list(map(_END_WEIGHT, self._ends)) != self._end_weights):
+            self.load(joints, bodies)
+            return
+        points = list(map(_ANCHOR, self._anchor_joints))
+        if points != self._anchor_points:
+            self._anchor_points = points
+            self.anchors = np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    def _build_batches(self, active=None):
+        """Per-colour distance and pin batches, of the *active* rows only if given."""
+        batches = []
+        for rows in self.colors:
+            if active is not None:
+                rows = rows[active[rows]]
+            pin = self.pin[rows]
+            for kind, sel in ((False, rows[~pin]), (True, rows[pin])):
+                if len(sel):
+                    batches.append(self._batch(kind, sel))
+        return batches
+
+    def awake_batches(self):
+        """
+        The batches to relax now: all of them, minus the joints whose
+        ends are all asleep (an anchor counts as asleep).
+        """
+        bodies = self.bodies
+        asleep = np.fromiter((b.sleeping for b in bodies), dtype=bool, count=len(bodies))
+        if not asleep.any():
+            return self._batches
+        asleep = np.concatenate((asleep, np.ones(len(self.anchors), dtype=bool)))
+        active = ~(asleep[self.ia] & asleep[self.ib])
+        if active.all():
+            return self._batches
+        return self._build_batches(active)
+
+    def _batch(self, pin, rows):
+        """Slices for one colour's distance rows or pin rows."""
+        if pin:
+            target = (self.offset[rows, 0], self.offset[rows, 1])
+        else:
+            target = self.length[rows]
+        return (pin, self.ia[rows], self.ib[rows], target,
+                self.k_pos[rows], self.k_vel[rows], self.wa[rows], self.wb[rows])
+
+    def solve(self, iterations, sdt):
+        """Gather body state from the nodes, relax(), write it back."""
+        bodies = self.bodies
+        if not bodies or not self._batches:
+            return
+        batches = self.awake_batches()
+        if not batches:
+            return
+        pos = np.array([(b._local_x, b._local_y) for b in bodies], dtype=np.float64)
+        vel = np.array([(b.vx, b.vy) for b in bodies], dtype=np.float64)
+        self.relax(pos, vel, iterations, sdt, batches)
+        for b, (x, y), (vx, vy) in zip(bodies, pos.tolist(), vel.tolist()):
+            b.set_position(x, y)
+            b.vx = vx
+            b.vy = vy
+
+    def relax(self, pos, vel, iterations, sdt, batches=None):
+        """
+        Relax the (n, 2) body arrays *pos* and *vel* in place, in the same
+        three stages as PhysicsWorld2D's per-joint fallback:
+
+            1. *iterations* coloured position sweeps
+            2. velocities += net position correction / sdt, so bodies do
+               not keep momentum the joints took away (without it a
+               hanging chain keeps accelerating)
+            3. one damping sweep over the relative velocities
+
+        *batches* defaults to awake_batches().
+        """
+        if batches is None:
+            batches = self.awake_batches() if self._batches else []
+        if not batches:
+            return
+        n = len(pos)
+        # Work on contiguous x / y rows (anchors appended): 1-D fancy
+        # indexing is far cheaper than indexing (n, 2) arrays
+        work = np.empty((4, n + len(self.anchors)), dtype=np.float64)
+        work[:2, :n] = pos.T
+        work[2:, :n] = vel.T
+        work[:2, n:] = self.anchors.T
+        work[2:, n:] = 0.0
+        px, py, vx, vy = work
+        for _ in range(iterations):
+            for batch in batches:
+                self._project(batch, px, py)
+        inv_dt = 1.0 / sdt
+        vx[:n] += (px[:n] - pos[:, 0]) * inv_dt
+        vy[:n] += (py[:n] - pos[:, 1]) * inv_dt
+        for batch in batches:
+            self._damp(batch, px, py, vx, vy)
+        pos[:, 0] = px[:n]
+        pos[:, 1] = py[:n]
+        vel[:, 0] = vx[:n]
+        vel[:, 1] = vy[:n]
+
+    @staticmethod
+    def _project(batch, px, py):
+        """Position pass over one batch; its joints share no body, so writes never collide."""
+        pin, ia, ib, target, k_pos, k_vel, wa, wb = batch
+        dx = px[ia] - px[ib]
+        dy = py[ia] - py[ib]
+        if pin:
+            ex = (dx - target[0]) * k_pos
+            ey = (dy - target[1]) * k_pos
+        else:
+            dist = np.hypot(dx, dy)
+            np.maximum(dist, 1e-9, out=dist)
+            # The error of a distance row lies along d: (dist - length)
+            e = (1.0 - target / dist) * k_pos
+            ex = dx * e
+            ey = dy * e
+        px[ia] -= ex * wa
+        py[ia] -= ey * wa
+        px[ib] += ex * wb
+        py[ib] += ey * wb
+
+    @staticmethod
+    def _damp(batch, px, py, vx, vy):
+        """Remove the damped share of each joint's relative velocity."""
+        pin, ia, ib, target, k_pos, k_vel, wa, wb = batch
+        rx = vx[ia] - vx[ib]
+        ry = vy[ia] - vy[ib]
+        if pin:
+            rx *= k_vel
+            ry *= k_vel
+        else:
+            dx = px[ia] - px[ib]
+            dy = py[ia] - py[ib]
+            d2 = dx * dx + dy * dy
+            np.maximum(d2, 1e-18, out=d2)
+            r = (rx * dx + ry * dy) / d2 * k_vel
+            rx = dx * r
+            ry = dy * r
+        vx[ia] -= rx * wa
+        vy[ia] -= ry * wa
+        vx[ib] += rx * wb
+        vy[ib] += ry * wb
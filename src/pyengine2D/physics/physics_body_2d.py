@@ -1,4 +1,5 @@
 from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.collision.collision_world import collision_noop
 
 
 class PhysicsBody2D(Node2D):
@@ -11,7 +12,8 @@ class PhysicsBody2D(Node2D):
         - Applies gravity when use_gravity is True
         - Supports instantaneous impulses via apply_impulse()
         - Computes motion displacement from velocity * delta
-        - Queries CollisionWorld per axis
+        - Queries CollisionWorld per axis, or with one swept query per
+          slide when ``continuous`` is True (no tunnelling, no sub-steps)
         - Resolves position using CollisionResult penetration
         - Zeroes velocity only on the axis of impact
         - Supports opt-in direct positional pushing via can_push / pushable
@@ -24,6 +26,8 @@ class PhysicsBody2D(Node2D):
     SNAP_SEP = 0.01
     # Maximum chain push depth (A pushes B pushes C ...)
     MAX_PUSH_DEPTH = 4
+    # Maximum slides per frame in continuous mode (a corner needs two)
+    MAX_SWEEP_SLIDES = 3
 
     def __init__(self, name, x, y, collider, collision_world):
         super().__init__(name, x, y)
@@ -43,6 +47,9 @@ class PhysicsBody2D(Node2D):
         self.push_strength = 1.0    # How strong this pusher is
         self.push_weight = 1.0      # Resistance to being pushed
 
+        # Continuous collision (opt-in): swept query instead of per-axis checks
+        self.continuous = False
+
     def update(self, delta):
         # Apply gravity acceleration
         if self.use_gravity:
@@ -53,7 +60,10 @@ class PhysicsBody2D(Node2D):
         dy = self.velocity_y * delta
 
         # Move with collision resolution
-        self.move_and_collide(dx, dy)
+        if self.continuous:
+            self.move_and_sweep(dx, dy)
+        else:
+            self.move_and_collide(dx, dy)
 
         # Propagate update to children (collider, visuals, etc.)
         super().update(delta)
@@ -70,14 +80,23 @@ class PhysicsBody2D(Node2D):
         sh = col.height * col.scale_y
         self.collision_world._cached_rects[col] = (gx, gy, gx + sw, gy + sh)
 
-    def _snap_to_obstacle(self, body, obstacle_collider, dx, snap_sep):
-        """Snap body flush against an obstacle on X axis."""
+    @staticmethod
+    def _hit_bounds(result):
+        """World (l, t, r, b) of the obstacle in *result* (one tile for tile grids)."""
+        col = result.collider
+        if col.is_tile_grid:
+            return result.rect
+        gx, gy = col.get_global_position()
+        return (gx, gy, gx + col.width * col.scale_x, gy + col.height * col.scale_y)
+
+    def _snap_to_obstacle(self, body, result, dx, snap_sep):
+        """Snap body flush against the obstacle hit in *result* on X axis."""
         bpgx = 0.0
         if body.parent and isinstance(body.parent, Node2D):
             bpgx, _ = body.parent.get_global_position()
 
-        ogx, _ = obstacle_collider.get_global_position()
-        osw = obstacle_collider.width * obstacle_collider.scale_x
+        ogx, _, o_right, _ = self._hit_bounds(result)
+        osw = o_right - ogx
         bsw = body.collider.width * body.collider.scale_x
 
         if dx > 0:
@@ -137,17 +156,17 @@ class PhysicsBody2D(Node2D):
                     return True
                 else:
                     # Still blocked — snap to whatever is there
-                    self._snap_to_obstacle(target, result2.collider, dx, self.SNAP_SEP)
+                    self._snap_to_obstacle(target, result2, dx, self.SNAP_SEP)
                     target.on_pushed(pusher)
                     return True
             else:
                 # Chain blocked — snap target to the immovable obstacle
-                self._snap_to_obstacle(target, result.collider, dx, self.SNAP_SEP)
+                self._snap_to_obstacle(target, result, dx, self.SNAP_SEP)
                 target.on_pushed(pusher)
                 return True
         else:
             # Blocked by a wall or non-pushable — snap to it
-            self._snap_to_obstacle(target, result.collider, dx, self.SNAP_SEP)
+            self._snap_to_obstacle(target, result, dx, self.SNAP_SEP)
             target.on_pushed(pusher)
             return True
 
@@ -165,6 +184,10 @@ class PhysicsBody2D(Node2D):
         if self.parent and isinstance(self.parent, Node2D):
             pgx, pgy = self.parent.get_global_position()
 
+        # One broadphase query over the whole motion serves both axes
+        if dx != 0 or dy != 0:
+            self.collision_world.swept_candidates(self.collider, dx, dy)
+
         # --- X axis ---
         if dx != 0:
             target_lx = self.local_x + dx
@@ -191,8 +214,8 @@ class PhysicsBody2D(Node2D):
                         self.local_x = ogx + osw - self.collider.local_x - pgx + self.SNAP_SEP
                 else:
                     # Standard wall snap
-                    ogx, _ = result.collider.get_global_position()
-                    osw = result.collider.width * result.collider.scale_x
+                    ogx, _, o_right, _ = self._hit_bounds(result)
+                    osw = o_right - ogx
                     sw = self.collider.width * self.collider.scale_x
                     if dx > 0:
                         self.local_x = ogx - sw - self.collider.local_x - pgx - self.SNAP_SEP
@@ -211,9 +234,7 @@ class PhysicsBody2D(Node2D):
             if not result.collided:
                 self.local_y = target_ly
             else:
-                ogy = result.collider.get_global_position()[1]
-                osh = result.collider.height * result.collider.scale_y
-                other_top, other_bottom = ogy, ogy + osh
+                _, other_top, _, other_bottom = self._hit_bounds(result)
 
                 sh = self.collider.height * self.collider.scale_y
                 if dy > 0:
@@ -227,6 +248,45 @@ class PhysicsBody2D(Node2D):
         if dx != 0 or dy != 0:
             self._refresh_collider_cache(self)
 
+    def move_and_sweep(self, dx, dy):
+        """
+        Continuous variant of move_and_collide: one swept-AABB query per
+        slide finds the earliest hit along (dx, dy), so fast bodies cannot
+        tunnel through thin colliders.  On impact the body stops just short
+        of the surface, velocity on the hit axis is zeroed and the rest of
+        the motion slides along the other axis.  Pushing is not applied.
+        """
+        if dx == 0 and dy == 0:
+            return
+
+        world = self.collision_world
+        for _ in range(self.MAX_SWEEP_SLIDES):
+            result = world.sweep(self.collider, dx, dy)
+            if not result.collided:
+                self.local_x += dx
+                self.local_y += dy
+                self.update_transforms()
+                break
+
+            # Advance to the contact point, backed off by SNAP_SEP
+            t = result.time
+            self.local_x += dx * t + result.normal_x * self.SNAP_SEP
+            self.local_y += dy * t + result.normal_y * self.SNAP_SEP
+            self.update_transforms()
+
+            # Slide: keep the remaining motion along the free axis only
+            remaining = 1.0 - t
+            if result.normal_x != 0.0:
+                self.velocity_x = 0.0
+                dx, dy = 0.0, dy * remaining
+            else:
+                self.velocity_y = 0.0
+                dx, dy = dx * remaining, 0.0
+            if dx == 0 and dy == 0:
+                break
+
+        self._refresh_collider_cache(self)
+
     # ------------------------------------------------------------------
     # Impulse
     # ------------------------------------------------------------------
@@ -238,14 +298,19 @@ class PhysicsBody2D(Node2D):
 
     # ------------------------------------------------------------------
     # Collision & push event hooks (override in subclasses)
+    # Un-overridden hooks are skipped by CollisionWorld's dispatch, so
+    # on_collision_stay costs nothing unless a subclass implements it.
     # ------------------------------------------------------------------
 
+    @collision_noop
     def on_collision_enter(self, other):
         pass
 
+    @collision_noop
     def on_collision_stay(self, other):
         pass
 
+    @collision_noop
     def on_collision_exit(self, other):
         pass
 
@@ -1,6 +1,13 @@
+import math
+import warnings
+
 from src.pyengine2D.scene.node2d import Node2D
-from src.pyengine2D.physics.rigid_body_2d import RigidBody2D
+from src.pyengine2D.physics.rigid_body_2d import RigidBody2D, _bounds
 from src.pyengine2D.physics.distance_constraint import DistanceConstraint
+from src.pyengine2D.physics.body_store import BodyStore
+from src.pyengine2D.physics.contact_solver import ContactSolver
+from src.pyengine2D.physics.joint_2d import Joint2D
+from src.pyengine2D.physics.joint_store import JointStore
 
 class PhysicsWorld2D(Node2D):
     """
@@ -8,45 +15,250 @@ class PhysicsWorld2D(Node2D):
     Passes execution to the bodies to query the central CollisionWorld natively.
 
     Performance notes:
+        - Bodies and constraints are tracked as they are added to or
+          removed from this node, and the SpatialHash is only touched
+          for bodies that change cells, so an idle frame does no
+          per-child bookkeeping.
         - CollisionWorld._refresh_collider_cache() and _refresh_rect_cache()
           run ONCE per frame inside CollisionWorld.update(), which the scene
-          tree calls before PhysicsWorld2D.update().  We do NOT repeat that
-          expensive walk here.  Inside substeps, each RigidBody2D.solve_collisions()
-          patches its own _cached_rects entry (lightweight O(1) per body).
+          tree calls before PhysicsWorld2D.update().  The collider list is
+          maintained by add_child/remove_child hooks, so we never walk the
+          tree here.
+        - Body-vs-body contacts come straight from the SpatialHash and each
+          pair is solved once per substep (RigidBody2D.solve_pair).  The
+          hash cells are sized to the bodies' colliders, and pairs whose
+          bounds do not overlap are rejected before the narrow-phase.  Static
+          geometry goes through CollisionWorld.query_overlap_all with this
+          world's bodies ignored; each body's swept candidate query is
+          primed once per frame, so substeps reuse it.
+        - Bodies with ``can_sleep`` set fall asleep at rest as islands
+          (groups linked by contact this frame) and are skipped by
+          integration, constraints and collision queries until something
+          wakes them: a force, an awake body's contact, a velocity
+          assigned directly, or anything the CollisionWorld saw move
+          against them (CollisionWorld.disturbed_by), including geometry
+          that moved away or was removed.
         - update_transforms() is called ONCE at the end of each substep
           (after integration + collision solve + constraints) to keep the
           dirty-transform cache synchronised for the next substep.
+        - With ``vectorized=True`` (needs NumPy) body state is copied into
+          a BodyStore once per frame and every substep runs on its
+          arrays: integration in one array operation, DistanceConstraints
+          in batches, and body-vs-body contacts through a sort-and-sweep
+          over the bodies' bounds followed by the same sequential
+          response as the node loop.  The nodes are written once, at the
+          end of the frame, so a cradle or a pile of bodies runs several
+          times faster than the per-body loop once it has a few dozen
+          bodies (below that NumPy's call overhead dominates).  Static
+          geometry and the ContactSolver are solved on the nodes: a body
+          within reach of a collider outside this world hands the rest
+          of the frame to the node stages, with the store pushed and
+          pulled around every substep.
+        - With ``velocity_iterations > 0`` contacts go through a
+          ContactSolver instead of the one-shot positional push: contacts
+          persist between steps and are warm started, and each step
+          runs that many velocity passes over them.  A pass costs a few
+          multiplications per contact, far less than a full substep, so
+          stacks and cradles stay stable at ``sub_steps=1`` or ``2``.
+        - Joint2Ds (distance, spring and pin joints between two bodies)
+          are batched into a JointStore whenever membership changes and
+          relaxed once per substep with ``joint_iterations`` coloured
+          Gauss-Seidel sweeps of array operations, so a long chain costs
+          a few NumPy calls per sweep instead of one Python call per link.
+          In vectorized worlds without node-level solvers the sweeps run
+          on the BodyStore arrays and never touch the nodes.
+        - With ``adaptive_sub_steps=True`` ``sub_steps`` is only the upper
+          bound: each frame runs just enough substeps (at least
+          ``min_sub_steps``) that the fastest awake body moves no more
+          than ``max_travel`` times the smallest collider's size per
+          substep.  A world at rest pays for one.  Worlds whose awake
+          bodies hang on constraints or joints, or touched each other in
+          the last frame, keep the full count: those solvers need the
+          passes however slowly the bodies move.  The count used is kept
+          in ``last_sub_steps`` and tracked as ``physics.sub_steps`` on
+          ``profiler`` (or the running Engine's).
     """
-    def __init__(self, name="PhysicsWorld2D", gravity_y=800.0, sub_steps=4):
+    def __init__(self, name="PhysicsWorld2D", gravity_y=800.0, sub_steps=4, vectorized=False,
+                 velocity_iterations=0, joint_iterations=4, adaptive_sub_steps=False,
+                 min_sub_steps=1, max_travel=0.1):
         super().__init__(name)
         self.gravity_y = gravity_y
         self.sub_steps = sub_steps
+        self.adaptive_sub_steps = adaptive_sub_steps
+        self.min_sub_steps = min_sub_steps
+        self.max_travel = max_travel
+        self.last_sub_steps = sub_steps
+        self.profiler = None
+        self._min_extent = 0.0  # smallest collider size among the bodies
+        self._last_sdt = 0.0
+        self.velocity_iterations = velocity_iterations
+        self._contact_solver = ContactSolver(velocity_iterations) if velocity_iterations > 0 else None
+        self.joint_iterations = joint_iterations
+        self._joint_store = JointStore() if JointStore.available else None
+
+        if vectorized and not BodyStore.available:
+            warnings.warn(
+                "PhysicsWorld2D(vectorized=True) needs NumPy; falling back to per-body integration.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            vectorized = False
+        self.vectorized = vectorized
+        self._store = BodyStore() if vectorized else None
 
+        # Ordered sets fed by add_child / remove_child; the flat lists
+        # below are rebuilt from them only when membership changed.
+        self._bodies = {}
+        self._constraints = {}
+        self._joints = {}
+        self._members_changed = False
         self.bodies = []
         self.constraints = []
+        self.joints = []
+        self._body_index = {}  # body -> position in self.bodies (pair order)
+        self._member_colliders = {}
+        self._contacts = {}  # (body, body) pairs that touched this frame
+        self._touching = False  # whether any did last frame
 
         from src.pyengine2D.physics.spatial_hash import SpatialHash
         self.spatial_hash = SpatialHash(cell_size=128)
 
+    def add_child(self, child):
+        super().add_child(child)
+        if isinstance(child, RigidBody2D):
+            self._bodies[child] = None
+            if getattr(child, "collider", None) is not None:
+                self.spatial_hash.register(child)
+            self._members_changed = True
+        elif isinstance(child, DistanceConstraint):
+            self._constraints[child] = None
+            self._members_changed = True
+        elif isinstance(child, Joint2D):
+            self._joints[child] = None
+            self._members_changed = True
+
+    def remove_child(self, child):
+        super().remove_child(child)
+        if child in self._bodies:
+            del self._bodies[child]
+            self.spatial_hash.remove(child)
+            self._members_changed = True
+        elif child in self._constraints:
+            del self._constraints[child]
+            self._members_changed = True
+        elif child in self._joints:
+            del self._joints[child]
+            self._members_changed = True
+
+    def _refresh_members(self):
+        """Rebuild the flat member lists and joint batch, only if membership changed."""
+        if self._members_changed:
+            self.bodies = list(self._bodies)
+            self.constraints = list(self._constraints)
+            self.joints = list(self._joints)
+            if self._joint_store is not None:
+                self._joint_store.load(self.joints, self._joint_rows())
+            self._body_index = {b: i for i, b in enumerate(self.bodies)}
+            self._members_changed = False
+            self._fit_hash()
+
+    def _joint_rows(self):
+        """
+        Body rows for the JointStore: vectorized worlds share the
+        BodyStore's row order so the joints can be relaxed directly on
+        its arrays.
+        """
+        return self.bodies if self._store is not None else None
+
+    def _fit_hash(self):
+        """
+        Size the SpatialHash cells to twice the largest collider reach
+        from a body's origin: any two overlapping bodies then sit in
+        neighbouring cells, and cells stay as small as the bodies allow
+        so a 3x3 neighbourhood holds few of them.  Re-buckets all bodies
+        when the size changes.  Also records the smallest collider size
+        for adaptive sub-steps.
+        """
+        size = 0
+        min_extent = 0.0
+        for body in self.bodies:
+            col = body.collider
+            if col is None:
+                continue
+            gx, gy = body.get_global_position()
+            l, t, r, b = _bounds(col)
+            extent = min(r - l, b - t)
+            if extent > 0.0 and (min_extent == 0.0 or extent < min_extent):
+                min_extent = extent
+            size = max(size, math.ceil(2.0 * max(abs(l - gx), abs(r - gx), abs(t - gy), abs(b - gy))))
+        self._min_extent = min_extent
+        if size <= 0 or size == self.spatial_hash.cell_size:
+            return
+        from src.pyengine2D.physics.spatial_hash import SpatialHash
+        self.spatial_hash = SpatialHash(cell_size=size)
+        for other in self._bodies:
+            if getattr(other, "collider", None) is not None:
+                self.spatial_hash.register(other)
+
+    def _collider_bounds(self):
+        """World bounds of every body with a collider, for the pair loops' AABB reject."""
+        return {b: _bounds(b.collider) for b in self.bodies if b.collider is not None}
+
+    def _sync_bodies(self):
+        """Flush awake bodies' transforms; re-bucket those with a collider."""
+        register = self.spatial_hash.register
+        for b in self.bodies:
+            if b.sleeping: continue
+            b.update_transforms()
+            if b.collider is not None:
+                register(b)
+
+    def _prime_static_queries(self, delta):
+        """
+        Once per frame: collect the member colliders the static query
+        must ignore and warm each dynamic body's candidate cache with its
+        swept motion for the whole frame (vectorized worlds without a
+        ContactSolver make those queries in _static_zones()).
+        """
+        ignore = {}
+        for b in self.bodies:
+            if b.collider is not None:
+                ignore[b.collider] = None
+        self._member_colliders = ignore
+        if self._store is not None and self._contact_solver is None:
+            return
+        for b in self.bodies:
+            col = b.collider
+            if col is None or b.is_kinematic or b.sleeping or b.collision_world is None:
+                continue
+            b.collision_world.swept_candidates(col, b.vx * delta, b.vy * delta)
+
     def update(self, delta):
         # --- Per-frame setup (runs once, NOT per substep) ---
-        self.bodies.clear()
-        self.constraints.clear()
+        self._refresh_members()
+        if self._joint_store is not None and self.joints:
+            # Joint parameters and anchors may have changed since the load
+            self._joint_store.sync(self.joints, self._joint_rows())
+        self._wake_disturbed()
+        self._prime_static_queries(delta)
+        self._touching = bool(self._contacts)
+        self._contacts = {}
 
-        for child in self.children:
-            if isinstance(child, RigidBody2D):
-                self.bodies.append(child)
-                self.spatial_hash.register(child)
-            elif isinstance(child, DistanceConstraint):
-                self.constraints.append(child)
+        if self._store is not None:
+            self._update_vectorized(delta)
+            self._update_sleep(delta)
+            super().update(delta)
+            return
 
-        sdt = delta / max(1, self.sub_steps)
+        steps = self._begin_steps(delta, self._max_speed(delta) if self.adaptive_sub_steps else 0.0)
+        sdt = delta / steps
 
-        for _ in range(self.sub_steps):
+        solver = self._contact_solver
+        for _ in range(steps):
 
             # 1. Integrate Forces & Gravity
             for b in self.bodies:
-                if b.is_kinematic: continue
+                if b.is_kinematic or b.sleeping: continue
 
                 if b.use_gravity:
                     b.vy += self.gravity_y * b.gravity_scale * sdt
@@ -54,34 +266,432 @@ class PhysicsWorld2D(Node2D):
                 b.vx += (b.force_x * b.inv_mass) * sdt
                 b.vy += (b.force_y * b.inv_mass) * sdt
 
-                b.local_x += b.vx * sdt
-                b.local_y += b.vy * sdt
+                if solver is None:
+                    b.local_x += b.vx * sdt
+                    b.local_y += b.vy * sdt
 
                 b.clear_forces()
 
+            if solver is not None:
+                self._solve_contacts(sdt)
+                continue
+
             # Sync transforms & spatial hash ONCE after all bodies moved
-            for b in self.bodies:
-                b.update_transforms()
-                self.spatial_hash.register(b)
+            self._sync_bodies()
+
+            self._solve_substep(sdt)
+
+        self._update_sleep(delta)
+        super().update(delta)
+
+    def _max_speed(self, delta):
+        """Fastest awake body's speed by the end of the frame (gravity included)."""
+        g = abs(self.gravity_y) * delta
+        top = 0.0
+        for b in self.bodies:
+            if b.is_kinematic or b.sleeping: continue
+            speed = math.hypot(b.vx, b.vy)
+            if b.use_gravity:
+                speed += g * abs(b.gravity_scale)
+            if speed > top:
+                top = speed
+        return top
+
+    def _begin_steps(self, delta, max_speed):
+        """
+        Pick this frame's substep count, report it to the profiler and
+        rescale warm-start impulses if the substep length changed.
+        """
+        steps = max(1, self.sub_steps)
+        if self.adaptive_sub_steps and not self._coupled():
+            travel = self.max_travel * self._min_extent
+            low = max(1, min(self.min_sub_steps, steps))
+            if travel > 0.0:
+                steps = min(steps, max(low, math.ceil(max_speed * delta / travel)))
+            else:
+                steps = low
+        self.last_sub_steps = steps
+
+        sdt = delta / steps
+        if self._contact_solver is not None and self._last_sdt and sdt != self._last_sdt:
+            self._contact_solver.rescale(sdt / self._last_sdt)
+        self._last_sdt = sdt
 
-            # 2. Constraints (Ropes, Springs, Joints)
-            for c in self.constraints:
+        profiler = self._active_profiler()
+        if profiler is not None:
+            profiler.track("physics.sub_steps", steps)
+        return steps
+
+    def _coupled(self):
+        """
+        True while awake bodies hang on constraints or joints, or touched
+        each other last frame.  Those position solvers converge with the
+        number of passes rather than with how far the bodies travel, so
+        adaptive sub-stepping keeps the full count for them.
+        """
+        if self._touching:
+            return True
+        for c in self.constraints:
+            if not c.body_a.sleeping:
+                return True
+        for j in self.joints:
+            a, b = j.body_a, j.body_b
+            if a is not None and not (a.sleeping and (b is None or b.sleeping)):
+                return True
+        return False
+
+    def _active_profiler(self):
+        """This world's profiler, else the running Engine's, else None."""
+        if self.profiler is not None:
+            return self.profiler
+        from src.pyengine2D.core.engine import Engine
+        return Engine.instance.profiler if Engine.instance else None
+
+    def _solve_substep(self, sdt):
+        """Node-level solvers: constraints, collisions, constraints, transform sync."""
+        # 2. Constraints (Ropes, Springs, Joints)
+        for c in self.constraints:
+            if not c.body_a.sleeping:
                 c.solve()
 
-            # 3. Collision Solving using engine CollisionWorld + Spatial Hash
-            processed_pairs = set()
-            for b in self.bodies:
-                if not b.is_kinematic:
-                    candidates = self.spatial_hash.query_nearby(b)
-                    b.solve_collisions(sdt, processed_pairs, spatial_hash_candidates=candidates)
+        # 3a. Body pairs from the Spatial Hash, each solved once.  Only
+        #     awake bodies query; a sleeping neighbour is always theirs.
+        #     Pairs whose bounds do not overlap are rejected before the
+        #     narrow-phase; a solved pair refreshes both bounds.
+        bodies = self.bodies
+        index = self._body_index
+        contacts = self._contacts
+        solve_pair = RigidBody2D.solve_pair
+        bounds = self._collider_bounds()
+        for i, b in enumerate(bodies):
+            if b.sleeping or b not in bounds:
+                continue
+            l, t, r, bt = bounds[b]
+            for other in self.spatial_hash.query_nearby(b):
+                if not (other.sleeping or index[other] > i):
+                    continue
+                box = bounds.get(other)
+                if box is None or box[0] >= r or box[2] <= l or box[1] >= bt or box[3] <= t:
+                    continue
+                if solve_pair(b, other):
+                    contacts[(b, other)] = None
+                    bounds[other] = _bounds(other.collider)
+                    l, t, r, bt = bounds[b] = _bounds(b.collider)
+
+        self._finish_substep(sdt)
+
+    def _finish_substep(self, sdt):
+        """Static geometry, constraints again, joints and the transform sync."""
+        bodies = self.bodies
 
-            # 4. Re-solve constraints to ensure lengths aren't stretched
-            for c in self.constraints:
+        # 3b. Static geometry through the engine CollisionWorld
+        ignore = self._member_colliders
+        for b in bodies:
+            if not (b.is_kinematic or b.sleeping):
+                b.solve_static(ignore)
+
+        # 4. Re-solve constraints to ensure lengths aren't stretched
+        for c in self.constraints:
+            if not c.body_a.sleeping:
                 c.solve()
 
-            # 5. Single end-of-substep transform sync
-            for b in self.bodies:
-                b.update_transforms()
+        # 4b. Joints between bodies, batched
+        self._solve_joints(sdt)
 
-        super().update(delta)
+        # 5. Single end-of-substep transform sync
+        for b in self.bodies:
+            b.update_transforms()
+
+    def _solve_contacts(self, sdt):
+        """
+        Sequential-impulse substep (velocities already integrated):
+        gather contacts at the current positions, solve velocities,
+        integrate positions, correct penetration, then constraints.
+        """
+        solver = self._contact_solver
+        bodies = self.bodies
+        self._sync_bodies()
+
+        solver.begin()
+        index = self._body_index
+        contacts = self._contacts
+        pair_contact = RigidBody2D.pair_contact
+        bounds = self._collider_bounds()
+        for i, b in enumerate(bodies):
+            if b.sleeping or b not in bounds:
+                continue
+            l, t, r, bt = bounds[b]
+            for other in self.spatial_hash.query_nearby(b):
+                if not (other.sleeping or index[other] > i):
+                    continue
+                box = bounds.get(other)
+                if box is None or box[0] >= r or box[2] <= l or box[1] >= bt or box[3] <= t:
+                    continue
+                contact = pair_contact(b, other)
+                if contact is not None:
+                    contacts[(b, other)] = None
+                    solver.add((b, other), b, other, *contact,
+                               b.restitution * other.restitution)
+
+        ignore = self._member_colliders
+        for b in bodies:
+            if b.is_kinematic or b.sleeping:
+                continue
+            for result in b.static_contacts(ignore):
+                hit_col = result.collider
+                hit_body = hit_col.parent
+                key = (b, hit_col, result.rect) if hit_col.is_tile_grid else (b, hit_col)
+                if isinstance(hit_body, RigidBody2D):
+                    solver.add(key, b, hit_body, result.normal_x, result.normal_y,
+                               result.penetration, b.restitution * hit_body.restitution)
+                else:
+                    vx = getattr(hit_body, "velocity_x", 0.0)
+                    vy = getattr(hit_body, "velocity_y", 0.0)
+                    solver.add(key, b, None, result.normal_x, result.normal_y,
+                               result.penetration, b.restitution * 0.5, vx, vy)
+
+        solver.solve()
+
+        for b in bodies:
+            if b.is_kinematic or b.sleeping: continue
+            b.local_x += b.vx * sdt
+            b.local_y += b.vy * sdt
+
+        solver.correct(sdt)
+
+        for c in self.constraints:
+            if not c.body_a.sleeping:
+                c.solve()
+        self._solve_joints(sdt)
+
+        for b in bodies:
+            b.update_transforms()
+
+    def _solve_joints(self, sdt):
+        """
+        Relax every joint: ``joint_iterations`` position sweeps, the net
+        correction fed back into the velocities, then one damping sweep.
+        Skipped while every linked body sleeps.
+        """
+        if not self.joints:
+            return
+        store = self._joint_store
+        if store is not None:
+            store.solve(self.joint_iterations, sdt)
+            return
+
+        joints = [j for j in self.joints if j.body_a is not None
+                  and not (j.body_a.sleeping and (j.body_b is None or j.body_b.sleeping))]
+        start = {}
+        for j in joints:
+            for b in (j.body_a, j.body_b):
+                if b is not None and b not in start:
+                    start[b] = (b._local_x, b._local_y)
+        for _ in range(self.joint_iterations):
+            for j in joints:
+                j.project()
+        for b, (x, y) in start.items():
+            b.vx += (b._local_x - x) / sdt
+            b.vy += (b._local_y - y) / sdt
+        for j in joints:
+            j.damp()
+
+    def _wake_disturbed(self):
+        """
+        Wake the island of every sleeping body that game code gave a
+        velocity (sleep() zeroes it, so any non-zero vx/vy was assigned
+        since) or that something else moved against in the
+        CollisionWorld's last pair pass: a platform or PhysicsBody2D
+        pushing into it, the floor under it moving away or being
+        removed.  Sleeping bodies never run static queries, so this is
+        how they notice.  Bodies of islands that are asleep themselves
+        do not count, which ignores the last settling motion of a
+        freshly slept island.
+        """
+        for b in self.bodies:
+            if not b.sleeping:
+                continue
+            if b.vx or b.vy:
+                b.wake()
+                continue
+            col, world = b.collider, b.collision_world
+            if col is None or world is None:
+                continue
+            for other in world.disturbed_by(col):
+                if other is not None:
+                    body = other.parent
+                    if isinstance(body, RigidBody2D) and body.sleeping:
+                        continue
+                b.wake()
+                break
+
+    def _update_sleep(self, delta):
+        """
+        End of frame: count the frames each body moved less than
+        SLEEP_SPEED and put every island whose bodies have all rested for
+        SLEEP_FRAMES to sleep at once.  Islands are the dynamic bodies
+        joined by this frame's contacts and by joints, so a settled stack
+        sleeps (and later wakes) as a whole.
+        """
+        ready = False
+        for b in self.bodies:
+            if b.is_kinematic:
+                if b.sleeping:
+                    b.wake()
+                continue
+            if b.sleeping:
+                continue
+            # Rest is judged on the distance moved this frame, which is
+            # what the position solver actually settles (a body resting on
+            # another still carries the last substep's gravity in vy).
+            pos = (b._local_x, b._local_y)
+            last, b._rest_pos = b._rest_pos, pos
+            limit = b.SLEEP_SPEED * delta
+            if (b.can_sleep and last is not None
+                    and (pos[0] - last[0]) ** 2 + (pos[1] - last[1]) ** 2 < limit * limit):
+                b._rest_frames += 1
+                if b._rest_frames >= b.SLEEP_FRAMES:
+                    ready = True
+            else:
+                b._rest_frames = 0
+        if not ready:
+            return
+
+        # Union-find over body indices
+        index = self._body_index
+        parent = list(range(len(self.bodies)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        links = list(self._contacts)
+        links.extend((j.body_a, j.body_b) for j in self.joints)
+        for a, b in links:
+            if a not in index or b not in index or a.is_kinematic or b.is_kinematic:
+                continue
+            ra, rb = find(index[a]), find(index[b])
+            if ra != rb:
+                parent[ra] = rb
+
+        islands = {}
+        for i, b in enumerate(self.bodies):
+            if not (b.is_kinematic or b.sleeping):
+                islands.setdefault(find(i), []).append(b)
+        for island in islands.values():
+            if all(b._rest_frames >= b.SLEEP_FRAMES for b in island):
+                for b in island:
+                    b.sleep(island)
+
+    def _update_vectorized(self, delta):
+        """
+        Sub-step loop over the BodyStore arrays.  Integration,
+        DistanceConstraints, body-vs-body contacts and joints all run on
+        the arrays and the nodes are written once, at the end of the
+        frame.  The node-level stages take over (with the store pushed
+        and pulled around every substep) under a ContactSolver, with
+        constraints on bodies outside this world, and for the rest of the
+        frame once a body is within reach of geometry that is not one of
+        this world's bodies (_static_zones()).
+        """
+        store = self._store
+        store.load(self.bodies)
+        speed = store.max_speed(self.gravity_y * delta) if self.adaptive_sub_steps else 0.0
+        steps = self._begin_steps(delta, speed)
+        sdt = delta / steps
+
+        solver = self._contact_solver
+        zones = self._static_zones(delta) if solver is None else None
+        array_stages = zones is not None and store.load_constraints(self.constraints)
+        if array_stages:
+            store.set_zones(zones)
+            reach = self._pair_reach()
+
+        joints = self._joint_store if self.joints else None
+        if joints is not None and array_stages:
+            batches = joints.awake_batches()
+
+        for _ in range(steps):
+            store.integrate(sdt, self.gravity_y, positions=solver is None)
+            if array_stages:
+                store.solve_constraints()
+                touching, woken = store.solve_pairs(reach)
+                self._record_store_contacts(touching, woken)
+                if woken and joints is not None:
+                    batches = joints.awake_batches()
+                if store.in_zones():
+                    store.solve_constraints()
+                    if joints is not None:
+                        joints.relax(store.pos, store.vel, self.joint_iterations, sdt, batches)
+                    continue
+                # Within reach of outside geometry: finish this substep
+                # and the rest of the frame on the nodes
+                array_stages = False
+                store.push()
+                self._sync_bodies()
+                self._finish_substep(sdt)
+                store.pull()
+                continue
+            store.push()
+            if solver is not None:
+                self._solve_contacts(sdt)
+                store.pull()
+                continue
+            self._sync_bodies()
+            self._solve_substep(sdt)
+            store.pull()
+
+        store.push()
+        self._sync_bodies()
+
+    def _static_zones(self, delta):
+        """
+        Per body, the rect its collider can move in this frame without
+        meeting a collider outside this world: the padded swept rect the
+        static stage's candidate query covers (infinite for bodies the
+        static stage skips, the exact bounds while asleep).  None if some
+        awake body already has such a collider among its candidates.
+        """
+        inf = float('inf')
+        free = (-inf, -inf, inf, inf)
+        ignore = self._member_colliders
+        zones = []
+        for b in self.bodies:
+            col, world = b.collider, b.collision_world
+            if col is None or world is None or b.is_kinematic:
+                zones.append(free)
+                continue
+            if b.sleeping:
+                zones.append(_bounds(col))
+                continue
+            mask = col.mask_bits
+            for other in world.swept_candidates(col, b.vx * delta, b.vy * delta):
+                if other not in ignore and not other.is_trigger and other.layer_bits & mask:
+                    return None
+            zones.append(world.candidate_rect(col))
+        return zones
+
+    def _pair_reach(self):
+        """
+        How far apart two shapes may start a contact stage and still be
+        tested: the largest collider size, so a body pushed along by an
+        earlier pair still meets its next neighbour in the same pass.
+        """
+        store = self._store
+        if not len(store.shape_offset):
+            return 0.0
+        o = store.shape_offset
+        return float(max((o[:, 2] - o[:, 0]).max(), (o[:, 3] - o[:, 1]).max()))
 
+    def _record_store_contacts(self, touching, woken):
+        """Note the BodyStore's touching rows as contacts; wake what they touched."""
+        bodies = self.bodies
+        contacts = self._contacts
+        for a, b in touching:
+            contacts[(bodies[a], bodies[b])] = None
+        if woken:
+            for row in woken:
+                bodies[row].wake()
+            self._store.refresh_awake()
@@ -1,3 +1,5 @@
+import math
+
 from src.pyengine2D.scene.node2d import Node2D
 from src.pyengine2D.collision.collider2d import Collider2D
 from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
@@ -7,7 +9,20 @@ class RigidBody2D(Node2D):
     Advanced Physics Body for sub-stepped physics simulation.
     Seamlessly integrates with PyEngine 2D CollisionWorld.
     Supports mass, restitution, continuous integration, and kinematic modes.
+
+    With ``can_sleep = True`` (off by default), a dynamic body that
+    moves slower than SLEEP_SPEED for SLEEP_FRAMES frames is put to sleep
+    by its PhysicsWorld2D together with every body it touches (its
+    island).  Sleeping bodies are not integrated, solved or queried.
+    apply_force(), apply_impulse(), overlapping contact from an awake
+    body, colliders that move against (or away from, or are removed from
+    under) a sleeping body and a non-zero vx/vy assigned while it sleeps
+    wake the whole island; code that teleports a sleeping body should
+    call wake().
     """
+    SLEEP_SPEED = 5.0   # px/s
+    SLEEP_FRAMES = 30
+
     def __init__(self, name, x=0, y=0, collider: Collider2D = None, collision_world=None, mass=1.0, is_kinematic=False):
         super().__init__(name, x, y)
         self.collider = collider
@@ -28,138 +43,274 @@ class RigidBody2D(Node2D):
         self.gravity_scale = 1.0
         self.is_kinematic = is_kinematic
 
+        self.can_sleep = False
+        self.sleeping = False
+        self._rest_frames = 0
+        self._rest_pos = None  # position at the last rest check
+        self._island = None    # bodies that fell asleep together
+
     def apply_force(self, fx, fy):
         if self.is_kinematic: return
+        if fx or fy:
+            self.wake()
         self.force_x += fx
         self.force_y += fy
+
+    def apply_impulse(self, jx, jy):
+        """Instant velocity change of (jx, jy) * inv_mass."""
+        if self.is_kinematic: return
+        self.wake()
+        self.vx += jx * self.inv_mass
+        self.vy += jy * self.inv_mass
+
+    def sleep(self, island=None):
+        """Freeze this body; *island* is the group that must wake with it."""
+        self.sleeping = True
+        self.vx = 0.0
+        self.vy = 0.0
+        self.clear_forces()
+        self._rest_frames = 0
+        self._island = island
+
+    def wake(self):
+        """Wake this body and the island it fell asleep with."""
+        self._rest_frames = 0
+        if not self.sleeping:
+            return
+        for b in self._island or (self,):
+            b.sleeping = False
+            b._rest_frames = 0
+            b._rest_pos = None
+            b._island = None
         
     def clear_forces(self):
         self.force_x = 0.0
         self.force_y = 0.0
 
-    def solve_collisions(self, sdt, processed_pairs, spatial_hash_candidates=None):
+    # ------------------------------------------------------------------
+    # Collision response
+    # ------------------------------------------------------------------
+
+    def solve_static(self, ignore=None):
         """
-        Queries the central CollisionWorld for overlaps and applies elastic 
-        momentum transfer or positional hard-stops against other colliders. 
-        spatial_hash_candidates provides body-to-body quick lookups.
+        Resolve overlaps against the CollisionWorld's non-rigid geometry
+        (walls, tiles, PhysicsBody2Ds) at the current position.  Colliders
+        in *ignore* — the bodies of this body's PhysicsWorld2D, which are
+        solved pair-wise by solve_pair() — are skipped.  The world query
+        shares the per-frame candidate cache that PhysicsWorld2D primes
+        with each body's swept motion.
         """
-        if not self.collider or not self.collision_world:
+        results = self.static_contacts(ignore)
+        if not results:
             return
 
-        pgx, pgy = 0.0, 0.0
-        if self.parent and isinstance(self.parent, Node2D):
-            pgx, pgy = self.parent.get_global_position()
-
-        target_gx = pgx + self.local_x
-        target_gy = pgy + self.local_y
-
-        # FORCE CACHE UPDATE FOR SUB-STEPPING
-        # Because we are sub-stepping inside a single engine frame, the collision 
-        # world's grid/rect cache for this object is stale. We must update it!
-        if self.collider in self.collision_world._cached_colliders:
-            rect = self.collider.get_rect()
-            if isinstance(rect, tuple):
-                self.collision_world._cached_rects[self.collider] = rect
-            else:
-                self.collision_world._cached_rects[self.collider] = (rect.left, rect.top, rect.right, rect.bottom)
-                
-            # Note: We don't theoretically need to rebuild the entire UniformGrid, 
-            # because query_overlap_all creates a hypothetical test_rect anyway.
-            # We just need the _cached_rects to be accurate for bounding boxes.
-
-        # Query central engine CollisionWorld for ALL overlaps at current position
-        results = self.collision_world.query_overlap_all(self.collider, target_gx, target_gy)
-        
-        # Accumulators for simultaneous multi-body resolution
+        # Accumulators for simultaneous multi-contact resolution
         total_dx = 0.0
         total_dy = 0.0
         total_dvx = 0.0
         total_dvy = 0.0
-        
-        # We need to apply these to the hit bodies as well
-        hit_applications = [] # (hit_body, dx, dy, dvx, dvy)
+        hit_applications = []  # (hit_body, dx, dy, dvx, dvy)
 
         for result in results:
-            hit_col = result.collider
-            hit_body = hit_col.parent
-            
-            # Prevent double-processing (A hits B, then B hits A in the same pass)
-            if hit_body:
-                pair = tuple(sorted((id(self), id(hit_body))))
-                if pair in processed_pairs:
-                    continue
-                processed_pairs.add(pair)
-            
-            nx = result.normal_x
-            ny = result.normal_y
-            pen = result.penetration
-            
-            w1 = self.inv_mass
-            w2 = 0.0 # Default infinite mass for non-rigid bodies
-            
-            hit_is_rigid = isinstance(hit_body, RigidBody2D)
-            hit_is_physics = isinstance(hit_body, PhysicsBody2D)
-            
-            if hit_is_rigid:
-                w2 = hit_body.inv_mass
-                
-            sum_w = w1 + w2
-            if sum_w == 0.0: continue
-            
-            w1_ratio = w1 / sum_w
-            w2_ratio = w2 / sum_w
-
-            # Positional correction - MUST be 1.0 to fully separate objects, otherwise they overlap next frame and bleed momentum
-            relax = 1.0
-            total_dx += nx * (pen * w1_ratio * relax)
-            total_dy += ny * (pen * w1_ratio * relax)
-            
-            hdx, hdy, hdvx, hdvy = 0.0, 0.0, 0.0, 0.0
-            
-            if hit_is_rigid and not hit_body.is_kinematic:
-                hdx -= nx * (pen * w2_ratio * relax)
-                hdy -= ny * (pen * w2_ratio * relax)
-                
-            # Velocity/Momentum Transfer
-            v1n = self.vx * nx + self.vy * ny
-            v2n = 0.0
-            
-            if hit_is_rigid:
-                v2n = hit_body.vx * nx + hit_body.vy * ny
-            elif hit_is_physics:
-                # PhysicsBody2D isn't built for momentum transfer, but we can treat its velocity as immovable
-                v2n = hit_body.velocity_x * nx + hit_body.velocity_y * ny
-                
-            rel_v = v1n - v2n
-            if rel_v < 0:  # Converging
-                # Calculate combined restitution
-                e = self.restitution
-                if hit_is_rigid:
-                    e *= hit_body.restitution
-                else:
-                    e *= 0.5 # Default bounce against static walls
-                    
-                j_impulse = -(1.0 + e) * rel_v / sum_w
-                
-                # Apply the impulse vector scaled by each body's inverse mass
-                total_dvx += j_impulse * w1 * nx
-                total_dvy += j_impulse * w1 * ny
-                
-                if hit_is_rigid and not hit_body.is_kinematic:
-                    hdvx -= j_impulse * w2 * nx
-                    hdvy -= j_impulse * w2 * ny
-                    
-            if hit_is_rigid and not hit_body.is_kinematic:
+            hit_body = result.collider.parent
+            response = _respond(self, hit_body, result.normal_x, result.normal_y, result.penetration)
+            if response is None:
+                continue
+            dx, dy, dvx, dvy, hdx, hdy, hdvx, hdvy = response
+            total_dx += dx
+            total_dy += dy
+            total_dvx += dvx
+            total_dvy += dvy
+            if isinstance(hit_body, RigidBody2D) and not hit_body.is_kinematic:
                 hit_applications.append((hit_body, hdx, hdy, hdvx, hdvy))
-                
+
         # Apply accumulated changes simultaneously
         self.local_x += total_dx
         self.local_y += total_dy
         self.vx += total_dvx
         self.vy += total_dvy
-        
+
         for hb, hx, hy, hvx, hvy in hit_applications:
             hb.local_x += hx
             hb.local_y += hy
             hb.vx += hvx
             hb.vy += hvy
+
+    def static_contacts(self, ignore=None):
+        """CollisionResults for the static overlaps solve_static() resolves."""
+        if not self.collider or not self.collision_world:
+            return []
+
+        pgx, pgy = 0.0, 0.0
+        if self.parent and isinstance(self.parent, Node2D):
+            pgx, pgy = self.parent.get_global_position()
+
+        return self.collision_world.query_overlap_all(
+            self.collider, pgx + self.local_x, pgy + self.local_y, ignore=ignore
+        )
+
+    @staticmethod
+    def pair_contact(a, b):
+        """
+        Narrow-phase for one body-vs-body pair: (normal_x, normal_y,
+        penetration) pushing *a* out of *b*, or None.  A contact wakes
+        either body if it was asleep.
+        """
+        col_a, col_b = a.collider, b.collider
+        if not col_a or not col_b or col_a.is_trigger or col_b.is_trigger:
+            return None
+        if not (_sees(col_a, col_b) or _sees(col_b, col_a)):
+            return None
+        contact = _contact(col_a, col_b)
+        if contact is None:
+            return None
+        if a.sleeping:
+            a.wake()
+        if b.sleeping:
+            b.wake()
+        return contact
+
+    @staticmethod
+    def solve_pair(a, b):
+        """
+        Narrow-phase and response for one body-vs-body pair, applied to
+        both bodies at once.  Returns True if they were in contact.
+        """
+        contact = RigidBody2D.pair_contact(a, b)
+        if contact is None:
+            return False
+        response = _respond(a, b, *contact)
+        if response is None:
+            return True
+        dx, dy, dvx, dvy, hdx, hdy, hdvx, hdvy = response
+        if not a.is_kinematic:
+            a.local_x += dx
+            a.local_y += dy
+            a.vx += dvx
+            a.vy += dvy
+        if not b.is_kinematic:
+            b.local_x += hdx
+            b.local_y += hdy
+            b.vx += hdvx
+            b.vy += hdvy
+        return True
+
+
+def _sees(col, other):
+    """True if *col*'s mask includes *other*'s layer."""
+    return bool(other.layer_bits & col.mask_bits)
+
+
+def _bounds(col):
+    """World (l, t, r, b) of a collider from its live transform."""
+    res = col.get_rect()
+    if isinstance(res, tuple):
+        return res
+    return (res.left, res.top, res.right, res.bottom)
+
+
+def _contact(col_a, col_b):
+    """
+    (normal_x, normal_y, penetration) pushing *col_a* out of *col_b*, or
+    None.  Circles are exact against circles; every other pairing uses
+    the AABB minimum translation, like CollisionWorld.query_overlap_all.
+    """
+    al, at, ar, ab = _bounds(col_a)
+    bl, bt, br, bb = _bounds(col_b)
+    if al >= br or ar <= bl or at >= bb or ab <= bt:
+        return None
+
+    if hasattr(col_a, 'radius') and hasattr(col_b, 'radius'):
+        dx = (al + ar) * 0.5 - (bl + br) * 0.5
+        dy = (at + ab) * 0.5 - (bt + bb) * 0.5
+        dist = math.hypot(dx, dy)
+        r = col_a.radius * col_a.scale_x + col_b.radius * col_b.scale_x
+        if dist >= r or dist == 0.0:
+            return None
+        return dx / dist, dy / dist, r - dist
+
+    overlap_left = ar - bl
+    overlap_right = br - al
+    overlap_top = ab - bt
+    overlap_bottom = bb - at
+    if overlap_left < overlap_right:
+        pen_x, normal_x = overlap_left, -1.0
+    else:
+        pen_x, normal_x = overlap_right, 1.0
+    if overlap_top < overlap_bottom:
+        pen_y, normal_y = overlap_top, -1.0
+    else:
+        pen_y, normal_y = overlap_bottom, 1.0
+    if pen_x < pen_y:
+        return normal_x, 0.0, pen_x
+    return 0.0, normal_y, pen_y
+
+
+def _respond(body, hit_body, nx, ny, pen):
+    """
+    Positional correction and restitution impulse for *body* touching
+    *hit_body* along the normal (nx, ny) that pushes *body* out.
+
+    Returns (dx, dy, dvx, dvy) for *body* followed by the same four for
+    *hit_body* (zero unless it is a movable RigidBody2D), or None when
+    neither side can move.
+    """
+    w1 = body.inv_mass
+    w2 = 0.0  # Default infinite mass for non-rigid bodies
+
+    hit_is_rigid = isinstance(hit_body, RigidBody2D)
+    hit_is_physics = isinstance(hit_body, PhysicsBody2D)
+
+    if hit_is_rigid:
+        w2 = hit_body.inv_mass
+
+    sum_w = w1 + w2
+    if sum_w == 0.0:
+        return None
+
+    w1_ratio = w1 / sum_w
+    w2_ratio = w2 / sum_w
+
+    # Positional correction - MUST be 1.0 to fully separate objects, otherwise they overlap next frame and bleed momentum
+    relax = 1.0
+    dx = nx * (pen * w1_ratio * relax)
+    dy = ny * (pen * w1_ratio * relax)
+    dvx = dvy = 0.0
+
+    hdx, hdy, hdvx, hdvy = 0.0, 0.0, 0.0, 0.0
+    movable_hit = hit_is_rigid and not hit_body.is_kinematic
+
+    if movable_hit:
+        hdx -= nx * (pen * w2_ratio * relax)
+        hdy -= ny * (pen * w2_ratio * relax)
+
+    # Velocity/Momentum Transfer
+    v1n = body.vx * nx + body.vy * ny
+    v2n = 0.0
+
+    if hit_is_rigid:
+        v2n = hit_body.vx * nx + hit_body.vy * ny
+    elif hit_is_physics:
+        # PhysicsBody2D isn't built for momentum transfer, but we can treat its velocity as immovable
+        v2n = hit_body.velocity_x * nx + hit_body.velocity_y * ny
+
+    rel_v = v1n - v2n
+    if rel_v < 0:  # Converging
+        # Calculate combined restitution
+        e = body.restitution
+        if hit_is_rigid:
+            e *= hit_body.restitution
+        else:
+            e *= 0.5  # Default bounce against static walls
+
+        j_impulse = -(1.0 + e) * rel_v / sum_w
+
+        # Apply the impulse vector scaled by each body's inverse mass
+        dvx += j_impulse * w1 * nx
+        dvy += j_impulse * w1 * ny
+
+        if movable_hit:
+            hdvx -= j_impulse * w2 * nx
+            hdvy -= j_impulse * w2 * ny
+
+    return dx, dy, dvx, dvy, hdx, hdy, hdvx, hdvy
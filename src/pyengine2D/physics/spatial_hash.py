@@ -1,51 +1,69 @@
 class SpatialHash:
-    """Broadphase collision grid that updates incrementally."""
+    """
+    Broadphase collision grid that updates incrementally.
+
+    Buckets are dicts used as insertion-ordered sets, so moving a body
+    between cells or removing it is O(1) regardless of bucket size, and
+    query order stays deterministic.  Empty cells are dropped.
+    """
     def __init__(self, cell_size=128):
         self.cell_size = cell_size
-        self.grid = {}
-        self.body_cells = {}
+        self.grid = {}        # (cx, cy) -> {node: None}
+        self.body_cells = {}  # node -> (cx, cy)
 
     def register(self, node):
-        """Register or update a node's position in the grid."""
+        """
+        Register or update a node's position in the grid.
+        Returns True if the node changed cells (or was new).
+        """
         gx, gy = node.get_global_position()
         cell = (int(gx // self.cell_size), int(gy // self.cell_size))
-        
+
         old_cell = self.body_cells.get(node)
         if old_cell == cell:
-            return
-            
-        # Remove from old cell
-        if old_cell and old_cell in self.grid:
-            if node in self.grid[old_cell]:
-                self.grid[old_cell].remove(node)
-                
-        # Add to new cell
-        if cell not in self.grid:
-            self.grid[cell] = []
-        self.grid[cell].append(node)
+            return False
+
+        if old_cell is not None:
+            self._discard(node, old_cell)
+
+        bucket = self.grid.get(cell)
+        if bucket is None:
+            bucket = self.grid[cell] = {}
+        bucket[node] = None
         self.body_cells[node] = cell
+        return True
 
     def remove(self, node):
-        old_cell = self.body_cells.get(node)
-        if old_cell and old_cell in self.grid:
-            if node in self.grid[old_cell]:
-                self.grid[old_cell].remove(node)
-        if node in self.body_cells:
-            del self.body_cells[node]
+        """Forget *node* (no-op if it was never registered)."""
+        old_cell = self.body_cells.pop(node, None)
+        if old_cell is not None:
+            self._discard(node, old_cell)
+
+    def _discard(self, node, cell):
+        bucket = self.grid.get(cell)
+        if bucket is None:
+            return
+        bucket.pop(node, None)
+        if not bucket:
+            del self.grid[cell]
+
+    def __contains__(self, node):
+        return node in self.body_cells
 
     def query_nearby(self, node):
         """Returns all other nodes in the same or adjacent 8 cells."""
         cell = self.body_cells.get(node)
-        if not cell:
+        if cell is None:
             return []
-            
+
         cx, cy = cell
+        grid = self.grid
         results = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                c = (cx + dx, cy + dy)
-                if c in self.grid:
-                    for other in self.grid[c]:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                bucket = grid.get((cx + dx, cy + dy))
+                if bucket:
+                    for other in bucket:
                         if other is not node:
                             results.append(other)
         return results
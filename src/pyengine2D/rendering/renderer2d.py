@@ -5,6 +5,10 @@ Traverses the Node2D scene tree, applies frustum culling via Camera2D,
 respects the Dirty Transform System, sorts by z_index, delegates to each
 node's native render(), and optionally draws debug overlays.
 
+When given the previous global positions of the nodes the last fixed
+step moved (see Engine.interpolate_rendering), draw() shows those nodes
+``alpha`` of the way from there to where they are now.
+
 Usage::
 
     from src.pyengine2D.rendering.renderer2d import Renderer2D
@@ -87,6 +91,14 @@ class Renderer2D:
         Draw bounding boxes, node names, collision shapes, FPS & node count.
     culling_padding : int
         Extra pixel margin around the viewport for culling tolerance.
+
+    Attributes
+    ----------
+    previous_globals : dict | None
+        Node → global (x, y) before the last fixed step, for the nodes
+        that step moved.  ``None`` disables interpolation.
+    alpha : float
+        Fraction of a fixed step elapsed since it ran, in [0, 1).
     """
 
     def __init__(
@@ -99,6 +111,8 @@ class Renderer2D:
         self.camera = camera
         self.debug_mode = debug_mode
         self.culling_padding = culling_padding
+        self.previous_globals: Optional[dict] = None
+        self.alpha: float = 1.0
 
         # --- internal stats ---
         self._frame_count: int = 0
@@ -139,21 +153,26 @@ class Renderer2D:
         if hasattr(root, "update_transforms"):
             root.update_transforms()
 
-        # 2 ── build the camera viewport rect (world-space)
-        viewport = self._build_viewport(screen_w, screen_h)
+        # 1b ── move nodes to their interpolated positions for this draw
+        moved = self._interpolate()
+        try:
+            # 2 ── build the camera viewport rect (world-space)
+            viewport = self._build_viewport(screen_w, screen_h)
 
-        # 3 ── gather visible, on-screen Node2D instances
-        gathered: List[Node2D] = []
-        self._total_count = 0
-        self._gather(root, viewport, gathered)
+            # 3 ── gather visible, on-screen Node2D instances
+            gathered: List[Node2D] = []
+            self._total_count = 0
+            self._gather(root, viewport, gathered)
 
-        # 4 ── depth-sort by z_index (stable → preserves tree order for ties)
-        gathered.sort(key=_z_sort_key)
+            # 4 ── depth-sort by z_index (stable → preserves tree order for ties)
+            gathered.sort(key=_z_sort_key)
 
-        # 5 ── render every gathered node via its own render()
-        self._rendered_count = len(gathered)
-        for node in gathered:
-            node.render(surface)
+            # 5 ── render every gathered node via its own render()
+            self._rendered_count = len(gathered)
+            for node in gathered:
+                node.render(surface)
+        finally:
+            _restore_globals(moved)
 
         # 6 ── debug overlays
         if self.debug_mode:
@@ -163,6 +182,32 @@ class Renderer2D:
         # 7 ── tick internal FPS counter
         self._tick_fps()
 
+    # ==================================================================
+    # Interpolation
+    # ==================================================================
+
+    def _interpolate(self) -> list:
+        """
+        Swap the cached global position of every node in
+        ``previous_globals`` for the blend towards its current one.
+        Returns (node, current_x, current_y) for _restore_globals().
+        """
+        previous = self.previous_globals
+        if not previous:
+            return []
+        alpha = self.alpha
+        moved = []
+        for node, (px, py) in previous.items():
+            if node._dirty:
+                continue  # left the drawn tree since the step
+            cx, cy = node._cached_global_x, node._cached_global_y
+            if cx == px and cy == py:
+                continue
+            moved.append((node, cx, cy))
+            node._cached_global_x = px + (cx - px) * alpha
+            node._cached_global_y = py + (cy - py) * alpha
+        return moved
+
     # ==================================================================
     # Tree traversal
     # ==================================================================
@@ -377,6 +422,13 @@ def _z_sort_key(node: Node2D):
     return getattr(node, "z_index", 0)
 
 
+def _restore_globals(moved: list) -> None:
+    """Put back the cached global positions _interpolate() replaced."""
+    for node, cx, cy in moved:
+        node._cached_global_x = cx
+        node._cached_global_y = cy
+
+
 def _always_include(node: Node2D) -> bool:
     """Return True for node types that handle their own internal culling."""
     if TilemapNode is not None and isinstance(node, TilemapNode):
@@ -10,6 +10,7 @@ from .parallax import ParallaxBackground, ParallaxLayer
 from .particles import ParticleEmitter2D
 from .tween import TweenManager, Tween, Easing
 from .tilemap import TilemapNode
+from .snapshot import SnapshotRecorder, Snapshot
 
 __all__ = [
     'Node',
@@ -27,4 +28,6 @@ __all__ = [
     'Tween',
     'Easing',
     'TilemapNode',
+    'SnapshotRecorder',
+    'Snapshot',
 ]
@@ -6,6 +6,13 @@ class Node(SignalMixin):
     Represents a node in the scene graph hierarchy.
     Handles parent-child relationships and recursive updates.
     """
+    # Callables invoked as hook(parent, child) after a subtree is attached
+    # to or detached from a parent.  Subsystems that index nodes per tree
+    # (e.g. the collision collider registry) subscribe here instead of
+    # walking the whole scene every frame.
+    _attach_hooks = []
+    _detach_hooks = []
+
     def __init__(self, name: str = "Node"):
         self.name = name
         self.parent: Optional['Node'] = None
@@ -19,12 +26,16 @@ class Node(SignalMixin):
         self.children.append(child)
         if hasattr(child, 'set_dirty'):
             child.set_dirty()
+        for hook in Node._attach_hooks:
+            hook(self, child)
 
     def remove_child(self, child: 'Node') -> None:
         """Removes a child node from this node."""
         if child in self.children:
             self.children.remove(child)
             child.parent = None
+            for hook in Node._detach_hooks:
+                hook(self, child)
 
     def destroy(self) -> None:
         """
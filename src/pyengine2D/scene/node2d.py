@@ -3,6 +3,11 @@ from .node import Node
 class Node2D(Node):
     """Base class for 2D nodes with position (Optimized with Dirty Transforms)."""
     camera = None
+    # While a dict, every node that goes from clean to dirty records its
+    # global position from just before the move (first move wins).
+    # Engine.run opens one per fixed step for render interpolation.
+    _move_log = None
+
     def __init__(self, name: str = "Node2D", local_x: float = 0.0, local_y: float = 0.0):
         super().__init__(name)
         self._local_x = local_x
@@ -12,6 +17,11 @@ class Node2D(Node):
         self._rotation = 0.0
         
         self._dirty = True
+        # Bumped every time the node goes from clean to dirty or its own
+        # transform changes. Lets consumers such as CollisionWorld and
+        # SnapshotRecorder detect moves after the dirty flag itself has
+        # been cleared by update_transforms().
+        self._transform_version = 0
         self._cached_global_x = local_x
         self._cached_global_y = local_y
 
@@ -74,7 +84,11 @@ class Node2D(Node):
 
     def set_dirty(self):
         """Recursively marks this node and all children as dirty."""
+        self._transform_version += 1
         if not self._dirty:
+            log = Node2D._move_log
+            if log is not None and self not in log:
+                log[self] = (self._cached_global_x, self._cached_global_y)
             self._dirty = True
             for child in self.children:
                 if isinstance(child, Node2D):
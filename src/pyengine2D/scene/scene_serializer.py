@@ -95,6 +95,11 @@ try:
 except ImportError:
     DistanceConstraint = None
 
+try:
+    from src.pyengine2D.physics.joint_2d import Joint2D, DistanceJoint, SpringJoint, PinJoint
+except ImportError:
+    Joint2D = DistanceJoint = SpringJoint = PinJoint = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  Type registry — maps type-name strings to classes and back
@@ -125,6 +130,10 @@ _register(CollisionWorld)
 _register(PhysicsWorld2D)
 _register(CircleCollider2D)
 if DistanceConstraint: _register(DistanceConstraint)
+_register(Joint2D)
+_register(DistanceJoint)
+_register(SpringJoint)
+_register(PinJoint)
 
 
 def get_registered_types():
@@ -203,6 +212,7 @@ def _node_to_dict(node) -> dict:
         props["vx"] = getattr(node, "vx", 0.0)
         props["vy"] = getattr(node, "vy", 0.0)
         props["use_gravity"] = getattr(node, "use_gravity", True)
+        props["continuous"] = getattr(node, "continuous", False)
         
     if RigidBody2D and isinstance(node, RigidBody2D):
         props["vx"] = getattr(node, "vx", 0.0)
@@ -213,15 +223,23 @@ def _node_to_dict(node) -> dict:
         props["is_kinematic"] = getattr(node, "is_kinematic", False)
         props["friction"] = getattr(node, "friction", 0.2)
         props["restitution"] = getattr(node, "restitution", 0.5)
+        props["can_sleep"] = getattr(node, "can_sleep", False)
 
     # ── CollisionWorld extras ──
     if CollisionWorld and isinstance(node, CollisionWorld):
         props["cell_size"] = getattr(node._grid, "cell_size", 128) if hasattr(node, "_grid") else 128
+        props["broadphase"] = getattr(node, "broadphase", "grid")
 
     # ── PhysicsWorld2D extras ──
     if PhysicsWorld2D and isinstance(node, PhysicsWorld2D):
         props["gravity_y"] = getattr(node, "gravity_y", 800.0)
         props["sub_steps"] = getattr(node, "sub_steps", 1)
+        props["vectorized"] = getattr(node, "vectorized", False)
+        props["velocity_iterations"] = getattr(node, "velocity_iterations", 0)
+        props["joint_iterations"] = getattr(node, "joint_iterations", 4)
+        props["adaptive_sub_steps"] = getattr(node, "adaptive_sub_steps", False)
+        props["min_sub_steps"] = getattr(node, "min_sub_steps", 1)
+        props["max_travel"] = getattr(node, "max_travel", 0.1)
 
     # ── Constraints ──
     if DistanceConstraint and isinstance(node, DistanceConstraint):
@@ -229,6 +247,15 @@ def _node_to_dict(node) -> dict:
         props["pivot_y"] = getattr(node, "local_y", 0)
         props["length"] = getattr(node, "length", 100)
         props["body_name"] = node.body_a.name if getattr(node, "body_a", None) else ""
+
+    if Joint2D and isinstance(node, Joint2D):
+        props["body_name"] = node.body_a.name if node.body_a else ""
+        props["body_b_name"] = node.body_b.name if node.body_b else ""
+        props["length"] = node.length
+        props["offset_x"] = node.offset_x
+        props["offset_y"] = node.offset_y
+        props["stiffness"] = node.stiffness
+        props["damping"] = node.damping
         
     # ── Ball (Newton's Cradle) ──
     from src.games.newtons_cradle.main import Ball
@@ -325,12 +352,22 @@ def _dict_to_node(data: dict, custom_types: dict = None):
         node = CircleNode(name, x, y, radius, tuple(color) if isinstance(color, list) else color)
     elif CollisionWorld and cls is CollisionWorld:
         # CollisionWorld doesn't take x,y, it takes cell_size
-        node = CollisionWorld(name, cell_size=payload.get("cell_size", 128))
+        node = CollisionWorld(
+            name,
+            cell_size=payload.get("cell_size", 128),
+            broadphase=payload.get("broadphase", "grid"),
+        )
     elif PhysicsWorld2D and cls is PhysicsWorld2D:
         node = PhysicsWorld2D(
             name,
             gravity_y=payload.get("gravity_y", 800.0),
-            sub_steps=payload.get("sub_steps", 1)
+            sub_steps=payload.get("sub_steps", 1),
+            vectorized=payload.get("vectorized", False),
+            velocity_iterations=payload.get("velocity_iterations", 0),
+            joint_iterations=payload.get("joint_iterations", 4),
+            adaptive_sub_steps=payload.get("adaptive_sub_steps", False),
+            min_sub_steps=payload.get("min_sub_steps", 1),
+            max_travel=payload.get("max_travel", 0.1),
         )
     elif DistanceConstraint and cls is DistanceConstraint:
         node = DistanceConstraint(
@@ -341,6 +378,21 @@ def _dict_to_node(data: dict, custom_types: dict = None):
             payload.get("length", 100)
         )
         node._body_name = payload.get("body_name", "") # store hint for later reference resolving
+    elif Joint2D and cls in (Joint2D, DistanceJoint, SpringJoint, PinJoint):
+        # Subclass constructors differ; build through the base with the saved parameters
+        node = cls.__new__(cls)
+        Joint2D.__init__(
+            node, name, None, None,
+            payload.get("length", 0.0),
+            payload.get("stiffness", 1.0),
+            payload.get("damping", 1.0),
+            payload.get("x", 0),
+            payload.get("y", 0),
+        )
+        node.offset_x = payload.get("offset_x", 0.0)
+        node.offset_y = payload.get("offset_y", 0.0)
+        node._body_name = payload.get("body_name", "")
+        node._body_b_name = payload.get("body_b_name", "")
     elif CircleCollider2D and cls is CircleCollider2D:
         node = CircleCollider2D(
             name,
@@ -380,6 +432,7 @@ def _dict_to_node(data: dict, custom_types: dict = None):
                 node._scale_y = 1.0
                 node._rotation = 0.0
                 node._dirty = True
+                node._transform_version = 0
                 node._global_transform = (0, 0, 1, 1, 0)
                 
                 node.visible = True
@@ -397,7 +450,10 @@ def _dict_to_node(data: dict, custom_types: dict = None):
                     node.vx = 0.0
                     node.vy = 0.0
                     node.use_gravity = True
+                    node.continuous = False
                 if RigidBody2D and isinstance(node, RigidBody2D):
+                    node.collider = None
+                    node.collision_world = None
                     node.vx = 0.0
                     node.vy = 0.0
                     node.force_x = 0.0
@@ -409,6 +465,11 @@ def _dict_to_node(data: dict, custom_types: dict = None):
                     node.is_kinematic = False
                     node.friction = 0.2
                     node.restitution = 0.5
+                    node.can_sleep = False
+                    node.sleeping = False
+                    node._rest_frames = 0
+                    node._rest_pos = None
+                    node._island = None
                     
                     # Ball specific fallback
                     from src.games.newtons_cradle.main import Ball
@@ -439,6 +500,7 @@ def _dict_to_node(data: dict, custom_types: dict = None):
         node.vx = payload.get("vx", getattr(node, "vx", 0.0))
         node.vy = payload.get("vy", getattr(node, "vy", 0.0))
         node.use_gravity = payload.get("use_gravity", getattr(node, "use_gravity", True))
+        node.continuous = payload.get("continuous", getattr(node, "continuous", False))
 
     if RigidBody2D and isinstance(node, RigidBody2D):
         node.vx = payload.get("vx", getattr(node, "vx", 0.0))
@@ -450,6 +512,7 @@ def _dict_to_node(data: dict, custom_types: dict = None):
         node.is_kinematic = payload.get("is_kinematic", getattr(node, "is_kinematic", False))
         node.friction = payload.get("friction", getattr(node, "friction", 0.2))
         node.restitution = payload.get("restitution", getattr(node, "restitution", 0.5))
+        node.can_sleep = payload.get("can_sleep", getattr(node, "can_sleep", False))
         
     # ── Ball extras ──
     from src.games.newtons_cradle.main import Ball
@@ -598,6 +661,11 @@ class SceneSerializer:
             if body_name and body_name in name_map:
                 if hasattr(node, "body_a"):
                     node.body_a = name_map[body_name]
+
+            # Joint2D.body_b
+            body_b_name = getattr(node, "_body_b_name", None)
+            if body_b_name and body_b_name in name_map:
+                node.body_b = name_map[body_b_name]
             
             # RigidBody2D.collider / collision_world (if they were named)
             # Actually they are usually children or handled via __init__
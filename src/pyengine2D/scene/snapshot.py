@@ -0,0 +1,287 @@
+"""
+Snapshots — fast capture and in-place restore of a subtree's simulation
+state, for rollback netcode and replay scrubbing.
+
+SceneSerializer rebuilds nodes from JSON; a snapshot instead packs the
+mutable state of the nodes that already exist into one bytes buffer of
+doubles (plus a short list of object references for state that is not
+a number) and writes it back onto the same nodes:
+
+    Node2D          position, scale, rotation
+    PhysicsBody2D   velocity
+    RigidBody2D     velocity, pending force, sleep state
+    PhysicsWorld2D  warm-started contact impulses
+    AnimatedSprite  animation, frame index, frame timer, fps, loop, playing
+    TweenManager    active tweens (the Tween objects themselves, re-armed)
+    MasterClock     elapsed time
+
+Which nodes are of which kind is worked out once per tree shape: Node
+attach/detach hooks bump a counter, and the node lists (and the struct
+layout of the buffer) are rebuilt only when it changed.
+
+Transforms are most of a scene and most of them do not move, so they
+are tracked by Node2D's ``_transform_version``, which moves on every
+change: a node with the same version as before has the same transform.
+capture() copies the previous buffer and re-reads only the transforms
+whose version moved; restore() only touches nodes whose version moved
+since the capture, and marks dirty only those whose transform actually
+differs.
+
+Restore does not add or remove nodes; nodes attached since the capture
+keep their state, nodes detached since then get theirs back but stay
+detached.
+"""
+import struct
+from itertools import chain, compress
+from operator import attrgetter, ne
+
+from .node import Node
+from .node2d import Node2D
+
+_structure_version = 0
+
+
+def _on_structure_change(parent, child):
+    global _structure_version
+    _structure_version += 1
+
+
+Node._attach_hooks.append(_on_structure_change)
+Node._detach_hooks.append(_on_structure_change)
+
+_VERSION = attrgetter("_transform_version")
+_TRANSFORM = attrgetter("_local_x", "_local_y", "_scale_x", "_scale_y", "_rotation")
+_TRANSFORM_PACKER = struct.Struct("<5d")
+_BODY = attrgetter("velocity_x", "velocity_y")
+_RIGID = attrgetter("vx", "vy", "force_x", "force_y", "_rest_frames", "sleeping")
+_SPRITE = attrgetter("current_frame_index", "frame_timer", "fps", "playing", "loop")
+_TWEEN = attrgetter("target", "property_name", "start_val", "end_val", "duration",
+                    "easing", "on_complete", "elapsed", "finished")
+
+
+class _Layout:
+    """The nodes of one tree shape, grouped by the state they carry."""
+
+    __slots__ = ("version", "nodes", "bodies", "rigids", "worlds", "sprites", "tweeners",
+                 "size", "tail", "tail_offset")
+
+    def __init__(self, root, version):
+        from .animated_sprite import AnimatedSprite
+        from .tween import TweenManager
+        from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
+        from src.pyengine2D.physics.rigid_body_2d import RigidBody2D
+        from src.pyengine2D.physics.physics_world_2d import PhysicsWorld2D
+
+        self.version = version
+        self.nodes = []
+        self.bodies = []
+        self.rigids = []
+        self.worlds = []
+        self.sprites = []
+        self.tweeners = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Node2D):
+                self.nodes.append(node)
+                if isinstance(node, RigidBody2D):
+                    self.rigids.append(node)
+                elif isinstance(node, PhysicsBody2D):
+                    self.bodies.append(node)
+                elif isinstance(node, AnimatedSprite):
+                    self.sprites.append(node)
+                elif isinstance(node, PhysicsWorld2D) and node._contact_solver is not None:
+                    self.worlds.append(node)
+            elif isinstance(node, TweenManager):
+                self.tweeners.append(node)
+            stack.extend(reversed(node.children))
+
+        # Buffer: one 5-double transform record per node, then the tail
+        # (velocities, rigid state, sprite timers, clock) packed in one go
+        self.tail_offset = _TRANSFORM_PACKER.size * len(self.nodes)
+        self.tail = struct.Struct("<%dd" % (2 * len(self.bodies) + 6 * len(self.rigids)
+                                            + 5 * len(self.sprites) + 1))
+        self.size = self.tail_offset + self.tail.size
+
+
+class Snapshot:
+    """
+    Captured state: ``data`` is the packed buffer of doubles, ``refs``
+    the non-numeric state, ``keys`` each node's transform version
+    at capture time and ``layout`` the nodes they all refer to.
+    """
+
+    __slots__ = ("layout", "data", "keys", "refs")
+
+    def __init__(self, layout, data, keys, refs):
+        self.layout = layout
+        self.data = data
+        self.keys = keys
+        self.refs = refs
+
+    @property
+    def nbytes(self):
+        """Size of the numeric buffer in bytes."""
+        return len(self.data)
+
+
+def _stale(keys, since):
+    """Indices of nodes whose transform version moved since *since*."""
+    return compress(range(len(keys)), map(ne, keys, since))
+
+
+class SnapshotRecorder:
+    """
+    Captures and restores the state of the subtree under *root*.
+
+        recorder = SnapshotRecorder(scene, engine.master_clock)
+        snap = recorder.capture()
+        ...                      # simulate ahead
+        recorder.restore(snap)   # and roll back
+
+    *clock* defaults to the running Engine's MasterClock, if any.
+    """
+
+    def __init__(self, root, clock=None):
+        self.root = root
+        if clock is None:
+            from src.pyengine2D.core.engine import Engine
+            clock = Engine.instance.master_clock if Engine.instance else None
+        self.clock = clock
+        self._layout = None
+        self._last = None  # previous capture, reused for unchanged transforms
+
+    def _current_layout(self):
+        layout = self._layout
+        if layout is None or layout.version != _structure_version:
+            layout = self._layout = _Layout(self.root, _structure_version)
+        return layout
+
+    def capture(self):
+        """Copy the subtree's current state into a new Snapshot."""
+        layout = self._current_layout()
+        nodes = layout.nodes
+        keys = list(map(_VERSION, nodes))
+
+        last = self._last
+        if last is not None and last.layout is layout:
+            buf = bytearray(last.data)
+            changed = _stale(keys, last.keys)
+        else:
+            buf = bytearray(layout.size)
+            changed = range(len(nodes))
+        pack_into = _TRANSFORM_PACKER.pack_into
+        step = _TRANSFORM_PACKER.size
+        for i in changed:
+            pack_into(buf, i * step, *_TRANSFORM(nodes[i]))
+
+        flat = chain.from_iterable
+        layout.tail.pack_into(
+            buf, layout.tail_offset,
+            *flat(map(_BODY, layout.bodies)),
+            *flat(map(_RIGID, layout.rigids)),
+            *flat(map(_SPRITE, layout.sprites)),
+            self.clock.elapsed if self.clock is not None else 0.0,
+        )
+
+        refs = (
+            [(b._island, b._rest_pos) for b in layout.rigids],
+            [s.current_animation for s in layout.sprites],
+            [[(t,) + _TWEEN(t) for t in m.tweens] for m in layout.tweeners],
+            [self._capture_contacts(w) for w in layout.worlds],
+        )
+        snapshot = self._last = Snapshot(layout, bytes(buf), keys, refs)
+        return snapshot
+
+    @staticmethod
+    def _capture_contacts(world):
+        solver = world._contact_solver
+        return (dict(solver.manifolds), solver._stamp, world._last_sdt,
+                [(c.impulse, c.nx, c.ny, c.stamp) for c in solver.manifolds.values()])
+
+    def restore(self, snapshot):
+        """Write *snapshot* back onto the nodes it was captured from."""
+        layout = snapshot.layout
+        data = snapshot.data
+        nodes = layout.nodes
+        islands, animations, tweens, contacts = snapshot.refs
+
+        unpack_from = _TRANSFORM_PACKER.unpack_from
+        step = _TRANSFORM_PACKER.size
+        for i in _stale(list(map(_VERSION, nodes)), snapshot.keys):
+            node = nodes[i]
+            x, y, sx, sy, rot = unpack_from(data, i * step)
+            if (node._local_x != x or node._local_y != y or node._scale_x != sx
+                    or node._scale_y != sy or node._rotation != rot):
+                node._local_x = x
+                node._local_y = y
+                node._scale_x = sx
+                node._scale_y = sy
+                node._rotation = rot
+                node.set_dirty()
+
+        tail = layout.tail.unpack_from(data, layout.tail_offset)
+        end = 2 * len(layout.bodies)
+        for body, vx, vy in zip(layout.bodies, tail[0:end:2], tail[1:end:2]):
+            body.velocity_x = vx
+            body.velocity_y = vy
+
+        start, end = end, end + 6 * len(layout.rigids)
+        for body, vx, vy, fx, fy, rest, asleep, (island, rest_pos) in zip(
+                layout.rigids, tail[start:end:6], tail[start + 1:end:6], tail[start + 2:end:6],
+                tail[start + 3:end:6], tail[start + 4:end:6], tail[start + 5:end:6], islands):
+            body.vx = vx
+            body.vy = vy
+            body.force_x = fx
+            body.force_y = fy
+            body._rest_frames = int(rest)
+            body.sleeping = bool(asleep)
+            body._island = island
+            body._rest_pos = rest_pos
+
+        start, end = end, end + 5 * len(layout.sprites)
+        for sprite, frame, timer, fps, playing, loop, anim in zip(
+                layout.sprites, tail[start:end:5], tail[start + 1:end:5], tail[start + 2:end:5],
+                tail[start + 3:end:5], tail[start + 4:end:5], animations):
+            sprite.current_animation = anim
+            sprite.current_frame_index = int(frame)
+            sprite.frame_timer = timer
+            sprite.fps = fps
+            sprite.playing = bool(playing)
+            sprite.loop = bool(loop)
+
+        if self.clock is not None:
+            self.clock.elapsed = tail[end]
+
+        for manager, records in zip(layout.tweeners, tweens):
+            self._restore_tweens(manager, records)
+        for world, saved in zip(layout.worlds, contacts):
+            self._restore_contacts(world, saved)
+
+    @staticmethod
+    def _restore_tweens(manager, records):
+        """Re-arm the captured Tween objects and pool every other one."""
+        active = []
+        for tween, target, prop, start, end, duration, easing, on_complete, elapsed, finished in records:
+            tween.reset(target, prop, start, end, duration, easing, on_complete)
+            tween.elapsed = elapsed
+            tween.finished = finished
+            active.append(tween)
+        keep = set(active)
+        pool = [t for t in manager._tween_pool if t not in keep]
+        pool.extend(t for t in manager.tweens if t not in keep)
+        manager._tween_pool = pool
+        manager.tweens[:] = active
+
+    @staticmethod
+    def _restore_contacts(world, saved):
+        manifolds, stamp, last_sdt, values = saved
+        solver = world._contact_solver
+        for contact, (impulse, nx, ny, c_stamp) in zip(manifolds.values(), values):
+            contact.impulse = impulse
+            contact.nx = nx
+            contact.ny = ny
+            contact.stamp = c_stamp
+        solver.manifolds = dict(manifolds)
+        solver._stamp = stamp
+        world._last_sdt = last_sdt
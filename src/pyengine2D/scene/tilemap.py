@@ -2,7 +2,8 @@
 TilemapNode — efficient tilemap rendering, auto-collision, and viewport streaming.
 
 Loads map data from a Python dict (JSON-compatible) or a .tmx XML file.
-Solid tile layers auto-generate Collider2D nodes for physics.
+Solid tile layers auto-generate Collider2D nodes for physics, or a single
+TileGridCollider that CollisionWorld queries tile by tile.
 Each layer is baked to a cached surface for fast rendering.
 """
 import json
@@ -13,6 +14,7 @@ import pygame
 
 from src.pyengine2D.scene.node2d import Node2D
 from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.tile_grid_collider import TileGridCollider
 from src.pyengine2D.rendering.surface_cache import SurfaceCache
 
 
@@ -46,14 +48,24 @@ class TilemapNode(Node2D):
 
     Features:
         - Baked layer surfaces (draw once, blit fast).
-        - Auto-generated Collider2D nodes for solid tiles (row-merged).
+        - Auto-generated Collider2D nodes for solid tiles (greedy rectangles
+          per chunk; set_tile() only regenerates the edited chunk), or
+          with ``collision_mode="grid"`` one TileGridCollider for the whole
+          map (no per-run nodes; queries index the solid-tile array).
         - Viewport streaming (only render visible tile region).
         - Multi-layer parallax support.
         - Debug overlay (tile borders + solid markers via show_debug).
     """
 
-    def __init__(self, name="Tilemap"):
+    COLLISION_MODES = ("nodes", "grid")
+
+    def __init__(self, name="Tilemap", collision_mode="nodes"):
         super().__init__(name, 0, 0)
+        if collision_mode not in self.COLLISION_MODES:
+            raise ValueError(
+                f"Unknown collision_mode {collision_mode!r}; expected one of {self.COLLISION_MODES}"
+            )
+        self.collision_mode = collision_mode
         self.tile_width = 0
         self.tile_height = 0
         self.map_cols = 0
@@ -63,6 +75,8 @@ class TilemapNode(Node2D):
         self.tileset_cols = []     # columns per tileset
         self._surface_cache = SurfaceCache()
         self._collision_nodes = [] # generated Collider2D nodes
+        self.tile_collider = None  # TileGridCollider in "grid" collision mode
+        self._chunk_colliders = {} # (chunk_x, chunk_y) -> generated Collider2D nodes
         self.show_debug = False
 
     # ------------------------------------------------------------------
@@ -205,31 +219,41 @@ class TilemapNode(Node2D):
 
             for cy in range(chunks_y):
                 for cx in range(chunks_x):
-                    c_cols = min(self.chunk_size, cols - cx * self.chunk_size)
-                    c_rows = min(self.chunk_size, rows - cy * self.chunk_size)
-                    c_w = c_cols * self.tile_width
-                    c_h = c_rows * self.tile_height
-                    
-                    if c_w <= 0 or c_h <= 0:
-                        continue
-
-                    surf = pygame.Surface((c_w, c_h), pygame.SRCALPHA)
-                    surf.fill((0, 0, 0, 0))
-
-                    has_tiles = False
-                    for r in range(c_rows):
-                        for c in range(c_cols):
-                            global_r = cy * self.chunk_size + r
-                            global_c = cx * self.chunk_size + c
-                            tile_id = tiles[global_r][global_c]
-                            if tile_id <= 0:
-                                continue
-                            has_tiles = True
-                            self._draw_tile(surf, tile_id, c, r)
+                    self._bake_chunk(layer_idx, cx, cy)
+
+    def _bake_chunk(self, layer_idx, cx, cy):
+        """Render one chunk of one layer into the surface cache (or drop it if empty)."""
+        tiles = self.layers[layer_idx].get("tiles", [])
+        rows = len(tiles)
+        cols = len(tiles[0]) if rows else 0
+        cache_key = f"chunk_{layer_idx}_{cx}_{cy}"
+
+        c_cols = min(self.chunk_size, cols - cx * self.chunk_size)
+        c_rows = min(self.chunk_size, rows - cy * self.chunk_size)
+        c_w = c_cols * self.tile_width
+        c_h = c_rows * self.tile_height
+        
+        if c_w <= 0 or c_h <= 0:
+            return
 
-                    if has_tiles:
-                        cache_key = f"chunk_{layer_idx}_{cx}_{cy}"
-                        self._surface_cache.store(cache_key, surf)
+        surf = pygame.Surface((c_w, c_h), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 0))
+
+        has_tiles = False
+        for r in range(c_rows):
+            for c in range(c_cols):
+                global_r = cy * self.chunk_size + r
+                global_c = cx * self.chunk_size + c
+                tile_id = tiles[global_r][global_c]
+                if tile_id <= 0:
+                    continue
+                has_tiles = True
+                self._draw_tile(surf, tile_id, c, r)
+
+        if has_tiles:
+            self._surface_cache.store(cache_key, surf)
+        else:
+            self._surface_cache.invalidate(cache_key)
 
     def _draw_tile(self, target, tile_id, col, row):
         """Blit a single tile from the first tileset onto *target*."""
@@ -252,41 +276,137 @@ class TilemapNode(Node2D):
         target.blit(ts_surf, (dest_x, dest_y), src_rect)
 
     # ------------------------------------------------------------------
-    # Collision generation (row-merged)
+    # Collision generation (greedy rectangles, per chunk)
     # ------------------------------------------------------------------
 
     def _generate_colliders(self):
-        """Auto-create Collider2D nodes for solid tiles, merging adjacent tiles in each row."""
+        """
+        Auto-create Collider2D nodes for solid tiles, greedily merging them
+        into rectangles across rows and columns within each chunk.
+        In "grid" collision mode a single TileGridCollider is created instead.
+        """
         # Remove old colliders
         for node in self._collision_nodes:
             self.remove_child(node)
         self._collision_nodes.clear()
+        self._chunk_colliders = {}  # (cx, cy) -> [Collider2D]
+        self.tile_collider = None
+
+        if self.collision_mode == "grid":
+            solid_layers = [layer.get("tiles", []) for layer in self.layers if layer.get("solid", False)]
+            if not solid_layers:
+                return
+            grid = TileGridCollider.from_tiles(
+                "TileGridCol", solid_layers, self.tile_width, self.tile_height
+            )
+            grid.layer = "wall"
+            grid.mask = set()
+            self.add_child(grid)
+            self._collision_nodes.append(grid)
+            self.tile_collider = grid
+            return
 
+        chunk_size = getattr(self, 'chunk_size', 32)
+        chunks_x = (self.map_cols + chunk_size - 1) // chunk_size
+        chunks_y = (self.map_rows + chunk_size - 1) // chunk_size
+        for cy in range(chunks_y):
+            for cx in range(chunks_x):
+                self._generate_chunk_colliders(cx, cy)
+
+    def _is_solid_tile(self, row, col):
+        """True if any solid layer has a tile at (row, col)."""
         for layer in self.layers:
             if not layer.get("solid", False):
                 continue
             tiles = layer.get("tiles", [])
-            for r, row_data in enumerate(tiles):
-                c = 0
-                while c < len(row_data):
-                    if row_data[c] <= 0:
-                        c += 1
-                        continue
-                    # Start of a solid run
-                    start_c = c
-                    while c < len(row_data) and row_data[c] > 0:
-                        c += 1
-                    # Create a merged collider for columns [start_c, c)
-                    cw = (c - start_c) * self.tile_width
-                    ch = self.tile_height
-                    cx = start_c * self.tile_width
-                    cy = r * self.tile_height
-                    col_name = f"TileCol_{layer.get('name', '')}_{r}_{start_c}"
-                    col_node = Collider2D(col_name, cx, cy, cw, ch, is_static=True)
-                    col_node.layer = "wall"
-                    col_node.mask = set()
-                    self.add_child(col_node)
-                    self._collision_nodes.append(col_node)
+            if row < len(tiles) and col < len(tiles[row]) and tiles[row][col] > 0:
+                return True
+        return False
+
+    def _generate_chunk_colliders(self, cx, cy):
+        """(Re)build the merged colliders of one chunk."""
+        for node in self._chunk_colliders.pop((cx, cy), ()):
+            self.remove_child(node)
+            self._collision_nodes.remove(node)
+
+        chunk_size = getattr(self, 'chunk_size', 32)
+        r0 = cy * chunk_size
+        c0 = cx * chunk_size
+        n_rows = min(chunk_size, self.map_rows - r0)
+        n_cols = min(chunk_size, self.map_cols - c0)
+        if n_rows <= 0 or n_cols <= 0:
+            return
+
+        # Chunk-local solid mask; cleared as tiles are claimed by rectangles
+        open_cells = [
+            [self._is_solid_tile(r0 + r, c0 + c) for c in range(n_cols)]
+            for r in range(n_rows)
+        ]
+
+        nodes = []
+        for r in range(n_rows):
+            row = open_cells[r]
+            c = 0
+            while c < n_cols:
+                if not row[c]:
+                    c += 1
+                    continue
+                # Widest run starting here, then grow down while the run stays solid
+                start_c = c
+                while c < n_cols and row[c]:
+                    c += 1
+                end_r = r + 1
+                while end_r < n_rows and all(open_cells[end_r][start_c:c]):
+                    end_r += 1
+                for rr in range(r, end_r):
+                    open_cells[rr][start_c:c] = [False] * (c - start_c)
+
+                gr = r0 + r
+                gc = c0 + start_c
+                col_name = f"TileCol_{gr}_{gc}"
+                col_node = Collider2D(
+                    col_name,
+                    gc * self.tile_width,
+                    gr * self.tile_height,
+                    (c - start_c) * self.tile_width,
+                    (end_r - r) * self.tile_height,
+                    is_static=True,
+                )
+                col_node.layer = "wall"
+                col_node.mask = set()
+                self.add_child(col_node)
+                self._collision_nodes.append(col_node)
+                nodes.append(col_node)
+
+        if nodes:
+            self._chunk_colliders[(cx, cy)] = nodes
+
+    # ------------------------------------------------------------------
+    # Editing
+    # ------------------------------------------------------------------
+
+    def set_tile(self, layer_idx, col, row, tile_id):
+        """
+        Change one tile.  Only the affected chunk is re-baked and, for
+        solid layers, only that chunk's colliders are regenerated (or one
+        cell of the TileGridCollider is updated).
+        """
+        layer = self.layers[layer_idx]
+        tiles = layer["tiles"]
+        if tiles[row][col] == tile_id:
+            return
+        tiles[row][col] = tile_id
+
+        chunk_size = getattr(self, 'chunk_size', 32)
+        cx, cy = col // chunk_size, row // chunk_size
+        self._bake_chunk(layer_idx, cx, cy)
+
+        if not layer.get("solid", False):
+            return
+        if self.tile_collider is not None:
+            self.tile_collider.set_solid(col, row, self._is_solid_tile(row, col))
+        elif self.collision_mode == "nodes":
+            self._generate_chunk_colliders(cx, cy)
 
     # ------------------------------------------------------------------
     # Rendering (viewport streaming)
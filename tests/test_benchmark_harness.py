@@ -1,6 +1,7 @@
 import sys
 import os
 import json
+import tempfile
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -20,7 +21,7 @@ class DummyBenchmark(BenchmarkPhase):
         self.dummy_list = [i for i in range(1000)]
 
 
-def test_benchmark_harness():
+def test_benchmark_harness(tmp_path):
     engine = Engine("Test Harness", 800, 600)
     engine.suppress_exit = True
     runner = BenchmarkRunner(engine)
@@ -30,7 +31,8 @@ def test_benchmark_harness():
     
     # Run headless/fast
     # If run_all blocks, it will block until engine.running = False
-    runner.run_all("test_out.json")
+    out_path = os.path.join(str(tmp_path), "test_out.json")
+    runner.run_all(out_path)
     
     # Validations
     assert len(runner.results) == 1
@@ -43,10 +45,10 @@ def test_benchmark_harness():
     # We allocated 1000 ints, memory_diff should be > 0.0 unless optimized
     
     # Check JSON
-    assert os.path.exists("test_out.json")
+    assert os.path.exists(out_path)
 
     print("[PASS] test_benchmark_harness")
 
 
 if __name__ == "__main__":
-    test_benchmark_harness()
+    test_benchmark_harness(tempfile.mkdtemp())
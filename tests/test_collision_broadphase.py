@@ -0,0 +1,842 @@
+"""
+Collision Broadphase Tests
+
+Tests the CollisionWorld broadphase bookkeeping:
+    - Persistent grid keeps static colliders between frames
+    - Moved or resized colliders are re-bucketed, removed colliders are dropped
+    - Clear-and-rebuild mode still works
+    - Collider registry follows add_child / remove_child / destroy
+    - Vectorized (NumPy) pair search matches the grid path
+    - SweepAndPrune broadphase matches the grid path; its query reach
+      follows the widest live entry
+    - DynamicAABBTree broadphase: fat boxes, balance, ray traversal
+    - Layer/mask strings compiled to bitmasks, kept in sync on mutation
+    - Grid DDA raycast and batched raycast_many
+    - Persistent contact table and per-class callback dispatch
+    - Pairs with no moved side are skipped; their contacts carry forward,
+      unless a side changed layer, mask or is_trigger
+    - Per-frame counters and stage timings published to EngineProfiler
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+
+import pygame
+pygame.init()
+
+from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.circle_collider2d import CircleCollider2D
+from src.pyengine2D.collision.collider_store import ColliderStore
+from src.pyengine2D.collision.collision_world import CollisionWorld, Contact
+from src.pyengine2D.collision.spatial_grid import UniformGrid, SweepAndPrune, DynamicAABBTree
+from src.pyengine2D.collision.layers import LayerRegistry
+from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.utils.profiler import EngineProfiler
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+def make_box(name, x, y, w, h, layer="wall", mask=None, is_static=False):
+    holder = Node2D(name, x, y)
+    col = Collider2D(name + "Col", 0, 0, w, h, is_static=is_static)
+    col.layer = layer
+    col.mask = mask if mask is not None else set()
+    holder.add_child(col)
+    return holder, col
+
+
+def step(root, cw):
+    root.update_transforms()
+    cw.update(1 / 60)
+
+
+# ======================================================================
+# Tests: UniformGrid
+# ======================================================================
+
+def test_grid_update_only_rebuckets_on_cell_change():
+    grid = UniformGrid(cell_size=100)
+    obj = object()
+    grid.insert(obj, 10, 10, 20, 20)
+    assert grid.update(obj, 15, 15, 25, 25) is False  # same cell
+    assert grid.update(obj, 150, 15, 160, 25) is True
+    assert obj not in grid.query(0, 0, 50, 50)
+    assert obj in grid.query(120, 0, 180, 50)
+    grid.remove(obj)
+    assert grid.stats()['cell_count'] == 0
+    print("[PASS] test_grid_update_only_rebuckets_on_cell_change")
+
+
+# ======================================================================
+# Tests: persistent CollisionWorld
+# ======================================================================
+
+def test_static_colliders_synced_once():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    wall, wall_col = make_box("Wall", 0, 0, 100, 20, is_static=True)
+    root.add_child(wall)
+    step(root, cw)
+
+    calls = []
+    original = wall_col.get_rect
+    wall_col.get_rect = lambda: calls.append(1) or original()
+    for _ in range(5):
+        step(root, cw)
+    assert calls == []
+    assert wall_col in cw.query_rect(10, 5, 20, 15)
+    print("[PASS] test_static_colliders_synced_once")
+
+
+def test_moved_collider_is_rebucketed():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=64)
+    root.add_child(cw)
+    box, box_col = make_box("Box", 0, 0, 10, 10, layer="box")
+    root.add_child(box)
+    step(root, cw)
+    assert cw.query_rect(0, 0, 20, 20) == [box_col]
+
+    box.local_x = 500
+    step(root, cw)
+    assert cw.query_rect(0, 0, 20, 20) == []
+    assert cw.query_rect(495, 0, 520, 20) == [box_col]
+    print("[PASS] test_moved_collider_is_rebucketed")
+
+
+def test_resized_collider_is_rebucketed():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=64)
+    root.add_child(cw)
+    box, box_col = make_box("Box", 0, 0, 10, 10)
+    ball = CircleCollider2D("Ball", 300, 0, 5)
+    root.add_child(box)
+    root.add_child(ball)
+    step(root, cw)
+    assert cw.query_rect(80, 0, 85, 5) == []
+
+    box_col.width = 100
+    ball.radius = 50
+    step(root, cw)
+    assert cw.query_rect(80, 0, 85, 5) == [box_col]
+    assert cw.query_rect(340, 0, 345, 5) == [ball]
+    print("[PASS] test_resized_collider_is_rebucketed")
+
+
+def test_removed_collider_leaves_grid():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    box, box_col = make_box("Box", 0, 0, 10, 10)
+    root.add_child(box)
+    step(root, cw)
+
+    root.remove_child(box)
+    step(root, cw)
+    assert cw.query_rect(0, 0, 20, 20) == []
+    assert box_col not in cw._cached_rects
+    assert cw._grid.stats()['object_count'] == 0
+    print("[PASS] test_removed_collider_leaves_grid")
+
+
+def test_rebuild_mode_matches_persistent():
+    results = []
+    for persistent in (True, False):
+        root = Node2D("Root")
+        cw = CollisionWorld("CW", persistent=persistent)
+        root.add_child(cw)
+        a, a_col = make_box("A", 0, 0, 10, 10)
+        root.add_child(a)
+        step(root, cw)
+        a.local_y = 300
+        step(root, cw)
+        results.append(cw.query_rect(0, 290, 20, 320))
+    assert len(results[0]) == 1 and len(results[1]) == 1
+    print("[PASS] test_rebuild_mode_matches_persistent")
+
+
+# ======================================================================
+# Tests: collider registry
+# ======================================================================
+
+def test_registry_tracks_attach_and_destroy():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    a, a_col = make_box("A", 0, 0, 10, 10)
+    root.add_child(a)
+    cw._refresh_collider_cache()
+    assert cw._cached_colliders == [a_col]
+
+    b, b_col = make_box("B", 50, 0, 10, 10)
+    root.add_child(b)
+    a.destroy()
+    cw._refresh_collider_cache()
+    assert cw._cached_colliders == [b_col]
+    print("[PASS] test_registry_tracks_attach_and_destroy")
+
+
+def test_world_added_after_colliders_sees_them():
+    root = Node2D("Root")
+    level = Node2D("Level")
+    a, a_col = make_box("A", 0, 0, 10, 10)
+    level.add_child(a)
+    root.add_child(level)
+
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    step(root, cw)
+    assert cw.query_rect(0, 0, 5, 5) == [a_col]
+
+    # Detaching the world leaves it with only its own subtree
+    root.remove_child(cw)
+    cw._refresh_collider_cache()
+    assert cw._cached_colliders == []
+    print("[PASS] test_world_added_after_colliders_sees_them")
+
+
+def test_reparenting_moves_collider_between_trees():
+    root_a, root_b = Node2D("RootA"), Node2D("RootB")
+    cw_a, cw_b = CollisionWorld("CWA"), CollisionWorld("CWB")
+    root_a.add_child(cw_a)
+    root_b.add_child(cw_b)
+    box, box_col = make_box("Box", 0, 0, 10, 10)
+    root_a.add_child(box)
+    root_b.add_child(box)
+    cw_a._refresh_collider_cache()
+    cw_b._refresh_collider_cache()
+    assert cw_a._cached_colliders == []
+    assert cw_b._cached_colliders == [box_col]
+    print("[PASS] test_reparenting_moves_collider_between_trees")
+
+
+def test_decorative_nodes_do_not_touch_registry():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    cw._refresh_collider_cache()
+    for i in range(100):
+        root.add_child(Node2D(f"Dot_{i}"))
+    assert cw._colliders_changed is False
+    print("[PASS] test_decorative_nodes_do_not_touch_registry")
+
+
+# ======================================================================
+# Tests: vectorized pair search
+# ======================================================================
+
+class EventBody(Node2D):
+    def __init__(self, name, x, y, log):
+        super().__init__(name, x, y)
+        self.log = log
+
+    def on_collision_enter(self, other):
+        self.log.append(("enter", self.name, other.parent.name))
+
+    def on_collision_stay(self, other):
+        self.log.append(("stay", self.name, other.parent.name))
+
+    def on_collision_exit(self, other):
+        self.log.append(("exit", self.name, other.parent.name))
+
+
+def _run_event_scene(vectorized=False, broadphase="grid", seed=7, count=60, frames=6):
+    rng = random.Random(seed)
+    log = []
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=64, vectorized=vectorized, broadphase=broadphase)
+    root.add_child(cw)
+    bodies = []
+    for i in range(count):
+        body = EventBody(f"B{i}", rng.uniform(0, 300), rng.uniform(0, 300), log)
+        if i % 3 == 0:
+            col = CircleCollider2D(f"B{i}Col", 0, 0, rng.uniform(4, 12))
+        else:
+            col = Collider2D(f"B{i}Col", 0, 0, rng.uniform(4, 30), rng.uniform(4, 30))
+        col.layer = "a" if i % 2 else "b"
+        col.mask = {"a"} if i % 4 else {"a", "b"}
+        body.add_child(col)
+        root.add_child(body)
+        bodies.append((body, rng.uniform(-20, 20), rng.uniform(-20, 20)))
+
+    frames_log = []
+    for _ in range(frames):
+        step(root, cw)
+        frames_log.append(sorted(log))
+        log.clear()
+        for body, vx, vy in bodies:
+            body.set_position(body.local_x + vx, body.local_y + vy)
+    return frames_log
+
+
+def test_vectorized_events_match_grid_path():
+    if not ColliderStore.available:
+        print("[SKIP] test_vectorized_events_match_grid_path (NumPy missing)")
+        return
+    expected = _run_event_scene(vectorized=False)
+    actual = _run_event_scene(vectorized=True)
+    assert any(expected)
+    assert actual == expected
+    print("[PASS] test_vectorized_events_match_grid_path")
+
+
+def test_store_swap_remove_keeps_rows_dense():
+    if not ColliderStore.available:
+        print("[SKIP] test_store_swap_remove_keeps_rows_dense (NumPy missing)")
+        return
+    store = ColliderStore(capacity=2)
+    a, b, c = (Collider2D(n, 0, 0, 10, 10) for n in "abc")
+    store.set(a, (0, 0, 10, 10))
+    store.set(b, (5, 5, 15, 15))
+    store.set(c, (100, 100, 110, 110))
+    store.remove(a)
+    assert store.count == 2 and store.index[c] == 0
+    rows_a, rows_b = store.overlapping_pairs()
+    assert len(rows_a) == 0
+    store.set(a, (8, 8, 12, 12))
+    rows_a, rows_b = store.overlapping_pairs()
+    pairs = {frozenset((store.colliders[i], store.colliders[j])) for i, j in zip(rows_a, rows_b)}
+    assert pairs == {frozenset((a, b))}
+    print("[PASS] test_store_swap_remove_keeps_rows_dense")
+
+
+# ======================================================================
+# Tests: sweep-and-prune broadphase
+# ======================================================================
+
+def test_sap_update_keeps_entries_sorted():
+    sap = SweepAndPrune()
+    objs = [object() for _ in range(5)]
+    for i, obj in enumerate(objs):
+        sap.insert(obj, i * 10, 0, i * 10 + 5, 5)
+    sap.update(objs[0], 45, 0, 50, 5)
+    lefts = [e[0] for e in sap._entries]
+    assert lefts == sorted(lefts)
+    assert sap.query(44, 0, 46, 1) == {objs[0], objs[4]}
+    sap.remove(objs[4])
+    assert sap.query(44, 0, 46, 1) == {objs[0]}
+    print("[PASS] test_sap_update_keeps_entries_sorted")
+
+
+def test_sap_queries_long_colliders():
+    sap = SweepAndPrune()
+    ground, bullet = object(), object()
+    sap.insert(ground, 0, 100, 2000, 120)
+    sap.insert(bullet, 1500, 50, 1504, 54)
+    assert sap.query(1900, 110, 1910, 115) == {ground}
+    assert set(sap.candidate_pairs()) == set()
+    sap.update(bullet, 1500, 98, 1504, 102)
+    assert {frozenset(p) for p in sap.candidate_pairs()} == {frozenset((ground, bullet))}
+    print("[PASS] test_sap_queries_long_colliders")
+
+
+def test_sap_query_reach_shrinks_with_widest_entry():
+    sap = SweepAndPrune()
+    small, other, beam = object(), object(), object()
+    sap.insert(small, 0, 0, 10, 10)
+    sap.insert(other, 50, 0, 60, 10)
+    sap.insert(beam, 100, 0, 900, 10)
+    assert sap.stats()['max_width'] == 800
+    sap.update(beam, 100, 0, 110, 10)  # briefly wide, now a normal box
+    assert sap.stats()['max_width'] == 10
+    sap.update(beam, 100, 0, 900, 10)
+    sap.remove(beam)
+    assert sap.stats()['max_width'] == 10
+    sap.remove(small)
+    sap.remove(other)
+    assert sap.stats()['max_width'] == 0
+    sap.insert(small, 0, 0, 4, 4)
+    assert sap.stats()['max_width'] == 4
+    print("[PASS] test_sap_query_reach_shrinks_with_widest_entry")
+
+
+def test_sap_world_queries_and_events():
+    expected = _run_event_scene()
+    assert _run_event_scene(broadphase="sap") == expected
+
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", broadphase="sap")
+    root.add_child(cw)
+    wall, wall_col = make_box("Wall", 200, 0, 20, 200, layer="wall")
+    root.add_child(wall)
+    mover, mover_col = make_box("Mover", 0, 0, 10, 10, layer="player", mask={"wall"})
+    root.add_child(mover)
+    step(root, cw)
+    assert cw.check_collision(mover_col, 195, 0).collider is wall_col
+    assert cw.query_rect(205, 50, 210, 60) == [wall_col]
+    hit, hx, hy, col = cw.raycast(0, 100, 400, 100)
+    assert hit and col is wall_col and abs(hx - 200) < 1e-6
+    print("[PASS] test_sap_world_queries_and_events")
+
+
+# ======================================================================
+# Tests: dynamic AABB tree broadphase
+# ======================================================================
+
+def test_bvh_reinserts_only_outside_fat_box():
+    tree = DynamicAABBTree(margin=4.0)
+    obj = object()
+    tree.insert(obj, 0, 0, 10, 10)
+    assert tree.update(obj, 2, 2, 12, 12) is False
+    assert tree.update(obj, 20, 0, 30, 10) is True
+    assert tree.stats()['reinserts'] == 1
+    assert tree.query(25, 5, 26, 6) == {obj}
+    tree.remove(obj)
+    assert tree.query(-100, -100, 100, 100) == set()
+    print("[PASS] test_bvh_reinserts_only_outside_fat_box")
+
+
+def test_bvh_stays_balanced():
+    tree = DynamicAABBTree()
+    objs = [object() for _ in range(256)]
+    # Sorted insertion is the worst case for an unbalanced tree
+    for i, obj in enumerate(objs):
+        tree.insert(obj, i * 20, 0, i * 20 + 4, 4)
+    stats = tree.stats()
+    assert stats['object_count'] == 256
+    assert stats['max_balance'] <= 1
+    assert stats['height'] <= 16
+    for obj in objs[::2]:
+        tree.remove(obj)
+    assert tree.stats()['max_balance'] <= 1
+    assert tree.query(20, 0, 24, 4) == {objs[1]}
+    print("[PASS] test_bvh_stays_balanced")
+
+
+def test_bvh_ray_traversal_skips_off_ray_leaves():
+    tree = DynamicAABBTree(margin=0.0)
+    on_ray, off_ray = object(), object()
+    tree.insert(on_ray, 90, 90, 110, 110)
+    tree.insert(off_ray, 90, 0, 110, 20)
+    # Diagonal ray whose bounding box covers both boxes
+    assert tree.query_ray(0, 0, 200, 200) == {on_ray}
+    print("[PASS] test_bvh_ray_traversal_skips_off_ray_leaves")
+
+
+def test_bvh_world_queries_and_events():
+    expected = _run_event_scene()
+    assert _run_event_scene(broadphase="bvh") == expected
+
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", broadphase="bvh")
+    root.add_child(cw)
+    ground, ground_col = make_box("Ground", 0, 300, 2000, 20, layer="wall")
+    root.add_child(ground)
+    bullet, bullet_col = make_box("Bullet", 1000, 0, 4, 4, layer="bullet", mask={"wall"})
+    root.add_child(bullet)
+    step(root, cw)
+    assert cw.check_collision(bullet_col, 1000, 298).collider is ground_col
+    assert cw.query_rect(1500, 305, 1510, 310) == [ground_col]
+    hit, hx, hy, col = cw.raycast(1500, 0, 1500, 1000)
+    assert hit and col is ground_col and abs(hy - 300) < 1e-6
+    stats = cw.stats()
+    assert stats['broadphase'] == "bvh" and stats['height'] >= 1
+    print("[PASS] test_bvh_world_queries_and_events")
+
+
+# ======================================================================
+# Tests: layer bitmasks
+# ======================================================================
+
+def test_layer_bits_follow_string_api():
+    col = Collider2D("Col", 0, 0, 10, 10)
+    col.layer = "player"
+    assert col.layer == "player"
+    assert col.layer_bits == LayerRegistry.bit("player")
+    col.mask = {"wall"}
+    assert col.mask_bits == LayerRegistry.bit("wall")
+    col.mask.add("enemy")
+    col.mask |= {"pickup"}
+    assert col.mask_bits == LayerRegistry.bits({"wall", "enemy", "pickup"})
+    col.mask.discard("wall")
+    col.mask -= {"pickup"}
+    assert col.mask == {"enemy"} and col.mask_bits == LayerRegistry.bit("enemy")
+    col.mask.clear()
+    assert col.mask_bits == 0
+    print("[PASS] test_layer_bits_follow_string_api")
+
+
+def test_mask_mutation_resyncs_vectorized_filter():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", vectorized=ColliderStore.available)
+    root.add_child(cw)
+    log = []
+    a = EventBody("A", 0, 0, log)
+    a_col = Collider2D("ACol", 0, 0, 20, 20)
+    a_col.layer = "player"
+    a.add_child(a_col)
+    b = EventBody("B", 10, 10, log)
+    b_col = Collider2D("BCol", 0, 0, 20, 20)
+    b_col.layer = "enemy"
+    b.add_child(b_col)
+    root.add_child(a)
+    root.add_child(b)
+
+    step(root, cw)
+    assert log == []  # neither mask sees the other layer
+
+    a_col.mask.add("enemy")  # in-place mutation, no transform change
+    step(root, cw)
+    assert ("enter", "A", "B") in log
+    assert cw.check_collision(a_col, 0, 0).collider is b_col
+    assert cw.query_rect(0, 0, 40, 40, masks={"enemy"}) == [b_col]
+    hit, _, _, col = cw.raycast(-10, 15, 50, 15, mask={"enemy"})
+    assert hit and col is b_col
+    print("[PASS] test_mask_mutation_resyncs_vectorized_filter")
+
+
+# ======================================================================
+# Tests: raycasting
+# ======================================================================
+
+def test_grid_traverse_ray_visits_cells_in_order():
+    grid = UniformGrid(cell_size=10)
+    objs = [object() for _ in range(5)]
+    for i, obj in enumerate(objs):
+        grid.insert(obj, i * 10 + 2, 2, i * 10 + 4, 4)
+    visited = [next(iter(bucket)) for _, bucket in grid.traverse_ray(45, 5, 1, 5)]
+    assert visited == list(reversed(objs))
+    t_values = [t for t, _ in grid.traverse_ray(1, 5, 45, 5)]
+    assert t_values == sorted(t_values) and t_values[-1] == 1.0
+    print("[PASS] test_grid_traverse_ray_visits_cells_in_order")
+
+
+def test_raycast_dda_stops_at_first_hit():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=32)
+    root.add_child(cw)
+    walls = []
+    for i in range(20):
+        holder, col = make_box("W%d" % i, 100 + i * 50, 0, 10, 100)
+        root.add_child(holder)
+        walls.append(col)
+    step(root, cw)
+
+    tested = []
+    original = cw._ray_hit_time
+    cw._ray_hit_time = lambda col, *args: tested.append(col) or original(col, *args)
+    hit, hx, hy, col = cw.raycast(0, 50, 5000, 50)
+    assert hit and col is walls[0] and hx == 100
+    assert tested == [walls[0]]  # nothing beyond the first wall was tested
+    print("[PASS] test_raycast_dda_stops_at_first_hit")
+
+
+def test_raycast_many_matches_raycast():
+    rng = random.Random(3)
+    for broadphase in ("grid", "sap", "bvh"):
+        root = Node2D("Root")
+        cw = CollisionWorld("CW", cell_size=64, broadphase=broadphase)
+        root.add_child(cw)
+        for i in range(40):
+            holder, _ = make_box("B%d" % i, rng.uniform(0, 800), rng.uniform(0, 800),
+                                 rng.uniform(5, 60), rng.uniform(5, 60),
+                                 layer=rng.choice(["wall", "crate"]))
+            root.add_child(holder)
+        step(root, cw)
+
+        rays = [(rng.uniform(-50, 850), rng.uniform(-50, 850),
+                 rng.uniform(-50, 850), rng.uniform(-50, 850)) for _ in range(150)]
+        rays.append((400, -10, 400, 900))  # axis-aligned
+        for mask in (None, {"wall"}):
+            batch = cw.raycast_many(rays, mask=mask)
+            for ray, got in zip(rays, batch):
+                want = cw.raycast(*ray, mask=mask)
+                assert got[0] == want[0], (broadphase, ray)
+                assert abs(got[1] - want[1]) < 1e-6 and abs(got[2] - want[2]) < 1e-6
+    print("[PASS] test_raycast_many_matches_raycast")
+
+
+# ======================================================================
+# Tests: contact table and dispatch
+# ======================================================================
+
+def test_contact_table_tracks_pair_state():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    a, a_col = make_box("A", 0, 0, 20, 20, layer="player", mask={"wall"})
+    b, b_col = make_box("B", 10, 0, 20, 20, layer="wall")
+    root.add_child(a)
+    root.add_child(b)
+
+    step(root, cw)
+    assert a_col._collider_id is not None and a_col._collider_id != b_col._collider_id
+    (contact,) = cw._contacts.values()
+    assert contact.state == Contact.NEW
+    step(root, cw)
+    assert contact.state == Contact.TOUCHING and cw.stats()['contacts'] == 1
+
+    b.local_x = 100
+    step(root, cw)
+    assert contact.state == Contact.SEPARATED and not cw._contacts
+    print("[PASS] test_contact_table_tracks_pair_state")
+
+
+def test_stay_events_are_opt_in():
+    from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
+
+    log = []
+
+    class Quiet(PhysicsBody2D):
+        def on_collision_enter(self, other):
+            log.append("quiet-enter")
+
+    class Chatty(Quiet):
+        def on_collision_stay(self, other):
+            log.append("chatty-stay")
+
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    bodies = []
+    for i, cls in enumerate((Quiet, Chatty)):
+        col = Collider2D("C%d" % i, 0, 0, 20, 20)
+        col.mask = {"default"}
+        body = cls("B%d" % i, i * 10, 0, col, cw)
+        body.add_child(col)
+        root.add_child(body)
+        bodies.append(body)
+
+    for _ in range(3):
+        step(root, cw)
+    assert log.count("quiet-enter") == 2  # Chatty inherits enter
+    assert log.count("chatty-stay") == 2  # frames 2 and 3, only from Chatty
+    enter, stay, exit_ = CollisionWorld._handlers(Quiet)
+    assert enter is not None and stay is None and exit_ is None
+    print("[PASS] test_stay_events_are_opt_in")
+
+
+# ======================================================================
+# Tests: moved-pair filtering
+# ======================================================================
+
+def test_unmoved_pairs_skip_narrowphase():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    for i in range(4):
+        wall, _ = make_box("W%d" % i, i * 15, 0, 20, 20, mask={"wall"}, is_static=True)
+        root.add_child(wall)
+    mover, mover_col = make_box("M", 200, 0, 20, 20, layer="player", mask={"wall"})
+    root.add_child(mover)
+
+    tested = []
+    narrow = cw._narrow_hit
+    cw._narrow_hit = lambda a, b, ra, rb: tested.append((a, b)) or narrow(a, b, ra, rb)
+
+    step(root, cw)
+    assert len(cw._contacts) == 3  # first frame: everything is new
+    tested.clear()
+    step(root, cw)
+    assert tested == [] and len(cw._contacts) == 3
+    assert all(c.state == Contact.TOUCHING for c in cw._contacts.values())
+    stats = cw.stats()
+    assert stats['static'] == 4 and stats['sleeping'] == 1 and stats['dynamic'] == 0
+
+    mover.local_x = 37  # overlaps W2 and W3
+    step(root, cw)
+    assert tested and all(mover_col in pair for pair in tested)
+    assert cw.motion_state(mover_col) == CollisionWorld.DYNAMIC
+    assert len(cw._contacts) == 5
+    print("[PASS] test_unmoved_pairs_skip_narrowphase")
+
+
+def test_carried_contacts_emit_stay_and_exit():
+    log = []
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    a = EventBody("A", 0, 0, log)
+    a_col = Collider2D("ACol", 0, 0, 20, 20)
+    a_col.mask = {"default"}
+    a.add_child(a_col)
+    b = EventBody("B", 10, 0, log)
+    b_col = Collider2D("BCol", 0, 0, 20, 20, is_static=True)
+    b.add_child(b_col)
+    root.add_child(a)
+    root.add_child(b)
+
+    step(root, cw)
+    log.clear()
+    step(root, cw)
+    assert sorted(log) == [("stay", "A", "B"), ("stay", "B", "A")]
+    log.clear()
+    b.local_x = 15  # kinematic move that keeps the overlap
+    step(root, cw)
+    assert sorted(log) == [("stay", "A", "B"), ("stay", "B", "A")]
+    assert cw.motion_state(b_col) == CollisionWorld.KINEMATIC
+    log.clear()
+    root.remove_child(b)
+    step(root, cw)
+    assert sorted(log) == [("exit", "A", "B"), ("exit", "B", "A")] and not cw._contacts
+    print("[PASS] test_carried_contacts_emit_stay_and_exit")
+
+
+def test_partial_motion_matches_full_rebuild():
+    def run(persistent, vectorized=False, broadphase="grid"):
+        rng = random.Random(3)
+        log = []
+        root = Node2D("Root")
+        cw = CollisionWorld("CW", cell_size=64, persistent=persistent, vectorized=vectorized,
+                            broadphase=broadphase)
+        root.add_child(cw)
+        bodies = []
+        for i in range(40):
+            body = EventBody("B%d" % i, rng.uniform(0, 200), rng.uniform(0, 200), log)
+            col = Collider2D("B%dCol" % i, 0, 0, rng.uniform(5, 30), rng.uniform(5, 30))
+            col.mask = {"default"}
+            body.add_child(col)
+            root.add_child(body)
+            bodies.append(body)
+        frames = []
+        for f in range(8):
+            step(root, cw)
+            frames.append(sorted(log))
+            log.clear()
+            for body in bodies[f % 4::4]:  # only a quarter of the bodies move
+                body.set_position(body.local_x + rng.uniform(-15, 15),
+                                  body.local_y + rng.uniform(-15, 15))
+        return frames
+
+    expected = run(persistent=False)
+    assert run(persistent=True) == expected
+    assert run(persistent=True, broadphase="sap") == expected
+    assert run(persistent=True, broadphase="bvh") == expected
+    if ColliderStore.available:
+        assert run(persistent=True, vectorized=True) == expected
+    print("[PASS] test_partial_motion_matches_full_rebuild")
+
+
+def test_filter_change_retests_unmoved_pair():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    wall, wall_col = make_box("W", 0, 0, 20, 20, mask={"player"}, is_static=True)
+    player, player_col = make_box("P", 10, 0, 20, 20, layer="player", mask={"wall"})
+    root.add_child(wall)
+    root.add_child(player)
+
+    tested = []
+    narrow = cw._narrow_hit
+    cw._narrow_hit = lambda a, b, ra, rb: tested.append((a, b)) or narrow(a, b, ra, rb)
+    step(root, cw)
+    step(root, cw)
+    tested.clear()
+
+    wall_col.is_trigger = True  # neither collider moves
+    step(root, cw)
+    assert len(tested) == 1 and len(cw._contacts) == 1
+    tested.clear()
+    step(root, cw)
+    assert tested == []
+
+    player_col.mask.discard("wall")
+    wall_col.mask = set()
+    step(root, cw)
+    assert not cw._contacts  # the pair no longer sees itself: separated
+    print("[PASS] test_filter_change_retests_unmoved_pair")
+
+
+# ======================================================================
+# Tests: profiler counters
+# ======================================================================
+
+def _profiled_scene(vectorized=False):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=64, vectorized=vectorized)
+    cw.profiler = EngineProfiler()
+    root.add_child(cw)
+    a, _ = make_box("A", 0, 0, 20, 20, layer="player", mask={"wall"})
+    b, _ = make_box("B", 10, 0, 20, 20)
+    holder = Node2D("C", 15, 10)
+    circle = CircleCollider2D("CCol", 0, 0, 5)
+    circle.mask = {"wall", "player"}
+    holder.add_child(circle)
+    for node in (a, b, holder):
+        root.add_child(node)
+    return root, cw
+
+
+def test_profiler_receives_collision_counters():
+    root, cw = _profiled_scene()
+    step(root, cw)
+    prof = cw.profiler
+    assert prof.get_tracked("collision.colliders.aabb") == 2
+    assert prof.get_tracked("collision.colliders.circle") == 1
+    assert prof.get_tracked("collision.narrow.aabb") == 1
+    assert prof.get_tracked("collision.narrow.circle") == 2
+    assert prof.get_tracked("collision.candidates.circle") >= 2
+    assert prof.get_tracked("collision.events.enter") == 3
+    assert prof.get_tracked("collision.grid.max_bucket") == 3
+    assert prof.get_tracked("collision.grid.cell_count") == 1
+    for stage in ("Collision.ColliderCache", "Collision.RectCache", "Collision.Pairs"):
+        assert stage in prof.timings
+
+    step(root, cw)  # nothing moved: contacts carry forward, nothing is tested
+    assert prof.get_tracked("collision.events.enter") == 0
+    assert prof.get_tracked("collision.events.stay") == 3
+    assert prof.get_tracked("collision.narrow.circle") == 0
+    assert cw.stats()['max_bucket'] == 3
+    print("[PASS] test_profiler_receives_collision_counters")
+
+
+def test_vectorized_counters_match_grid_path():
+    if not ColliderStore.available:
+        print("[SKIP] test_vectorized_counters_match_grid_path (NumPy missing)")
+        return
+    tracked = []
+    for vectorized in (False, True):
+        root, cw = _profiled_scene(vectorized)
+        step(root, cw)
+        tracked.append({name: cw.profiler.get_tracked(name)
+                        for name in cw.profiler._resource_counters
+                        if not name.startswith("collision.candidates")})
+    assert tracked[0] == tracked[1]
+    print("[PASS] test_vectorized_counters_match_grid_path")
+
+
+# ======================================================================
+# Run all
+# ======================================================================
+
+if __name__ == "__main__":
+    test_grid_update_only_rebuckets_on_cell_change()
+    test_static_colliders_synced_once()
+    test_moved_collider_is_rebucketed()
+    test_resized_collider_is_rebucketed()
+    test_removed_collider_leaves_grid()
+    test_rebuild_mode_matches_persistent()
+    test_registry_tracks_attach_and_destroy()
+    test_world_added_after_colliders_sees_them()
+    test_reparenting_moves_collider_between_trees()
+    test_decorative_nodes_do_not_touch_registry()
+    test_vectorized_events_match_grid_path()
+    test_store_swap_remove_keeps_rows_dense()
+    test_sap_update_keeps_entries_sorted()
+    test_sap_queries_long_colliders()
+    test_sap_query_reach_shrinks_with_widest_entry()
+    test_sap_world_queries_and_events()
+    test_bvh_reinserts_only_outside_fat_box()
+    test_bvh_stays_balanced()
+    test_bvh_ray_traversal_skips_off_ray_leaves()
+    test_bvh_world_queries_and_events()
+    test_layer_bits_follow_string_api()
+    test_mask_mutation_resyncs_vectorized_filter()
+    test_grid_traverse_ray_visits_cells_in_order()
+    test_raycast_dda_stops_at_first_hit()
+    test_raycast_many_matches_raycast()
+    test_contact_table_tracks_pair_state()
+    test_stay_events_are_opt_in()
+    test_unmoved_pairs_skip_narrowphase()
+    test_carried_contacts_emit_stay_and_exit()
+    test_partial_motion_matches_full_rebuild()
+    test_filter_change_retests_unmoved_pair()
+    test_profiler_receives_collision_counters()
+    test_vectorized_counters_match_grid_path()
+    print("\n=== ALL TESTS PASSED ===")
@@ -4,7 +4,9 @@ Level 2 — Collision System Tests
 Tests the core collision architecture in isolation:
     - CollisionResult construction
     - Collider2D AABB rect computation
+    - PolygonCollider2D cached world vertices / SAT axes
     - CollisionWorld.check_collision with penetration / normal
+    - Point / circle / k-nearest queries and circle-aware shape_cast
     - PhysicsBody2D.move_and_collide axis-independent resolution
 """
 import sys
@@ -13,12 +15,17 @@ import os
 # Ensure project root is on sys.path so `src.*` imports work
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import math
+import random
+
 import pygame
 pygame.init()  # needed for pygame.Rect
 
 from src.pyengine2D.collision.collision_result import CollisionResult
 from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.polygon_collider2d import PolygonCollider2D
 from src.pyengine2D.collision.collision_world import CollisionWorld
+from src.pyengine2D.collision.circle_collider2d import CircleCollider2D
 from src.pyengine2D.scene.node2d import Node2D
 from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
 
@@ -119,6 +126,53 @@ def test_collider_rect_with_parent_offset():
     print("[PASS] test_collider_rect_with_parent_offset")
 
 
+# ======================================================================
+# Tests: PolygonCollider2D
+# ======================================================================
+
+def test_polygon_world_cache_follows_transform():
+    parent = Node2D("P", 100, 0)
+    poly = PolygonCollider2D("Poly", 0, 0, [(0, 0), (10, 0), (10, 20), (0, 20)])
+    parent.add_child(poly)
+
+    pts = poly.get_global_points()
+    assert pts[2] == (110, 20)
+    assert poly.get_global_points() is pts  # cached while the transform is unchanged
+    assert poly.get_rect() == (100, 0, 110, 20)
+
+    parent.local_x = 200  # ancestor move invalidates the cache
+    assert poly.get_rect() == (200, 0, 210, 20)
+
+    poly.rotation = math.pi / 2
+    l, t, r, b = poly.get_rect()
+    assert abs(l - 180) < 1e-9 and abs(r - 200) < 1e-9 and abs(b - 10) < 1e-9
+    print("[PASS] test_polygon_world_cache_follows_transform")
+
+
+def test_polygon_sat_axes_are_deduplicated_and_rotated():
+    box = PolygonCollider2D("Box", 0, 0, [(0, 0), (10, 0), (10, 10), (0, 10)])
+    assert len(box.get_global_axes()) == 2  # opposite edges share an axis
+    box.rotation = math.pi / 4
+    for ax, ay in box.get_global_axes():
+        assert abs(math.hypot(ax, ay) - 1.0) < 1e-9
+        assert abs(abs(ax) - abs(ay)) < 1e-9  # 45 degree axes
+
+    tri = PolygonCollider2D("Tri", 0, 0, [(0, 0), (10, 0), (0, 10)])
+    assert len(tri.get_global_axes()) == 3
+    print("[PASS] test_polygon_sat_axes_are_deduplicated_and_rotated")
+
+
+def test_polygon_sat_uses_cached_axes():
+    cw = CollisionWorld("CW")
+    diamond = PolygonCollider2D("D", 0, 0, [(10, 0), (20, 10), (10, 20), (0, 10)])
+    box = Collider2D("Box", 16, 16, 10, 10)
+    # Bounds overlap, but the box sits beyond the diamond's slanted edge
+    assert not cw._narrow_hit(diamond, box, diamond.get_rect(), box.get_rect())
+    box.local_x, box.local_y = 12, 12
+    assert cw._narrow_hit(diamond, box, diamond.get_rect(), box.get_rect())
+    print("[PASS] test_polygon_sat_uses_cached_axes")
+
+
 # ======================================================================
 # Tests: CollisionWorld.check_collision
 # ======================================================================
@@ -157,6 +211,104 @@ def test_collision_normal_direction():
     print("[PASS] test_collision_normal_direction")
 
 
+# ======================================================================
+# Tests: CollisionWorld shape queries
+# ======================================================================
+
+def build_query_scene(broadphase="grid"):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=32, broadphase=broadphase)
+    root.add_child(cw)
+    cols = {}
+    for name, x, y in (("A", 0, 0), ("B", 100, 0), ("C", 300, 300)):
+        wall, col = make_static_wall(name, x, y, 20, 20, cw)
+        root.add_child(wall)
+        cols[name] = col
+    ball_holder = Node2D("Ball", 60, 100)
+    ball = CircleCollider2D("BallCol", 0, 0, 10)
+    ball.layer = "ball"
+    ball_holder.add_child(ball)
+    root.add_child(ball_holder)
+    cols["Ball"] = ball
+    root.update_transforms()
+    cw.update(0.016)
+    return cw, cols
+
+
+def test_point_and_circle_query():
+    cw, cols = build_query_scene()
+    assert cw.point_query(10, 10) == [cols["A"]]
+    assert cw.point_query(50, 50) == []
+    assert cw.point_query(62, 102) == [cols["Ball"]]
+    assert cw.point_query(62, 102, mask={"wall"}) == []
+    # Circle just off A's corner: bounds overlap, shapes do not
+    assert cw.circle_query(27, 27, 9) == []
+    assert cw.circle_query(27, 27, 11) == [cols["A"]]
+    assert cw.circle_query(10, 10, 5, exclude=cols["A"]) == []
+    got = cw.circle_query(60, 50, 60)
+    assert set(got) == {cols["A"], cols["B"], cols["Ball"]}
+    print("[PASS] test_point_and_circle_query")
+
+
+def test_nearest_matches_brute_force():
+    for broadphase in ("grid", "sap", "bvh"):
+        cw, cols = build_query_scene(broadphase)
+        got = cw.nearest(70, 40, k=2)
+        assert [col for _, col in got] == [cols["B"], cols["Ball"]], broadphase
+        assert abs(got[0][0] - math.hypot(30, 20)) < 1e-9
+        assert abs(got[1][0] - (math.hypot(10, 60) - 10)) < 1e-9
+        far = cw.nearest(1000, 1000, k=1, mask={"wall"})
+        assert far[0][1] is cols["C"]
+        assert len(cw.nearest(0, 0, k=10)) == 4
+        assert cw.nearest(10, 10, k=1)[0] == (0.0, cols["A"])
+
+    rng = random.Random(5)
+    root = Node2D("Root")
+    cw = CollisionWorld("CW", cell_size=16)
+    root.add_child(cw)
+    walls = []
+    for i in range(60):
+        wall, col = make_static_wall("W%d" % i, rng.uniform(-400, 400), rng.uniform(-400, 400),
+                                     rng.uniform(2, 40), rng.uniform(2, 40), cw)
+        root.add_child(wall)
+        walls.append(col)
+    root.update_transforms()
+    cw.update(0.016)
+    for _ in range(20):
+        x, y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+        brute = sorted(CollisionWorld._point_distance(c, c.get_rect(), x, y) for c in walls)
+        got = [dist for dist, _ in cw.nearest(x, y, k=5)]
+        assert all(abs(a - b) < 1e-9 for a, b in zip(got, brute[:5])) and len(got) == 5
+    print("[PASS] test_nearest_matches_brute_force")
+
+
+def test_shape_cast_rounds_corners():
+    cw, cols = build_query_scene()
+    ball = cols["Ball"]
+    ball.mask = {"wall"}
+    # Straight down onto B's top face: same as the swept box
+    ball.parent.set_position(110, -60)
+    ball.parent.update_transforms()
+    face = cw.shape_cast(ball, 0, 100)
+    box = cw.sweep(ball, 0, 100)
+    assert face.collider is cols["B"] and abs(face.time - box.time) < 1e-9
+    assert (face.normal_x, face.normal_y) == (0.0, -1.0)
+
+    # Diagonal past B's corner: the box sweep clips it, the circle does not
+    ball.parent.set_position(81.5, 1.5)
+    ball.parent.update_transforms()
+    assert cw.sweep(ball, 20, -20).collided
+    assert not cw.shape_cast(ball, 20, -20).collided
+
+    # Aimed at the corner: contact normal points diagonally back
+    ball.parent.set_position(80, -20)
+    ball.parent.update_transforms()
+    hit = cw.shape_cast(ball, 40, 40)
+    assert hit.collided and hit.normal_x < 0 and hit.normal_y < 0
+    assert abs(math.hypot(hit.normal_x, hit.normal_y) - 1.0) < 1e-9
+    print("[PASS] test_shape_cast_rounds_corners")
+
+
 # ======================================================================
 # Tests: PhysicsBody2D.move_and_collide
 # ======================================================================
@@ -209,9 +361,15 @@ if __name__ == "__main__":
     test_collision_result_populated()
     test_collider_rect_at_origin()
     test_collider_rect_with_parent_offset()
+    test_polygon_world_cache_follows_transform()
+    test_polygon_sat_axes_are_deduplicated_and_rotated()
+    test_polygon_sat_uses_cached_axes()
     test_no_collision_when_far()
     test_collision_returns_result_on_overlap()
     test_collision_normal_direction()
+    test_point_and_circle_query()
+    test_nearest_matches_brute_force()
+    test_shape_cast_rounds_corners()
     test_free_movement()
     test_blocked_movement_x()
     test_velocity_zeroed_only_on_impact_axis()
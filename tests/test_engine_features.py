@@ -75,3 +75,60 @@ def test_object_pool_reuse():
     reused = pool.acquire()
     assert reused in (objs[0], objs[1]), "Pool did not reuse returned object"
 
+
+
+def test_move_log_records_position_before_first_move():
+    """Node2D._move_log keeps each moved node's global position from before the step."""
+    root = Node2D("Root")
+    mover = Node2D("Mover", 10, 20)
+    child = Node2D("Child", 1, 1)
+    still = Node2D("Still", 5, 5)
+    mover.add_child(child)
+    root.add_child(mover)
+    root.add_child(still)
+    root.update_transforms()
+
+    Node2D._move_log = {}
+    try:
+        mover.set_position(30, 40)
+        root.update_transforms()
+        mover.set_position(50, 60)  # a second move in the same step
+        log = Node2D._move_log
+    finally:
+        Node2D._move_log = None
+
+    assert log == {mover: (10, 20), child: (11, 21)}
+    mover.set_position(0, 0)
+    assert not Node2D._move_log
+
+
+def test_renderer_draws_interpolated_positions():
+    """Renderer2D draws moved nodes alpha of the way along their last step, then restores them."""
+    from src.pyengine2D.rendering.renderer2d import Renderer2D
+
+    if not pygame.display.get_surface():
+        pygame.display.set_mode((1, 1), pygame.NOFRAME | pygame.HIDDEN)
+
+    class SpyNode(Node2D):
+        def render(self, surface):
+            self.drawn_at = self.get_global_position()
+
+    root = Node2D("Root")
+    node = SpyNode("Spy", 10, 10)
+    root.add_child(node)
+    root.update_transforms()
+
+    Node2D._move_log = {}
+    node.set_position(30, 50)
+    previous, Node2D._move_log = Node2D._move_log, None
+
+    renderer = Renderer2D(None)
+    renderer.previous_globals = previous
+    renderer.alpha = 0.25
+    renderer.draw(root, pygame.Surface((100, 100)))
+    assert node.drawn_at == (15, 20)
+    assert node.get_global_position() == (30, 50)
+
+    renderer.previous_globals = None
+    renderer.draw(root, pygame.Surface((100, 100)))
+    assert node.drawn_at == (30, 50)
@@ -7,7 +7,28 @@ Tests engine-level physics on top of the Level 2 collision system:
     - No-gravity body stays still
     - apply_impulse
     - Axis independence (gravity on Y doesn't bleed into X)
+    - Swept-AABB continuous collision (no tunnelling at high speed)
+    - X/Y axis checks and push chains share one cached broadphase query
+    - PhysicsWorld2D vectorized integration matches the per-body loop,
+      and so do ropes and contacts solved on its arrays (a cradle), which
+      write the nodes once per frame
+    - PhysicsWorld2D tracks bodies incrementally; SpatialHash set buckets
+    - Body pairs solved once per substep, only when their bounds overlap;
+      hash cells sized to the bodies; static geometry via the world
+    - Resting islands (can_sleep opt-in) fall asleep together and wake on
+      contact, force or a directly set velocity, or when the geometry
+      under them moves or is removed; the vectorized path matches the
+      loop while a cradle sleeps and wakes
+    - Sequential-impulse contact solver: stable stacks at one substep,
+      warm-started persistent contacts
+    - Batched joints: chains colour into two batches and hold their
+      length; the array solver matches the per-joint fallback, follows
+      joint changes at runtime and leaves sleeping joints alone
+    - Adaptive sub-stepping: one substep at rest, more for fast bodies
+      up to sub_steps, count reported to the profiler; ropes and contacts
+      keep the full count, so a cradle swings as with fixed steps
 """
+import math
 import sys
 import os
 
@@ -17,9 +38,18 @@ import pygame
 pygame.init()
 
 from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.circle_collider2d import CircleCollider2D
 from src.pyengine2D.collision.collision_world import CollisionWorld
 from src.pyengine2D.scene.node2d import Node2D
 from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
+from src.pyengine2D.physics.rigid_body_2d import RigidBody2D
+from src.pyengine2D.physics.physics_world_2d import PhysicsWorld2D
+from src.pyengine2D.physics.distance_constraint import DistanceConstraint
+from src.pyengine2D.physics.body_store import BodyStore
+from src.pyengine2D.physics.spatial_hash import SpatialHash
+from src.pyengine2D.physics.joint_2d import DistanceJoint, SpringJoint, PinJoint
+from src.pyengine2D.physics.joint_store import JointStore
+from src.pyengine2D.utils.profiler import EngineProfiler
 
 
 # ======================================================================
@@ -154,6 +184,731 @@ def test_gravity_does_not_affect_x():
     print("[PASS] test_gravity_does_not_affect_x")
 
 
+def test_sweep_returns_earliest_time_of_impact():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    body = make_body("B", 0, 0, 10, 10, cw)
+    root.add_child(body)
+    root.add_child(make_wall("Near", 100, -20, 5, 50))
+    root.add_child(make_wall("Far", 200, -20, 5, 50))
+    root.update_transforms()
+    cw.update(1 / 60)
+
+    result = cw.sweep(body.collider, 1000, 0)
+    assert result.collided and result.collider.parent.name == "Near"
+    assert abs(result.time - 0.09) < 1e-9
+    assert (result.normal_x, result.normal_y) == (-1.0, 0.0)
+    assert not cw.sweep(body.collider, 50, 0).collided
+    assert not cw.sweep(body.collider, 0, 500).collided
+    print("[PASS] test_sweep_returns_earliest_time_of_impact")
+
+
+def test_continuous_body_does_not_tunnel():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    body = make_body("Bullet", 0, 0, 10, 10, cw)
+    body.continuous = True
+    body.velocity_x = 6000.0  # 100 px per frame vs a 5 px wall
+    root.add_child(body)
+    root.add_child(make_wall("Thin", 150, -20, 5, 50))
+
+    for _ in range(5):
+        root.update_transforms()
+        cw.update(1 / 60)
+        body.update(1 / 60)
+
+    assert body.local_x + 10 <= 150
+    assert body.velocity_x == 0.0
+    print("[PASS] test_continuous_body_does_not_tunnel")
+
+
+def test_continuous_body_slides_along_floor():
+    root, cw, body = build_scene_with_floor()
+    body.continuous = True
+    body.velocity_x = 120.0
+    body.velocity_y = 30000.0  # would skip the floor in one frame
+
+    root.update_transforms()
+    cw.update(1 / 60)
+    body.update(1 / 60)
+
+    assert 399 < body.local_y + 50 <= 400
+    assert body.velocity_y == 0.0
+    assert abs(body.local_x - 102.0) < 1e-6  # X motion kept while sliding
+    print("[PASS] test_continuous_body_slides_along_floor")
+
+
+def test_axis_checks_share_candidate_query():
+    root, cw, body = build_scene_with_floor()
+    body.velocity_x = 60.0
+    root.update_transforms()
+    cw.update(1 / 60)
+    cw.reset_candidate_cache_stats()
+
+    body.update(1 / 60)  # moves on both axes
+    stats = cw.candidate_cache_stats()
+    assert stats['candidate_misses'] == 1 and stats['candidate_hits'] == 2
+
+    cw.update(1 / 60)  # a new frame starts with an empty cache
+    body.update(1 / 60)
+    assert cw.candidate_cache_stats()['candidate_misses'] == 2
+    print("[PASS] test_axis_checks_share_candidate_query")
+
+
+def test_push_chain_reuses_candidates():
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    pusher = make_body("Pusher", 0, 0, 20, 20, cw)
+    pusher.can_push = True
+    pusher.collider.mask = {"wall", "box"}
+    root.add_child(pusher)
+    boxes = []
+    for i in range(2):
+        box = make_body("Box%d" % i, 20.5 + i * 20.5, 0, 20, 20, cw)
+        box.pushable = True
+        box.collider.layer = "box"
+        box.collider.mask = {"wall", "box"}
+        root.add_child(box)
+        boxes.append(box)
+    root.update_transforms()
+    cw.update(1 / 60)
+    cw.reset_candidate_cache_stats()
+
+    pusher.move_and_collide(5.0, 0.0)
+    assert boxes[1].local_x > 41.0 and boxes[0].local_x > 20.5
+    stats = cw.candidate_cache_stats()
+    # One query per body: the pusher's X check and the first box's
+    # re-check after the chain are hits
+    assert stats['candidate_misses'] == 3 and stats['candidate_hits'] == 2
+    print("[PASS] test_push_chain_reuses_candidates")
+
+
+# ======================================================================
+# Tests: PhysicsWorld2D
+# ======================================================================
+
+def _run_rigid_scene(vectorized, constraint=False, frames=10):
+    world = PhysicsWorld2D("PW", gravity_y=600.0, sub_steps=5, vectorized=vectorized)
+    bodies = []
+    for i in range(6):
+        body = RigidBody2D("R%d" % i, i * 30.0, 0.0, mass=1.0 + i, is_kinematic=(i == 5))
+        body.vx = 10.0 * i
+        body.use_gravity = i != 2
+        body.gravity_scale = 0.5 if i == 3 else 1.0
+        world.add_child(body)
+        bodies.append(body)
+    if constraint:
+        world.add_child(DistanceConstraint("Rope", 0.0, -50.0, bodies[0], 50.0))
+    for frame in range(frames):
+        if frame == 3:
+            bodies[1].apply_force(500.0, -300.0)
+        world.update(1 / 60)
+    return [(b.local_x, b.local_y, b.vx, b.vy) for b in bodies], bodies
+
+
+def test_vectorized_integration_matches_loop():
+    if not BodyStore.available:
+        print("[SKIP] test_vectorized_integration_matches_loop (NumPy missing)")
+        return
+    for constraint in (False, True):
+        expected, _ = _run_rigid_scene(False, constraint)
+        actual, bodies = _run_rigid_scene(True, constraint)
+        for got, want in zip(actual, expected):
+            assert all(abs(g - w) < 1e-9 for g, w in zip(got, want)), (got, want)
+        assert bodies[1].force_x == 0.0 and bodies[5].local_y == 0.0
+    print("[PASS] test_vectorized_integration_matches_loop")
+
+
+def test_vectorized_writes_nodes_once_per_frame():
+    if not BodyStore.available:
+        print("[SKIP] test_vectorized_writes_nodes_once_per_frame (NumPy missing)")
+        return
+    _, loop_bodies = _run_rigid_scene(False, frames=4)
+    _, vec_bodies = _run_rigid_scene(True, frames=4)
+    # Free fall marks a body dirty every substep on the loop path,
+    # but only once per frame when integrated in the BodyStore (the very
+    # first substep finds the freshly built node still dirty)
+    assert loop_bodies[0]._transform_version >= 4 * 5 - 1
+    assert vec_bodies[0]._transform_version <= 1 + 4
+    print("[PASS] test_vectorized_writes_nodes_once_per_frame")
+
+
+def _run_cradle(vectorized, floor_y=None, frames=90, can_sleep=False, adaptive=False):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    if floor_y is not None:
+        root.add_child(make_wall("Floor", 0, floor_y, 600, 50))
+    world = PhysicsWorld2D("PW", gravity_y=800.0, sub_steps=10, vectorized=vectorized,
+                           adaptive_sub_steps=adaptive)
+    root.add_child(world)
+    balls = []
+    for i in range(5):
+        x = 100 + 40 * i
+        ball = _make_rigid("Ball%d" % i, x, 350, CircleCollider2D("Ball%dCol" % i, 0, 0, 20), cw)
+        ball.can_sleep = can_sleep
+        if i == 0:
+            ball.set_position(x - 250 * math.sin(0.6), 100 + 250 * math.cos(0.6))
+        world.add_child(DistanceConstraint("Rope%d" % i, x, 100, ball, 250))
+        world.add_child(ball)
+        balls.append(ball)
+    for _ in range(frames):
+        root.update(1 / 60)
+    return balls
+
+
+def test_vectorized_cradle_solves_contacts_on_arrays():
+    if not BodyStore.available:
+        print("[SKIP] test_vectorized_cradle_solves_contacts_on_arrays (NumPy missing)")
+        return
+    for floor_y in (None, 371):
+        expected = _run_cradle(False, floor_y)
+        balls = _run_cradle(True, floor_y)
+        for got, want in zip(balls, expected):
+            assert abs(got.local_x - want.local_x) < 1e-6, (got.name, got.local_x, want.local_x)
+            assert abs(got.local_y - want.local_y) < 1e-6, (got.name, got.local_y, want.local_y)
+            assert abs(got.vx - want.vx) < 1e-6 and abs(got.vy - want.vy) < 1e-6
+        # The swing travelled down the row to the last ball
+        assert balls[4].local_x > 300
+    # Ropes and contacts ran on the arrays: one node write per frame.
+    # With the floor in reach the node stages ran instead.
+    assert _run_cradle(True)[4]._transform_version <= 1 + 90
+    assert balls[4]._transform_version > 10 * 90
+    print("[PASS] test_vectorized_cradle_solves_contacts_on_arrays")
+
+
+def test_world_tracks_bodies_on_add_and_remove():
+    world = PhysicsWorld2D("PW", sub_steps=1)
+    a = RigidBody2D("A", 0, 0, Collider2D("ACol", 0, 0, 10, 10))
+    b = RigidBody2D("B", 300, 0, Collider2D("BCol", 0, 0, 10, 10))
+    rope = DistanceConstraint("Rope", 0, -40, a, 40)
+    for node in (a, b, rope, Node2D("Decor")):
+        world.add_child(node)
+    world.update(1 / 60)
+    assert world.bodies == [a, b] and world.constraints == [rope]
+    assert a in world.spatial_hash and b in world.spatial_hash
+
+    b.destroy()
+    world.remove_child(rope)
+    other = Node2D("Other")
+    other.add_child(a)  # reparenting goes through world.remove_child
+    world.update(1 / 60)
+    assert world.bodies == [] and world.constraints == []
+    assert not world.spatial_hash.grid and not world.spatial_hash.body_cells
+    print("[PASS] test_world_tracks_bodies_on_add_and_remove")
+
+
+def test_spatial_hash_moves_between_buckets():
+    sh = SpatialHash(cell_size=100)
+    nodes = [Node2D("N%d" % i, 10 + i, 10) for i in range(3)]
+    for node in nodes:
+        assert sh.register(node)
+    assert not sh.register(nodes[0])  # same cell: no bucket work
+    assert sh.query_nearby(nodes[0]) == nodes[1:]
+
+    nodes[1].local_x = 450
+    assert sh.register(nodes[1])
+    assert sh.query_nearby(nodes[0]) == [nodes[2]]
+    assert sh.query_nearby(nodes[1]) == []
+    sh.remove(nodes[1])
+    sh.remove(nodes[1])  # removing twice is harmless
+    assert (4, 0) not in sh.grid and nodes[1] not in sh
+    print("[PASS] test_spatial_hash_moves_between_buckets")
+
+
+def _make_rigid(name, x, y, col, cw, mass=1.0):
+    col.layer = "ball"
+    col.mask = {"ball", "wall"}
+    body = RigidBody2D(name, x, y, col, cw, mass=mass)
+    body.add_child(col)
+    return body
+
+
+def _rigid_scene(gravity_y=0.0):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    world = PhysicsWorld2D("PW", gravity_y=gravity_y, sub_steps=4)
+    root.add_child(world)
+    return root, cw, world
+
+
+def test_body_pairs_solved_once_per_substep():
+    root, cw, world = _rigid_scene()
+    a = _make_rigid("A", 100, 100, CircleCollider2D("ACol", 0, 0, 10), cw)
+    b = _make_rigid("B", 125, 100, CircleCollider2D("BCol", 0, 0, 10), cw)
+    a.vx, b.vx = 200.0, -100.0
+    world.add_child(a)
+    world.add_child(b)
+
+    calls = []
+    original = RigidBody2D.solve_pair
+
+    def spy(x, y):
+        calls.append((x.name, y.name))
+        return original(x, y)
+
+    RigidBody2D.solve_pair = staticmethod(spy)
+    try:
+        for _ in range(5):
+            root.update(1 / 60)
+    finally:
+        RigidBody2D.solve_pair = staticmethod(original)
+
+    # Never B-vs-A, never twice a substep, and only while the bounds overlap
+    assert calls and calls == [("A", "B")] * len(calls) and len(calls) < 20, calls
+    # Equal masses, elastic: velocities swap and momentum is conserved
+    assert abs(a.vx - -100.0) < 1e-9 and abs(b.vx - 200.0) < 1e-9
+    assert b.local_x - a.local_x >= 20.0
+    print("[PASS] test_body_pairs_solved_once_per_substep")
+
+
+def test_static_contact_leaves_world_cache_alone():
+    root, cw, world = _rigid_scene(gravity_y=800.0)
+    root.add_child(make_wall("Floor", 0, 200, 400, 50))
+    box = _make_rigid("Box", 100, 150, Collider2D("BoxCol", 0, 0, 20, 20), cw)
+    world.add_child(box)
+
+    for _ in range(30):
+        start_rect = box.collider.get_rect()
+        root.update(1 / 60)
+        # Physics sub-steps no longer write into the CollisionWorld caches
+        assert cw._cached_rects[box.collider] == start_rect
+        assert box.collider.get_rect()[3] <= 200.0 + 1e-9
+    assert box.local_y + 20.0 > 190.0  # landed on the floor
+    print("[PASS] test_static_contact_leaves_world_cache_alone")
+
+
+def test_hash_cells_fit_largest_body():
+    root, cw, world = _rigid_scene()
+    a = _make_rigid("A", 0, 0, Collider2D("ACol", 0, 0, 300, 20), cw)
+    b = _make_rigid("B", 290, 0, Collider2D("BCol", 0, 0, 20, 20), cw)
+    b.vx = -50.0
+    world.add_child(a)
+    world.add_child(b)
+    root.update(1 / 60)
+    assert world.spatial_hash.cell_size >= 600
+    assert world.spatial_hash.query_nearby(a) == [b]
+    assert b.vx > -50.0  # the pair was found and solved
+    print("[PASS] test_hash_cells_fit_largest_body")
+
+
+def test_small_bodies_get_small_cells():
+    root, cw, world = _rigid_scene()
+    bodies = [_make_rigid("B%d" % i, 12 * i, 0, CircleCollider2D("C%d" % i, 0, 0, 5), cw)
+              for i in range(4)]
+    for body in bodies:
+        world.add_child(body)
+
+    calls = []
+    original = RigidBody2D.solve_pair
+    RigidBody2D.solve_pair = staticmethod(lambda x, y: calls.append((x, y)) or original(x, y))
+    try:
+        root.update(1 / 60)
+    finally:
+        RigidBody2D.solve_pair = staticmethod(original)
+    assert world.spatial_hash.cell_size == 10
+    assert world.spatial_hash.query_nearby(bodies[1]) == [bodies[0], bodies[2]]
+    assert calls == []  # hash neighbours, but their bounds never overlap
+    print("[PASS] test_small_bodies_get_small_cells")
+
+
+def _sleeping_stack(count=3):
+    root, cw, world = _rigid_scene(gravity_y=800.0)
+    root.add_child(make_wall("Floor", 0, 200, 400, 50))
+    boxes = []
+    for i in range(count):
+        box = _make_rigid("Box%d" % i, 100, 180 - 21 * i,
+                          Collider2D("Box%dCol" % i, 0, 0, 20, 20), cw)
+        box.restitution = 0.2
+        box.can_sleep = True
+        world.add_child(box)
+        boxes.append(box)
+    return root, cw, world, boxes
+
+
+def test_resting_stack_sleeps_as_island():
+    root, cw, world, boxes = _sleeping_stack()
+    asleep_at = []
+    for frame in range(90):
+        root.update(1 / 60)
+        asleep_at.append(tuple(b.sleeping for b in boxes))
+    # Every box goes to sleep in the same frame, none before the others
+    assert all(state in ((False,) * 3, (True,) * 3) for state in asleep_at)
+    assert boxes[0].sleeping and boxes[0]._island == boxes
+
+    calls = []
+    original = RigidBody2D.solve_pair
+    RigidBody2D.solve_pair = staticmethod(lambda a, b: calls.append(a) or original(a, b))
+    try:
+        resting = [(b.local_x, b.local_y) for b in boxes]
+        root.update(1 / 60)
+    finally:
+        RigidBody2D.solve_pair = staticmethod(original)
+    assert calls == []  # no pair work while the island sleeps
+    assert [(b.local_x, b.local_y) for b in boxes] == resting
+    print("[PASS] test_resting_stack_sleeps_as_island")
+
+
+def test_contact_and_force_wake_island():
+    root, cw, world, boxes = _sleeping_stack()
+    for _ in range(90):
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes)
+
+    drop = _make_rigid("Drop", 100, 60, Collider2D("DropCol", 0, 0, 20, 20), cw)
+    drop.can_sleep = True
+    world.add_child(drop)
+    for _ in range(30):
+        root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)  # landing woke the whole stack
+    assert drop.local_y + 20.0 <= boxes[-1].local_y + 1.0
+
+    for _ in range(90):
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes + [drop])
+    boxes[0].apply_force(0.0, -10.0)
+    assert not any(b.sleeping for b in boxes + [drop])
+    print("[PASS] test_contact_and_force_wake_island")
+
+
+def test_removed_floor_wakes_island():
+    root, cw, world, boxes = _sleeping_stack()
+    for _ in range(90):
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes)
+    for _ in range(10):  # an island at rest does not wake itself
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes)
+
+    resting_y = boxes[0].local_y
+    root.remove_child(root.get_node("Floor"))
+    root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)
+    for _ in range(10):
+        root.update(1 / 60)
+    assert boxes[0].local_y > resting_y + 10.0  # falling instead of floating
+    print("[PASS] test_removed_floor_wakes_island")
+
+
+def test_moving_platform_wakes_island():
+    root, cw, world, boxes = _sleeping_stack()
+    for _ in range(90):
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes)
+
+    floor = root.get_node("Floor")
+    for _ in range(20):
+        floor.set_position(floor.local_x, floor.local_y + 2.0)  # platform sinking
+        root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)
+    assert boxes[0].local_y + 20.0 > 230.0  # the stack followed it down
+    print("[PASS] test_moving_platform_wakes_island")
+
+
+def test_sleep_is_opt_in_and_velocity_wakes():
+    root, cw, world, boxes = _sleeping_stack()
+    boxes[-1].can_sleep = False
+    for _ in range(90):
+        root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)  # the island waits for every body
+
+    boxes[-1].can_sleep = True
+    for _ in range(60):
+        root.update(1 / 60)
+    assert all(b.sleeping for b in boxes)
+
+    top = boxes[-1]
+    top.vy = -300.0  # direct assignment, no wake() call
+    root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)
+    assert top.local_y < boxes[-2].local_y - 21.0  # launched off the stack
+    print("[PASS] test_sleep_is_opt_in_and_velocity_wakes")
+
+
+def test_can_sleep_false_keeps_island_awake():
+    root, cw, world, boxes = _sleeping_stack()
+    boxes[1].can_sleep = False
+    for _ in range(90):
+        root.update(1 / 60)
+    assert not any(b.sleeping for b in boxes)
+    print("[PASS] test_can_sleep_false_keeps_island_awake")
+
+
+def test_vectorized_sleeping_cradle_matches_loop():
+    if not BodyStore.available:
+        print("[SKIP] test_vectorized_sleeping_cradle_matches_loop (NumPy missing)")
+        return
+    # By frame 160 the resting balls sleep; 80 frames later the swing
+    # has woken them one after another, partly inside the array stage
+    expected = _run_cradle(False, frames=160, can_sleep=True)
+    balls = _run_cradle(True, frames=160, can_sleep=True)
+    assert balls[1].sleeping and balls[2].sleeping
+    for frames in (0, 80):
+        for _ in range(frames):
+            for run in (expected, balls):
+                run[0].parent.parent.update(1 / 60)
+        assert [b.sleeping for b in balls] == [b.sleeping for b in expected]
+        for got, want in zip(balls, expected):
+            assert abs(got.local_x - want.local_x) < 1e-6 and abs(got.local_y - want.local_y) < 1e-6
+            assert abs(got.vx - want.vx) < 1e-6 and abs(got.vy - want.vy) < 1e-6
+    print("[PASS] test_vectorized_sleeping_cradle_matches_loop")
+
+
+def _impulse_stack(sub_steps, velocity_iterations, vectorized=False, count=8, frames=120):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    world = PhysicsWorld2D("PW", gravity_y=800.0, sub_steps=sub_steps, vectorized=vectorized,
+                           velocity_iterations=velocity_iterations)
+    root.add_child(world)
+    root.add_child(make_wall("Floor", 0, 400, 400, 50))
+    boxes = []
+    for i in range(count):
+        box = _make_rigid("Box%d" % i, 100, 380 - 20 * i,
+                          Collider2D("Box%dCol" % i, 0, 0, 20, 20), cw)
+        box.restitution = 0.2
+        box.can_sleep = False
+        world.add_child(box)
+        boxes.append(box)
+    for _ in range(frames):
+        root.update(1 / 60)
+    overlap = max(boxes[i].local_y + 20.0 - boxes[i - 1].local_y for i in range(1, count))
+    return world, boxes, overlap
+
+
+def test_impulse_solver_holds_stack_at_one_substep():
+    _, _, legacy_overlap = _impulse_stack(sub_steps=1, velocity_iterations=0)
+    world, boxes, overlap = _impulse_stack(sub_steps=1, velocity_iterations=8)
+    assert legacy_overlap > 10.0  # the one-shot push sinks at one substep
+    assert overlap <= world._contact_solver.slop + 0.1
+    assert abs(boxes[-1].local_y - 240.0) < 0.6 * len(boxes)
+    assert all(abs(b.vy) < 1e-6 for b in boxes)
+    print("[PASS] test_impulse_solver_holds_stack_at_one_substep")
+
+
+def test_contacts_warm_start_between_frames():
+    world, boxes, _ = _impulse_stack(sub_steps=1, velocity_iterations=8, count=4, frames=60)
+    solver = world._contact_solver
+    floor_key = next(k for k in solver.manifolds if k[0] is boxes[0] and len(k) == 2
+                     and not isinstance(k[1], RigidBody2D))
+    contact = solver.manifolds[floor_key]
+    # Resting contact carries the weight of the whole stack each step
+    assert abs(contact.impulse - 4 * 800.0 / 60) < 0.05 * 4 * 800.0 / 60
+    world.parent.update(1 / 60)
+    assert solver.manifolds[floor_key] is contact  # same manifold, warm started
+    assert len(solver.manifolds) == 4  # floor + three stacked pairs
+    print("[PASS] test_contacts_warm_start_between_frames")
+
+
+def test_vectorized_impulse_solver_matches_loop():
+    if not BodyStore.available:
+        print("[SKIP] test_vectorized_impulse_solver_matches_loop (NumPy not installed)")
+        return
+    _, loop_boxes, _ = _impulse_stack(sub_steps=2, velocity_iterations=8, frames=40)
+    _, vec_boxes, _ = _impulse_stack(sub_steps=2, velocity_iterations=8, vectorized=True, frames=40)
+    for a, b in zip(loop_boxes, vec_boxes):
+        assert abs(a.local_y - b.local_y) < 1e-9 and abs(a.vy - b.vy) < 1e-9
+    print("[PASS] test_vectorized_impulse_solver_matches_loop")
+
+
+def _chain_world(links, vectorized=False):
+    world = PhysicsWorld2D("PW", gravity_y=800.0, sub_steps=4, vectorized=vectorized)
+    prev = None
+    bodies = []
+    for i in range(links):
+        body = RigidBody2D("Link%d" % i, 100 + 5 * i, 50)
+        world.add_child(body)
+        if prev is None:
+            world.add_child(DistanceJoint("Joint%d" % i, body, None, anchor_x=95, anchor_y=50))
+        else:
+            world.add_child(DistanceJoint("Joint%d" % i, body, prev))
+        bodies.append(body)
+        prev = body
+    return world, bodies
+
+
+def test_chain_joints_batch_and_hold_length():
+    if not JointStore.available:
+        print("[SKIP] test_chain_joints_batch_and_hold_length (NumPy not installed)")
+        return
+    results = []
+    for vectorized in (False, True):
+        world, links = _chain_world(30, vectorized)
+        for _ in range(240):
+            world.update(1 / 60)
+        assert len(world._joint_store.colors) == 2  # a chain is two batches
+        stretch = max(abs(math.hypot(a.local_x - b.local_x, a.local_y - b.local_y) - 5.0)
+                      for a, b in zip(links, links[1:]))
+        assert stretch < 0.05 * 5.0
+        results.append([(b.local_x, b.local_y) for b in links])
+    # Relaxing the BodyStore arrays gives the same chain as the node path
+    for (ax, ay), (bx, by) in zip(*results):
+        assert abs(ax - bx) < 1e-6 and abs(ay - by) < 1e-6
+    print("[PASS] test_chain_joints_batch_and_hold_length")
+
+
+def test_joint_store_matches_per_joint_solve():
+    if not JointStore.available:
+        print("[SKIP] test_joint_store_matches_per_joint_solve (NumPy not installed)")
+        return
+
+    def build():
+        world = PhysicsWorld2D("PW", gravity_y=800.0, sub_steps=2)
+        a, b, c, d, e = (RigidBody2D("B%d" % i, 40.0 * i, 10.0 * i, mass=1.0 + i) for i in range(5))
+        for body in (a, b, c, d, e):
+            body.vx = 30.0
+            world.add_child(body)
+        world.add_child(DistanceJoint("Rod", a, b, length=30.0))
+        world.add_child(SpringJoint("Spring", c, d, length=20.0))
+        world.add_child(PinJoint("Pin", e, None, anchor_x=150.0, anchor_y=60.0))
+        return world, (a, b, c, d, e)
+
+    batched, batched_bodies = build()
+    fallback, fallback_bodies = build()
+    fallback._joint_store = None
+    for _ in range(20):
+        batched.update(1 / 60)
+        fallback.update(1 / 60)
+    for p, q in zip(batched_bodies, fallback_bodies):
+        assert abs(p.local_x - q.local_x) < 1e-6 and abs(p.local_y - q.local_y) < 1e-6
+        assert abs(p.vx - q.vx) < 1e-6 and abs(p.vy - q.vy) < 1e-6
+    e = batched_bodies[4]
+    assert abs(e.local_x - 160.0) < 1e-6 and abs(e.local_y - 40.0) < 1e-6  # pinned
+    print("[PASS] test_joint_store_matches_per_joint_solve")
+
+
+def _joint_worlds(build):
+    """The same joint scene on the batched, vectorized and per-joint paths."""
+    worlds = []
+    for vectorized, batched in ((False, True), (True, True), (False, False)):
+        if (vectorized or batched) and not JointStore.available:
+            continue
+        world = PhysicsWorld2D("PW", gravity_y=0.0, sub_steps=2, vectorized=vectorized)
+        if not batched:
+            world._joint_store = None
+        worlds.append((world, build(world)))
+    return worlds
+
+
+def test_joint_changes_at_runtime_reach_every_path():
+    def build(world):
+        a = RigidBody2D("A", 100.0, 0.0)
+        c = RigidBody2D("C", 100.0, 50.0)
+        for body in (a, c):
+            body.can_sleep = False
+            world.add_child(body)
+        rod = DistanceJoint("Rod", a, None, anchor_x=0.0, anchor_y=0.0)
+        pin = PinJoint("Pin", c, None, anchor_x=0.0, anchor_y=50.0)
+        world.add_child(rod)
+        world.add_child(pin)
+        return a, c, rod, pin
+
+    for world, (a, c, rod, pin) in _joint_worlds(build):
+        for _ in range(5):
+            world.update(1 / 60)
+        rod.length = 50.0
+        pin.set_position(200.0, 50.0)
+        for _ in range(10):
+            world.update(1 / 60)
+        assert abs(a.local_x - 50.0) < 1e-6 and abs(a.local_y) < 1e-6
+        assert abs(c.local_x - 300.0) < 1e-6 and abs(c.local_y - 50.0) < 1e-6
+    print("[PASS] test_joint_changes_at_runtime_reach_every_path")
+
+
+def test_joints_between_sleeping_bodies_stay_put():
+    def build(world):
+        a = RigidBody2D("A", 0.0, 0.0)
+        b = RigidBody2D("B", 30.0, 0.0)
+        world.add_child(a)
+        world.add_child(b)
+        world.add_child(DistanceJoint("Rod", a, b, length=20.0))  # stretched
+        for body in (a, b):
+            body.sleep([a, b])
+        return a, b
+
+    for world, (a, b) in _joint_worlds(build):
+        for _ in range(3):
+            world.update(1 / 60)
+        assert a.sleeping and b.sleeping
+        assert (a.local_x, b.local_x) == (0.0, 30.0)
+        b.wake()
+        world.update(1 / 60)
+        assert abs(b.local_x - a.local_x - 20.0) < 1e-6
+    print("[PASS] test_joints_between_sleeping_bodies_stay_put")
+
+
+def _adaptive_world(vectorized=False):
+    root, cw, world = _rigid_scene(gravity_y=800.0)
+    world.sub_steps = 10
+    world.adaptive_sub_steps = True
+    world.profiler = EngineProfiler()
+    if vectorized:
+        world.vectorized = True
+        world._store = BodyStore()
+    ball = _make_rigid("Ball", 100, 100, CircleCollider2D("BallCol", 0, 0, 20), cw)
+    world.add_child(ball)
+    return root, world, ball
+
+
+def test_adaptive_sub_steps_follow_fastest_body():
+    for vectorized in ((False, True) if BodyStore.available else (False,)):
+        root, world, ball = _adaptive_world(vectorized)
+        root.update(1 / 60)
+        assert world.last_sub_steps == 1  # only gravity: 0.2px of a 40px ball
+        assert world.profiler.get_tracked("physics.sub_steps") == 1
+
+        ball.vx = 600.0  # 10px per frame, 4px allowed per substep
+        root.update(1 / 60)
+        assert world.last_sub_steps == 3
+        assert world.profiler.get_tracked("physics.sub_steps") == 3
+
+        ball.vx = 100000.0
+        root.update(1 / 60)
+        assert world.last_sub_steps == 10  # capped at sub_steps
+
+        ball.vx = 0.0
+        ball.vy = 0.0
+        world.min_sub_steps = 2
+        root.update(1 / 60)
+        assert world.last_sub_steps == 2
+    print("[PASS] test_adaptive_sub_steps_follow_fastest_body")
+
+
+def test_fixed_sub_steps_still_reported():
+    root, world, ball = _adaptive_world()
+    world.adaptive_sub_steps = False
+    root.update(1 / 60)
+    assert world.last_sub_steps == 10
+    assert world.profiler.get_tracked("physics.sub_steps") == 10
+    print("[PASS] test_fixed_sub_steps_still_reported")
+
+
+def _cradle_energy(balls):
+    return sum(0.5 * (b.vx ** 2 + b.vy ** 2) - 800.0 * b.local_y for b in balls)
+
+
+def test_adaptive_sub_steps_keep_cradle_trajectory():
+    expected = _run_cradle(False, frames=240)
+    balls = _run_cradle(False, frames=240, adaptive=True)
+    # Ropes and contacts hold the full count, so the swing matches the
+    # fixed-step run instead of drifting with one or two substeps
+    assert balls[0].parent.last_sub_steps == 10
+    for got, want in zip(balls, expected):
+        assert math.hypot(got.local_x - want.local_x, got.local_y - want.local_y) < 1e-6
+    energy = _cradle_energy(expected)
+    assert abs(_cradle_energy(balls) - energy) <= 1e-6 * abs(energy)
+
+    # A lone falling ball still drops to one substep
+    root, world, ball = _adaptive_world()
+    root.update(1 / 60)
+    assert world.last_sub_steps == 1
+    print("[PASS] test_adaptive_sub_steps_keep_cradle_trajectory")
+
+
 # ======================================================================
 # Run all
 # ======================================================================
@@ -165,4 +920,35 @@ if __name__ == "__main__":
     test_apply_impulse()
     test_apply_impulse_additive()
     test_gravity_does_not_affect_x()
+    test_sweep_returns_earliest_time_of_impact()
+    test_continuous_body_does_not_tunnel()
+    test_continuous_body_slides_along_floor()
+    test_axis_checks_share_candidate_query()
+    test_push_chain_reuses_candidates()
+    test_vectorized_integration_matches_loop()
+    test_vectorized_writes_nodes_once_per_frame()
+    test_vectorized_cradle_solves_contacts_on_arrays()
+    test_world_tracks_bodies_on_add_and_remove()
+    test_spatial_hash_moves_between_buckets()
+    test_body_pairs_solved_once_per_substep()
+    test_static_contact_leaves_world_cache_alone()
+    test_hash_cells_fit_largest_body()
+    test_small_bodies_get_small_cells()
+    test_resting_stack_sleeps_as_island()
+    test_contact_and_force_wake_island()
+    test_removed_floor_wakes_island()
+    test_moving_platform_wakes_island()
+    test_sleep_is_opt_in_and_velocity_wakes()
+    test_can_sleep_false_keeps_island_awake()
+    test_vectorized_sleeping_cradle_matches_loop()
+    test_impulse_solver_holds_stack_at_one_substep()
+    test_contacts_warm_start_between_frames()
+    test_vectorized_impulse_solver_matches_loop()
+    test_chain_joints_batch_and_hold_length()
+    test_joint_store_matches_per_joint_solve()
+    test_joint_changes_at_runtime_reach_every_path()
+    test_joints_between_sleeping_bodies_stay_put()
+    test_adaptive_sub_steps_follow_fastest_body()
+    test_fixed_sub_steps_still_reported()
+    test_adaptive_sub_steps_keep_cradle_trajectory()
     print("\n=== ALL LEVEL 3 TESTS PASSED ===")
@@ -0,0 +1,201 @@
+"""
+Snapshot Tests
+
+Tests SnapshotRecorder capture / restore of a subtree's state:
+    - Rollback: restore + re-simulate reproduces the original run
+      (transforms, rigid bodies, warm-started contacts, MasterClock)
+    - Restore only dirties nodes whose transform changed
+    - Tweens and AnimatedSprite timers rewind without leaking pool slots
+    - Tree changes after a capture: new nodes are picked up, old
+      snapshots still restore
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+pygame.init()
+if not pygame.display.get_surface():
+    pygame.display.set_mode((1, 1), pygame.NOFRAME | pygame.HIDDEN)
+
+from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.collision_world import CollisionWorld
+from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.scene.animated_sprite import AnimatedSprite
+from src.pyengine2D.scene.tween import TweenManager
+from src.pyengine2D.scene.snapshot import SnapshotRecorder
+from src.pyengine2D.physics.rigid_body_2d import RigidBody2D
+from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
+from src.pyengine2D.physics.physics_world_2d import PhysicsWorld2D
+from src.pyengine2D.time.master_clock import MasterClock
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+def _box_scene():
+    """Three boxes dropping onto a floor through the impulse solver."""
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    floor = Node2D("Floor", 0, 300)
+    floor_col = Collider2D("FloorCol", 0, 0, 400, 40, is_static=True)
+    floor_col.layer = "wall"
+    floor_col.mask = {"box"}
+    floor.add_child(floor_col)
+    root.add_child(floor)
+
+    world = PhysicsWorld2D("PW", gravity_y=800.0, sub_steps=2, velocity_iterations=8)
+    root.add_child(world)
+    boxes = []
+    for i in range(3):
+        col = Collider2D(f"Col{i}", 0, 0, 20, 20)
+        col.layer = "box"
+        col.mask = {"box", "wall"}
+        box = RigidBody2D(f"Box{i}", 100 + 5 * i, 200 - 30 * i, col, cw)
+        box.add_child(col)
+        box.vx = 10.0 * (i - 1)
+        box.restitution = 0.1
+        world.add_child(box)
+        boxes.append(box)
+    return root, world, boxes
+
+
+def _state(nodes):
+    return [(n.local_x, n.local_y, n.vx, n.vy) for n in nodes]
+
+
+def _step(root, clock, frames):
+    for _ in range(frames):
+        clock.update(1 / 60)
+        root.update_transforms()
+        root.update(1 / 60)
+
+
+# ======================================================================
+# Tests
+# ======================================================================
+
+def test_rollback_replays_identically():
+    root, world, boxes = _box_scene()
+    clock = MasterClock()
+    recorder = SnapshotRecorder(root, clock)
+    _step(root, clock, 35)  # boxes settling: contacts carry warm-start impulses
+
+    snap = recorder.capture()
+    assert world._contact_solver.manifolds
+    _step(root, clock, 40)
+    first = _state(boxes)
+    first_time = clock.elapsed
+
+    recorder.restore(snap)
+    assert abs(clock.elapsed - 35 / 60) < 1e-12
+    _step(root, clock, 40)
+    assert _state(boxes) == first  # bit-identical re-simulation
+    assert clock.elapsed == first_time
+    print("[PASS] test_rollback_replays_identically")
+
+
+def test_restore_dirties_only_changed_nodes():
+    root = Node2D("Root")
+    still = Node2D("Still", 10, 10)
+    mover = PhysicsBody2D("Mover", 50, 50, None, None)
+    child = Node2D("Child", 1, 1)
+    mover.add_child(child)
+    root.add_child(still)
+    root.add_child(mover)
+    recorder = SnapshotRecorder(root, MasterClock())
+    root.update_transforms()
+
+    snap = recorder.capture()
+    assert snap.nbytes == 8 * (5 * 4 + 2 + 1)
+    mover.set_position(80, 90)
+    mover.velocity_x = 120.0
+    root.update_transforms()
+
+    still_version = still._transform_version
+    recorder.restore(snap)
+    assert still._transform_version == still_version and not still._dirty
+    assert (mover.local_x, mover.local_y, mover.velocity_x) == (50, 50, 0.0)
+    assert mover._dirty and child._dirty  # global positions recomputed
+    assert child.get_global_position() == (51, 51)
+
+    # An untouched scene restores without touching a single transform
+    root.update_transforms()
+    snap = recorder.capture()
+    versions = [n._transform_version for n in (root, still, mover, child)]
+    recorder.restore(snap)
+    assert [n._transform_version for n in (root, still, mover, child)] == versions
+    print("[PASS] test_restore_dirties_only_changed_nodes")
+
+
+def test_tweens_and_sprites_rewind():
+    path = os.path.join(tempfile.mkdtemp(), "sheet.png")
+    pygame.image.save(pygame.Surface((64, 16)), path)
+    sprite = AnimatedSprite("Sprite", path, 16, 16)
+    sprite.add_animation("walk", [0, 1, 2, 3])
+    sprite.play("walk", fps=10)
+
+    root = Node2D("Root")
+    tweens = TweenManager(pool_size=2)
+    target = Node2D("Target")
+    root.add_child(tweens)
+    root.add_child(sprite)
+    root.add_child(target)
+    tweens.interpolate(target, "local_x", 0.0, 100.0, 1.0)
+    recorder = SnapshotRecorder(root, MasterClock())
+
+    root.update(0.25)
+    snap = recorder.capture()
+    frame, timer = sprite.current_frame_index, sprite.frame_timer
+    root.update(1.0)  # tween finishes and goes back to the pool
+    sprite.stop()
+    assert tweens.tween_count() == 0 and target.local_x == 100.0
+
+    recorder.restore(snap)
+    assert tweens.tween_count() == 1 and tweens.tweens[0].elapsed == 0.25
+    assert len(tweens._tween_pool) == 1  # the revived tween left the pool
+    assert target.local_x == 25.0
+    assert (sprite.current_frame_index, sprite.frame_timer) == (frame, timer)
+    assert sprite.playing and sprite.current_animation == "walk"
+
+    root.update(0.5)
+    assert target.local_x == 75.0
+    print("[PASS] test_tweens_and_sprites_rewind")
+
+
+def test_tree_changes_after_capture():
+    root = Node2D("Root")
+    a = Node2D("A", 1, 2)
+    root.add_child(a)
+    recorder = SnapshotRecorder(root, MasterClock())
+    old = recorder.capture()
+
+    b = Node2D("B", 3, 4)
+    root.add_child(b)
+    new = recorder.capture()
+    assert len(new.layout.nodes) == 3 and new.nbytes > old.nbytes
+
+    a.set_position(7, 7)
+    b.set_position(8, 8)
+    recorder.restore(old)
+    assert (a.local_x, a.local_y) == (1, 2)
+    assert (b.local_x, b.local_y) == (8, 8)  # not in the old snapshot
+    recorder.restore(new)
+    assert (b.local_x, b.local_y) == (3, 4)
+    print("[PASS] test_tree_changes_after_capture")
+
+
+# ======================================================================
+# Run all
+# ======================================================================
+
+if __name__ == "__main__":
+    test_rollback_replays_identically()
+    test_restore_dirties_only_changed_nodes()
+    test_tweens_and_sprites_rewind()
+    test_tree_changes_after_capture()
+    print("\n=== ALL SNAPSHOT TESTS PASSED ===")
@@ -0,0 +1,273 @@
+"""
+Tilemap Collision Tests
+
+Tests collision geometry generated for TilemapNode:
+    - TileGridCollider cell queries, DDA raycast (box semantics from inside a tile)
+    - CollisionWorld queries and events against a tile grid
+    - PhysicsBody2D per-axis resolution against individual tiles
+    - Greedy per-chunk rectangle merging for node colliders
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+pygame.init()
+
+from src.pyengine2D.collision.collider2d import Collider2D
+from src.pyengine2D.collision.collision_world import CollisionWorld
+from src.pyengine2D.collision.tile_grid_collider import TileGridCollider
+from src.pyengine2D.physics.physics_body_2d import PhysicsBody2D
+from src.pyengine2D.scene.node2d import Node2D
+from src.pyengine2D.scene.tilemap import TilemapNode
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+# 10 x 6 map of 32px tiles: a floor, a pillar and a floating block
+MAP_TILES = [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 1, 1, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+]
+
+
+def make_map(collision_mode="grid", tiles=MAP_TILES):
+    tilemap = TilemapNode("Map", collision_mode=collision_mode)
+    tilemap.load_from_dict({
+        "tile_width": 32,
+        "tile_height": 32,
+        "layers": [{"name": "Ground", "solid": True, "tiles": [list(r) for r in tiles]}],
+    })
+    return tilemap
+
+
+def make_scene(collision_mode="grid"):
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    tilemap = make_map(collision_mode)
+    root.add_child(tilemap)
+    return root, cw, tilemap
+
+
+def make_body(name, x, y, w, h, cw):
+    col = Collider2D(name + "Col", 0, 0, w, h)
+    col.layer = "player"
+    col.mask = {"wall"}
+    body = PhysicsBody2D(name, x, y, col, cw)
+    body.add_child(col)
+    return body
+
+
+def step(root, cw):
+    root.update_transforms()
+    cw.update(1 / 60)
+
+
+# ======================================================================
+# Tests: TileGridCollider
+# ======================================================================
+
+def test_tile_grid_single_node():
+    root, cw, tilemap = make_scene()
+    assert tilemap.get_collider_count() == 1
+    grid = tilemap.tile_collider
+    assert isinstance(grid, TileGridCollider)
+    assert grid.is_solid(3, 3) and not grid.is_solid(2, 3)
+    step(root, cw)
+    assert cw.get_collider_count() == 1
+    print("[PASS] test_tile_grid_single_node")
+
+
+def test_solid_rects_only_touch_overlapped_tiles():
+    grid = TileGridCollider("G", 0, 0, 10, 6, 32, 32)
+    grid.set_solid(2, 1)
+    grid.set_solid(5, 5)
+    assert list(grid.solid_rects(60, 30, 100, 40)) == [(64, 32, 96, 64)]
+    assert list(grid.solid_rects(96, 64, 160, 160)) == []  # touching is not overlap
+    assert list(grid.solid_rects(-500, -500, 5000, 5000)) == [(64, 32, 96, 64), (160, 160, 192, 192)]
+    print("[PASS] test_solid_rects_only_touch_overlapped_tiles")
+
+
+def test_tile_grid_raycast_dda():
+    root, cw, tilemap = make_scene()
+    step(root, cw)
+    grid = tilemap.tile_collider
+
+    hit, hx, hy, col = cw.raycast(16, 0, 16, 500)
+    assert hit and col is grid and hy == 160
+    hit, hx, hy, col = cw.raycast(0, 112, 300, 112)  # pillar at column 3
+    assert hit and hx == 96
+    hit, _, _, _ = cw.raycast(0, 80, 300, 80)  # row 2 is empty
+    assert not hit
+    many = cw.raycast_many([(16, 0, 16, 500), (0, 112, 300, 112), (0, 80, 300, 80)])
+    assert [r[0] for r in many] == [True, True, False]
+    assert many[1][1] == 96
+    print("[PASS] test_tile_grid_raycast_dda")
+
+
+def test_tile_ray_from_inside_matches_box():
+    root, cw, tilemap = make_scene()
+    box = Collider2D("Box", 0, 300, 32, 32)  # same size as one floor tile
+    root.add_child(box)
+    step(root, cw)
+
+    # (x1, y1, dx, dy) offsets from a tile's top-left corner
+    rays = [(16, 8, 0, 100), (16, 8, -100, 0), (10, 10, 50, 60), (0, 16, 100, 0), (16, 8, 0, 10)]
+    for ox, oy, dx, dy in rays:
+        tile = cw.raycast(160 + ox, 160 + oy, 160 + ox + dx, 160 + oy + dy)
+        boxed = cw.raycast(ox, 300 + oy, ox + dx, 300 + oy + dy)
+        assert tile[0] == boxed[0]
+        if tile[0]:
+            assert abs((tile[1] - 160) - boxed[1]) < 1e-9
+            assert abs((tile[2] - 160) - (boxed[2] - 300)) < 1e-9
+        many = cw.raycast_many([(160 + ox, 160 + oy, 160 + ox + dx, 160 + oy + dy)])
+        assert many[0][:3] == tile[:3]
+    print("[PASS] test_tile_ray_from_inside_matches_box")
+
+
+def test_tile_grid_queries():
+    root, cw, tilemap = make_scene()
+    step(root, cw)
+    grid = tilemap.tile_collider
+    probe = Collider2D("Probe", 0, 0, 10, 10)
+    probe.mask = {"wall"}
+
+    assert cw.query_rect(0, 0, 60, 60) == []
+    assert cw.query_rect(100, 100, 110, 170) == [grid]
+
+    result = cw.check_collision(probe, 140, 155)  # 5px into the floor
+    assert result.collided and result.collider is grid
+    assert result.rect == (128, 160, 160, 192)
+    assert result.normal_y == -1.0 and abs(result.penetration - 5) < 1e-9
+    assert len(cw.query_overlap_all(probe, 155, 155)) == 2  # straddles two tiles
+    print("[PASS] test_tile_grid_queries")
+
+
+def test_body_lands_and_stops_against_tiles():
+    root, cw, tilemap = make_scene()
+    body = make_body("B", 20, 100, 20, 20, cw)
+    root.add_child(body)
+    body.use_gravity = True
+    body.velocity_x = 200.0
+
+    for _ in range(120):
+        step(root, cw)
+        body.update(1 / 60)
+
+    # Landed on the floor (y=160) and stopped at the pillar's left face (x=96)
+    assert 159 < body.local_y + 20 <= 160
+    assert 95 < body.local_x + 20 <= 96
+    assert body.velocity_x == 0.0
+    print("[PASS] test_body_lands_and_stops_against_tiles")
+
+
+def test_tile_grid_emits_events():
+    log = []
+
+    class Watcher(Node2D):
+        def on_collision_enter(self, other):
+            log.append(other.name)
+
+    root, cw, tilemap = make_scene()
+    watcher = Watcher("W", 200, 140)
+    col = Collider2D("WCol", 0, 0, 10, 10)
+    col.mask = {"wall"}
+    watcher.add_child(col)
+    root.add_child(watcher)
+    step(root, cw)
+    assert log == []  # 10px above the floor
+
+    watcher.local_y = 150
+    step(root, cw)
+    assert log == ["TileGridCol"]
+    print("[PASS] test_tile_grid_emits_events")
+
+
+# ======================================================================
+# Tests: merged node colliders
+# ======================================================================
+
+def _covered_tiles(tilemap):
+    """Map each tile covered by a generated collider to a coverage count."""
+    covered = {}
+    for node in tilemap._collision_nodes:
+        c0, r0 = int(node.local_x // 32), int(node.local_y // 32)
+        for r in range(r0, r0 + int(node.height // 32)):
+            for c in range(c0, c0 + int(node.width // 32)):
+                covered[(r, c)] = covered.get((r, c), 0) + 1
+    return covered
+
+
+def test_solid_block_merges_into_one_collider():
+    tiles = [[1] * 6 for _ in range(20)]
+    tilemap = make_map("nodes", tiles)
+    assert tilemap.get_collider_count() == 1
+    node = tilemap._collision_nodes[0]
+    assert (node.width, node.height) == (6 * 32, 20 * 32)
+    print("[PASS] test_solid_block_merges_into_one_collider")
+
+
+def test_merged_colliders_cover_each_solid_tile_once():
+    tilemap = make_map("nodes")
+    solid = {(r, c) for r, row in enumerate(MAP_TILES) for c, t in enumerate(row) if t > 0}
+    covered = _covered_tiles(tilemap)
+    assert set(covered) == solid
+    assert all(n == 1 for n in covered.values())
+    assert tilemap.get_collider_count() == 4  # block, pillar, floor left/right of it
+    print("[PASS] test_merged_colliders_cover_each_solid_tile_once")
+
+
+def test_set_tile_regenerates_only_its_chunk():
+    tiles = [[1] * 70 for _ in range(3)]  # spans three 32-tile chunks
+    root = Node2D("Root")
+    cw = CollisionWorld("CW")
+    root.add_child(cw)
+    tilemap = make_map("nodes", tiles)
+    root.add_child(tilemap)
+    step(root, cw)
+    assert tilemap.get_collider_count() == 3
+
+    untouched = list(tilemap._chunk_colliders[(1, 0)]) + list(tilemap._chunk_colliders[(2, 0)])
+    tilemap.set_tile(0, 5, 1, 0)  # punch a hole in chunk (0, 0)
+    assert all(node in tilemap._collision_nodes for node in untouched)
+    covered = _covered_tiles(tilemap)
+    assert (1, 5) not in covered and len(covered) == 3 * 70 - 1
+    step(root, cw)
+    assert cw.get_collider_count() == tilemap.get_collider_count()
+    print("[PASS] test_set_tile_regenerates_only_its_chunk")
+
+
+def test_set_tile_updates_tile_grid():
+    root, cw, tilemap = make_scene()
+    step(root, cw)
+    assert not cw.query_rect(40, 40, 50, 50)
+    tilemap.set_tile(0, 1, 1, 7)
+    assert cw.query_rect(40, 40, 50, 50) == [tilemap.tile_collider]
+    print("[PASS] test_set_tile_updates_tile_grid")
+
+
+# ======================================================================
+# Run all
+# ======================================================================
+
+if __name__ == "__main__":
+    test_tile_grid_single_node()
+    test_solid_rects_only_touch_overlapped_tiles()
+    test_tile_grid_raycast_dda()
+    test_tile_ray_from_inside_matches_box()
+    test_tile_grid_queries()
+    test_body_lands_and_stops_against_tiles()
+    test_tile_grid_emits_events()
+    test_solid_block_merges_into_one_collider()
+    test_merged_colliders_cover_each_solid_tile_once()
+    test_set_tile_regenerates_only_its_chunk()
+    test_set_tile_updates_tile_grid()
+    print("\n=== ALL TESTS PASSED ===")